@@ -0,0 +1,100 @@
+"""
+Задержка обработчика: последовательные запросы против ``Bot.batch()``.
+
+Локальный сервер отвечает с задержкой ``LATENCY``, как удалённый API.
+Запуск::
+
+    python benchmarks/batch_requests.py
+"""
+
+import asyncio
+import time
+from typing import Any
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from maxo.bot.api_client import MaxApiClient
+from maxo.bot.batch import Batch
+from maxo.bot.methods import GetChat, GetPinnedMessage
+from maxo.bot.methods.base import MaxoMethod
+from maxo.serialization import create_retort
+
+LATENCY = 0.05
+HANDLERS = 20
+CHATS_PER_HANDLER = 3
+
+
+async def get_chat(request: web.Request) -> web.Response:
+    await asyncio.sleep(LATENCY)
+    return web.json_response(
+        {
+            "chat_id": int(request.match_info["chat_id"]),
+            "type": "chat",
+            "status": "active",
+            "last_event_time": 0,
+            "participants_count": 1,
+            "is_public": False,
+        },
+    )
+
+
+async def get_pinned_message(request: web.Request) -> web.Response:
+    await asyncio.sleep(LATENCY)
+    return web.json_response({"message": None})
+
+
+def handler_methods(handler: int) -> list[MaxoMethod[Any]]:
+    chat_ids = range(handler * CHATS_PER_HANDLER, (handler + 1) * CHATS_PER_HANDLER)
+    methods: list[MaxoMethod[Any]] = [GetChat(chat_id=chat_id) for chat_id in chat_ids]
+    methods.append(GetPinnedMessage(chat_id=handler))
+    return methods
+
+
+async def sequential(client: MaxApiClient, handler: int) -> None:
+    for method in handler_methods(handler):
+        await client.call_method(method)
+
+
+async def batched(client: MaxApiClient, handler: int) -> None:
+    batch = Batch(client.call_method)
+    calls = [batch.add(method) for method in handler_methods(handler)]
+    await batch.execute()
+    for call in calls:
+        call.result()
+
+
+async def measure(client: MaxApiClient, handler_func: Any) -> float:
+    started = time.perf_counter()
+    for handler in range(HANDLERS):
+        await handler_func(client, handler)
+    return (time.perf_counter() - started) / HANDLERS
+
+
+async def main() -> None:
+    app = web.Application()
+    app.router.add_get("/chats/{chat_id}", get_chat)
+    app.router.add_get("/chats/{chat_id}/pin", get_pinned_message)
+
+    retort = create_retort(warming_up=False)
+    async with TestServer(app) as server:
+        client = MaxApiClient(
+            token="token",  # noqa: S106
+            request_dumper=retort,
+            response_loader=retort,
+            base_url=str(server.make_url("/")),
+        )
+        await batched(client, 0)  # прогрев пула соединений
+
+        calls = CHATS_PER_HANDLER + 1
+        for name, handler_func in (("sequential", sequential), ("batch", batched)):
+            latency = await measure(client, handler_func)
+            print(
+                f"{name:>10}: {latency * 1000:>7.1f} ms/handler "
+                f"({calls} calls, {LATENCY * 1000:.0f} ms API latency)",
+            )
+        await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""
+Сравнение хранилищ FSM на типичном цикле апдейта.
+
+Запуск::
+
+    python benchmarks/fsm_storages.py
+    REDIS_URL=redis://localhost:6379/0 python benchmarks/fsm_storages.py
+
+В Redis ключи пишутся с префиксом ``BENCHMARK_PREFIX`` и удаляются после
+замера, данные ботов в той же базе не затрагиваются.
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from maxo.fsm import State, StatesGroup
+from maxo.fsm.key_builder import DefaultKeyBuilder, StorageKey
+from maxo.fsm.storages.base import BaseStorage
+from maxo.fsm.storages.memory import MemoryStorage
+from maxo.fsm.storages.sqlite import SQLiteStorage
+
+USERS = 1_000
+ROUNDS = 5
+BENCHMARK_PREFIX = "maxo-benchmark"
+KEYS = [StorageKey(bot_id=1, chat_id=i, user_id=i) for i in range(USERS)]
+
+
+class Form(StatesGroup):
+    name = State()
+    age = State()
+
+
+async def run_updates(storage: BaseStorage) -> float:
+    started = time.perf_counter()
+    for round_ in range(ROUNDS):
+        for key in KEYS:
+            await storage.get_state(key)
+            await storage.update_data(key, {"round": round_})
+            await storage.set_state(key, Form.age if round_ % 2 else Form.name)
+    return time.perf_counter() - started
+
+
+async def main() -> None:
+    storages: dict[str, BaseStorage] = {"memory": MemoryStorage()}
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    storages["sqlite"] = SQLiteStorage(Path(tmp_dir.name) / "fsm.sqlite3")
+
+    if redis_url := os.environ.get("REDIS_URL"):
+        from maxo.fsm.storages.redis import RedisStorage
+
+        storages["redis"] = RedisStorage.from_url(
+            redis_url,
+            key_builder=DefaultKeyBuilder(prefix=BENCHMARK_PREFIX),
+        )
+
+    updates = USERS * ROUNDS
+    for name, storage in storages.items():
+        try:
+            elapsed = await run_updates(storage)
+        finally:
+            await storage.delete_many(KEYS)
+            await storage.close()
+        print(
+            f"{name:>8}: {updates / elapsed:>10.0f} updates/s, "
+            f"{elapsed / updates * 1e6:>7.1f} us/update",
+        )
+
+    tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
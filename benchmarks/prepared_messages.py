@@ -0,0 +1,86 @@
+"""
+Подготовка запроса SendMessage: обычная сериализация против ``PreparedMessage``.
+
+Меряется только CPU: сборка ``HTTPRequest`` и тела в JSON, без сети.
+Запуск::
+
+    python benchmarks/prepared_messages.py
+"""
+
+import json
+import time
+from collections.abc import Callable
+
+from maxo.bot.methods import SendMessage
+from maxo.bot.prepared import PreparedMessage, SendPreparedMessage
+from maxo.enums import TextFormat
+from maxo.serialization import create_retort
+from maxo.types import CallbackButton, InlineKeyboardAttachmentRequest, LinkButton
+from maxo.types.inline_keyboard_attachment_request_payload import (
+    InlineKeyboardAttachmentRequestPayload,
+)
+
+RECIPIENTS = 20_000
+TEXT = "<b>Новости недели</b>\n" + "Текст рассылки. " * 40
+
+retort = create_retort()
+keyboard = InlineKeyboardAttachmentRequest(
+    payload=InlineKeyboardAttachmentRequestPayload(
+        buttons=[
+            [
+                CallbackButton(text=f"Кнопка {row}-{col}", payload=f"{row}:{col}")
+                for col in range(3)
+            ]
+            for row in range(4)
+        ]
+        + [[LinkButton(text="Сайт", url="https://example.com")]],
+    ),
+)
+
+
+def serialize(request_body: object) -> bytes | str:
+    if isinstance(request_body, PreparedMessage):
+        return request_body.data
+    return json.dumps(request_body)
+
+
+def regular(user_id: int) -> None:
+    method = SendMessage(
+        user_id=user_id,
+        text=TEXT,
+        format=TextFormat.HTML,
+        attachments=[keyboard],
+    )
+    serialize(method.build_http_request(retort).body)
+
+
+prepared = PreparedMessage.build(
+    retort,
+    json.dumps,
+    text=TEXT,
+    format=TextFormat.HTML,
+    attachments=[keyboard],
+)
+
+
+def prepared_message(user_id: int) -> None:
+    method = SendPreparedMessage(user_id=user_id, prepared=prepared)
+    serialize(method.build_http_request(retort).body)
+
+
+def measure(build: Callable[[int], None]) -> float:
+    started = time.perf_counter()
+    for user_id in range(RECIPIENTS):
+        build(user_id)
+    return (time.perf_counter() - started) / RECIPIENTS
+
+
+def main() -> None:
+    print(f"body size: {len(prepared.data)} bytes, {RECIPIENTS} recipients")
+    for name, build in (("regular", regular), ("prepared", prepared_message)):
+        elapsed = measure(build)
+        print(f"{name:>10}: {elapsed * 1e6:>7.1f} us/message")
+
+
+if __name__ == "__main__":
+    main()
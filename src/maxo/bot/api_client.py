@@ -1,19 +1,38 @@
+import asyncio
 import io
 import json
+import os
 import pathlib
-from collections.abc import AsyncGenerator, Callable
+import time
+from collections.abc import AsyncGenerator, Callable, Iterable
+from contextlib import suppress
+from contextvars import ContextVar
 from typing import Any, BinaryIO, Never
 
-from aiohttp import ClientSession
-from anyio import open_file
+from aiohttp import ClientError, ClientSession, ClientTimeout
+from aiohttp.helpers import content_disposition_header
+from anyio import open_file, to_thread
 from unihttp.clients.aiohttp import AiohttpAsyncClient
-from unihttp.http import HTTPResponse
-from unihttp.method import BaseMethod
+from unihttp.exceptions import RequestTimeoutError
+from unihttp.http import HTTPRequest, HTTPResponse
+from unihttp.method import BaseMethod, ResponseType
 from unihttp.middlewares import AsyncMiddleware
 from unihttp.serialize import RequestDumper, ResponseLoader
 
 from maxo import loggers
 from maxo.__meta__ import __version__
+from maxo.backoff import Backoff
+from maxo.bot.coalescing import CoalescingConfig, RequestCoalescer
+from maxo.bot.downloads import (
+    DownloadDestination,
+    DownloadReport,
+    DownloadRequest,
+    DownloadResult,
+)
+from maxo.bot.methods.base import MaxoMethod
+from maxo.bot.prepared import PreparedMessage
+from maxo.bot.retry import NO_RETRY_RULE, RetryPolicy, retries_disabled
+from maxo.bot.session import SessionConfig
 from maxo.errors import (
     MaxBotApiError,
     MaxBotBadRequestError,
@@ -27,6 +46,12 @@ from maxo.errors import (
 )
 from maxo.types import AttachmentPayload
 
+_request_timeout: ContextVar[float | None] = ContextVar("_request_timeout")
+
+# Запись на диск идёт в отдельном потоке: части ответа собираются в пачки,
+# чтобы не переключаться в поток на каждый chunk
+_WRITE_BATCH_SIZE = 1024 * 1024
+
 
 class MaxApiClient(AiohttpAsyncClient):
     def __init__(
@@ -39,14 +64,21 @@ class MaxApiClient(AiohttpAsyncClient):
         session: ClientSession | None = None,
         json_dumps: Callable[[Any], str] = json.dumps,
         json_loads: Callable[[str | bytes | bytearray], Any] = json.loads,
+        retry_policy: RetryPolicy | None = None,
+        session_config: SessionConfig | None = None,
+        coalescing: CoalescingConfig | None = None,
     ) -> None:
         self._token = token
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.session_config = session_config or SessionConfig()
+        self.coalescer = RequestCoalescer(coalescing or CoalescingConfig())
 
+        # Чужую сессию могут делить несколько ботов: токен передаётся
+        # в заголовке каждого запроса, а закрывает сессию её владелец
+        self._owns_session = session is None
         if session is None:
-            session = ClientSession()
+            session = self.session_config.create_session()
 
-        if "Authorization" not in session.headers:
-            session.headers["Authorization"] = self._token
         if "User-Agent" not in session.headers:
             session.headers["User-Agent"] = f"maxo/{__version__}"
 
@@ -56,9 +88,93 @@ class MaxApiClient(AiohttpAsyncClient):
             response_loader=response_loader,
             middleware=middleware,
             session=session,
-            json_dumps=json_dumps,
+            json_dumps=self._dump_body,
             json_loads=json_loads,
         )
+        self._json_dumps = json_dumps
+
+    def _dump_body(self, body: Any) -> Any:
+        # Заранее сериализованное тело aiohttp отправляет как есть
+        if isinstance(body, PreparedMessage):
+            return body.data
+        return self._json_dumps(body)
+
+    async def call_method(self, method: BaseMethod[ResponseType]) -> ResponseType:
+        if isinstance(method, MaxoMethod) and self.coalescer.config.should_coalesce(
+            type(method),
+        ):
+            request = method.build_http_request(self.request_dumper)
+            return await self.coalescer.call(method, request, self._call_method)
+        return await self._call_method(method)
+
+    async def _call_method(self, method: BaseMethod[ResponseType]) -> ResponseType:
+        if retries_disabled():
+            rule = NO_RETRY_RULE
+        else:
+            rule = self.retry_policy.get_rule(type(method))
+        backoff = Backoff(rule.backoff)
+        timeout = _request_timeout.set(self.session_config.get_timeout(type(method)))
+        try:
+            while True:
+                try:
+                    return await super().call_method(method)
+                except MaxBotApiError as e:
+                    if (
+                        backoff.counter + 1 >= rule.max_attempts
+                        or not rule.should_retry(e)
+                    ):
+                        raise
+                    backoff.next()
+                    loggers.bot_session.warning(
+                        "%s failed with %s (%s), retry in %f seconds (tryings = %d)",
+                        type(method).__name__,
+                        type(e).__name__,
+                        e.code,
+                        backoff.current_delay,
+                        backoff.counter,
+                    )
+                    await backoff.sleep()
+        finally:
+            _request_timeout.reset(timeout)
+
+    async def make_request(self, request: HTTPRequest) -> HTTPResponse:
+        request.header.setdefault("Authorization", self._token)
+
+        timeout = _request_timeout.get(self.session_config.timeout)
+        try:
+            async with asyncio.timeout(timeout):
+                return await super().make_request(request)
+        except TimeoutError as e:
+            raise RequestTimeoutError(
+                f"Request to {request.url!r} timed out after {timeout} seconds",
+            ) from e
+
+    async def preconnect(self, connections: int) -> int:
+        """Открывает ``connections`` соединений с API и оставляет их в пуле."""
+        results = await asyncio.gather(
+            *(self._ping() for _ in range(connections)),
+            return_exceptions=True,
+        )
+        opened = sum(result is None for result in results)
+        loggers.bot_session.debug(
+            "Preconnected %d of %d connections to %s",
+            opened,
+            connections,
+            self.base_url,
+        )
+        return opened
+
+    async def close(self) -> None:
+        if self._owns_session:
+            await super().close()
+
+    async def _ping(self) -> None:
+        # Ответ на HEAD без тела aiohttp не всегда возвращает в пул
+        async with self._session.get(
+            self.base_url,
+            timeout=ClientTimeout(total=self.session_config.connect_timeout),
+        ) as response:
+            await response.read()
 
     def handle_error(self, response: HTTPResponse, method: BaseMethod[Any]) -> Never:
         # ruff: noqa: PLR2004
@@ -102,48 +218,210 @@ class MaxApiClient(AiohttpAsyncClient):
     async def download(
         self,
         url: str | AttachmentPayload,
-        destination: BinaryIO | pathlib.Path | str | None = None,
+        destination: DownloadDestination | None = None,
         timeout: int = 30,
         chunk_size: int = 65536,
         seek: bool = True,
+        offset: int = 0,
     ) -> BinaryIO | None:
         if isinstance(url, AttachmentPayload):
             url = url.url
 
-        return await self._download_file(
+        file, _ = await self._download_file(
             url,
             destination=destination,
             timeout=timeout,
             chunk_size=chunk_size,
             seek=seek,
+            offset=offset,
+        )
+        return file
+
+    async def download_many(
+        self,
+        downloads: Iterable[DownloadRequest | str | AttachmentPayload],
+        concurrency: int = 8,
+        timeout: int = 30,
+        chunk_size: int = 65536,
+        on_result: Callable[[DownloadResult], Any] | None = None,
+    ) -> DownloadReport:
+        """
+        Скачивает файлы параллельно, не больше ``concurrency`` одновременно.
+
+        Ошибка одного файла не прерывает остальные: она сохраняется
+        в ``DownloadResult.error``.
+        """
+        if concurrency < 1:
+            raise ValueError("`concurrency` should be greater than 0")
+
+        requests = [
+            request
+            if isinstance(request, DownloadRequest)
+            else DownloadRequest(url=request)
+            for request in downloads
+        ]
+        results: list[DownloadResult | None] = [None] * len(requests)
+        pending = iter(enumerate(requests))
+
+        async def worker() -> None:
+            # Воркеры разбирают общий итератор, поэтому задач столько же,
+            # сколько одновременных скачиваний, а не по одной на файл
+            for index, request in pending:
+                result = await self._download_request(request, timeout, chunk_size)
+                results[index] = result
+                if on_result is None:
+                    continue
+                try:
+                    on_result(result)
+                except Exception:  # noqa: BLE001
+                    # Ошибка колбэка не должна отменять остальные скачивания
+                    loggers.bot_session.exception(
+                        "Download callback failed for %s",
+                        request.url,
+                    )
+
+        started = time.perf_counter()
+        async with asyncio.TaskGroup() as task_group:
+            for _ in range(min(concurrency, len(requests))):
+                task_group.create_task(worker())
+
+        report = DownloadReport(
+            results=[result for result in results if result is not None],
+            elapsed=time.perf_counter() - started,
+        )
+        loggers.bot_session.info(
+            "Downloaded %d files (%d failed), %d bytes in %.2f seconds (%.0f B/s)",
+            len(report.results),
+            len(report.failed),
+            report.size,
+            report.elapsed,
+            report.throughput,
         )
+        return report
+
+    async def _download_request(
+        self,
+        request: DownloadRequest,
+        timeout: int,
+        chunk_size: int,
+    ) -> DownloadResult:
+        url = request.url
+        if isinstance(url, AttachmentPayload):
+            url = url.url
+
+        started = time.perf_counter()
+        try:
+            file, size = await self._download_file(
+                url,
+                destination=request.destination,
+                timeout=timeout,
+                chunk_size=chunk_size,
+                seek=True,
+                offset=request.offset,
+            )
+        except (ClientError, TimeoutError, OSError, ValueError) as e:
+            loggers.bot_session.warning(
+                "Failed to download %s - %s: %s",
+                url,
+                type(e).__name__,
+                e,
+            )
+            return DownloadResult(
+                request=request,
+                size=0,
+                elapsed=time.perf_counter() - started,
+                error=e,
+            )
+        return DownloadResult(
+            request=request,
+            size=size,
+            elapsed=time.perf_counter() - started,
+            file=file,
+        )
+
+    async def upload_chunk(
+        self,
+        url: str,
+        data: bytes,
+        offset: int,
+        total: int,
+        file_name: str,
+        timeout: float | None = None,
+    ) -> HTTPResponse:
+        """Отправляет часть файла по ``url`` в режиме resumable upload."""
+        headers = {
+            "Authorization": self._token,
+            "Content-Type": "application/octet-stream",
+            "Content-Disposition": content_disposition_header(
+                "attachment",
+                filename=file_name,
+            ),
+            "Content-Range": f"bytes {offset}-{offset + len(data) - 1}/{total}",
+        }
+        async with self._session.post(
+            url,
+            data=data,
+            headers=headers,
+            timeout=ClientTimeout(total=timeout),
+            raise_for_status=True,
+        ) as response:
+            content = await response.read()
+            response_data: Any = content or None
+            if content:
+                # Сервер загрузки может ответить не JSON: ``<retval>1</retval>``
+                with suppress(ValueError, TypeError):
+                    response_data = self.json_loads(content)
+            return HTTPResponse(
+                status_code=response.status,
+                headers=response.headers,
+                cookies=response.cookies,
+                data=response_data,
+                raw_response=response,
+            )
 
     async def _download_file(
         self,
         url: str,
-        destination: BinaryIO | pathlib.Path | str | None,
+        destination: DownloadDestination | None,
         timeout: int,
         chunk_size: int,
         seek: bool,
-    ) -> BinaryIO | None:
+        offset: int = 0,
+    ) -> tuple[BinaryIO | None, int]:
         if destination is None:
             destination = io.BytesIO()
 
         stream = self._stream_content(
             url=url,
+            headers={"Authorization": self._token},
             timeout=timeout,
             chunk_size=chunk_size,
             raise_for_status=True,
         )
 
         if isinstance(destination, (str, pathlib.Path)):
-            await self.__download_file(destination=destination, stream=stream)
-            return None
-        return await self.__download_file_binary_io(
+            return None, await self.__download_file(
+                destination=destination,
+                stream=stream,
+            )
+        if isinstance(destination, int):
+            return None, await self.__download_file_descriptor(
+                destination=destination,
+                offset=offset,
+                stream=stream,
+            )
+        if isinstance(destination, (bytearray, memoryview)):
+            return None, await self.__download_buffer(
+                destination=destination,
+                offset=offset,
+                stream=stream,
+            )
+        size = await self.__download_file_binary_io(
             destination=destination,
             seek=seek,
             stream=stream,
         )
+        return destination, size
 
     async def _stream_content(
         self,
@@ -167,10 +445,13 @@ class MaxApiClient(AiohttpAsyncClient):
         cls,
         destination: str | pathlib.Path,
         stream: AsyncGenerator[bytes, None],
-    ) -> None:
+    ) -> int:
+        size = 0
         async with await open_file(destination, "wb") as f:
-            async for chunk in stream:
-                await f.write(chunk)
+            async for batch in _batched(stream, _WRITE_BATCH_SIZE):
+                await f.write(batch)
+                size += len(batch)
+        return size
 
     @classmethod
     async def __download_file_binary_io(
@@ -178,10 +459,68 @@ class MaxApiClient(AiohttpAsyncClient):
         destination: BinaryIO,
         seek: bool,
         stream: AsyncGenerator[bytes, None],
-    ) -> BinaryIO:
+    ) -> int:
+        size = 0
         async for chunk in stream:
             destination.write(chunk)
-            destination.flush()
+            size += len(chunk)
+        destination.flush()
         if seek is True:
             destination.seek(0)
-        return destination
+        return size
+
+    @classmethod
+    async def __download_file_descriptor(
+        cls,
+        destination: int,
+        offset: int,
+        stream: AsyncGenerator[bytes, None],
+    ) -> int:
+        size = 0
+        async for batch in _batched(stream, _WRITE_BATCH_SIZE):
+            await to_thread.run_sync(_pwrite_all, destination, batch, offset + size)
+            size += len(batch)
+        return size
+
+    @classmethod
+    async def __download_buffer(
+        cls,
+        destination: bytearray | memoryview,
+        offset: int,
+        stream: AsyncGenerator[bytes, None],
+    ) -> int:
+        buffer = memoryview(destination).cast("B")
+        size = 0
+        async for chunk in stream:
+            start = offset + size
+            if start + len(chunk) > len(buffer):
+                raise ValueError(
+                    f"Buffer of {len(buffer)} bytes is too small "
+                    f"to download into offset {offset}",
+                )
+            buffer[start : start + len(chunk)] = chunk
+            size += len(chunk)
+        return size
+
+
+async def _batched(
+    stream: AsyncGenerator[bytes, None],
+    size: int,
+) -> AsyncGenerator[bytes, None]:
+    """Склеивает части потока в пачки не меньше ``size`` байт."""
+    batch = bytearray()
+    async for chunk in stream:
+        batch += chunk
+        if len(batch) >= size:
+            yield bytes(batch)
+            batch.clear()
+    if batch:
+        yield bytes(batch)
+
+
+def _pwrite_all(fd: int, data: bytes, offset: int) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
@@ -0,0 +1,134 @@
+import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from maxo import loggers
+from maxo.bot.methods.base import MaxoMethod
+from maxo.errors import MaxBotApiError
+
+
+@dataclass(slots=True, frozen=True)
+class BackgroundCallsConfig:
+    """
+    Настройки фоновой отправки запросов через ``Bot.call_soon``.
+
+    Запросы выполняются ``max_concurrency`` воркерами. Если в очереди уже
+    ``max_queue_size`` запросов, новый запрос отбрасывается. При закрытии
+    бота очередь дописывается не дольше ``flush_timeout`` секунд.
+    """
+
+    max_concurrency: int = 8
+    max_queue_size: int = 1000
+    flush_timeout: float = 10.0
+
+    def __post_init__(self) -> None:
+        if self.max_concurrency < 1:
+            raise ValueError("`max_concurrency` should be greater than 0")
+        if self.max_queue_size < 1:
+            raise ValueError("`max_queue_size` should be greater than 0")
+
+
+class BackgroundCalls:
+    """Очередь запросов, результат которых не нужен вызывающему коду."""
+
+    __slots__ = ("_call", "_closed", "_pending", "_queue", "_workers", "config")
+
+    def __init__(
+        self,
+        call: Callable[[MaxoMethod[Any]], Awaitable[Any]],
+        config: BackgroundCallsConfig,
+    ) -> None:
+        self.config = config
+        self._call = call
+        self._queue: asyncio.Queue[MaxoMethod[Any]] = asyncio.Queue(
+            maxsize=config.max_queue_size,
+        )
+        self._workers: set[asyncio.Task[None]] = set()
+        self._closed = False
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Запросы в очереди и в работе."""
+        return self._pending
+
+    def submit(self, method: MaxoMethod[Any]) -> bool:
+        if self._closed:
+            loggers.bot.warning(
+                "Background calls are closed, %s is dropped",
+                type(method).__name__,
+            )
+            return False
+        try:
+            self._queue.put_nowait(method)
+        except asyncio.QueueFull:
+            loggers.bot.warning(
+                "Background calls queue is full, %s is dropped",
+                type(method).__name__,
+            )
+            return False
+        self._pending += 1
+        self._ensure_workers()
+        return True
+
+    async def flush(self, timeout: float | None = None) -> bool:
+        """Ждёт выполнения всех запросов, ``False`` — не успели за ``timeout``."""
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    async def close(self) -> None:
+        self._closed = True
+        if not await self.flush(self.config.flush_timeout):
+            loggers.bot.warning(
+                "Background calls are not finished in %s seconds, %d dropped",
+                self.config.flush_timeout,
+                self._queue.qsize(),
+            )
+
+        workers = set(self._workers)
+        self._workers.clear()
+        for worker in workers:
+            worker.cancel()
+        for worker in workers:
+            with contextlib.suppress(asyncio.CancelledError):
+                await worker
+
+    def _ensure_workers(self) -> None:
+        while len(self._workers) < self.config.max_concurrency:
+            worker = asyncio.create_task(self._work())
+            self._workers.add(worker)
+            worker.add_done_callback(self._on_worker_done)
+
+    def _on_worker_done(self, worker: asyncio.Task[None]) -> None:
+        self._workers.discard(worker)
+        if worker.cancelled() or self._closed:
+            return
+        # Воркер не должен завершаться сам: перезапускаем
+        loggers.bot.error("Background calls worker stopped unexpectedly, restarting")
+        self._ensure_workers()
+
+    async def _work(self) -> None:
+        while True:
+            method = await self._queue.get()
+            try:
+                await self._call(method)
+            except MaxBotApiError as e:
+                loggers.bot.error(
+                    "Background call %s failed: %s: %s",
+                    type(method).__name__,
+                    type(e).__name__,
+                    e,
+                )
+            except Exception:  # noqa: BLE001
+                loggers.bot.exception(
+                    "Background call %s failed",
+                    type(method).__name__,
+                )
+            finally:
+                self._pending -= 1
+                self._queue.task_done()
@@ -0,0 +1,121 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, Generic, TypeVar
+
+from maxo import loggers
+from maxo.bot.methods.base import MaxoMethod
+from maxo.errors.state import StateError
+
+_ResultT = TypeVar("_ResultT")
+
+DEFAULT_BATCH_CONCURRENCY = 10
+
+
+class BatchCall(Generic[_ResultT]):
+    """
+    Запрос из ``Bot.batch()``, результат доступен после выполнения пачки.
+
+    Как и у ``asyncio.Future``, ошибка, которую так и не получили через
+    ``result()`` или ``error``, логируется при удалении объекта.
+    """
+
+    __slots__ = ("_done", "_error", "_result", "_retrieved", "method")
+
+    def __init__(self, method: MaxoMethod[Any]) -> None:
+        self.method = method
+        self._done = False
+        self._result: _ResultT | None = None
+        self._error: BaseException | None = None
+        self._retrieved = False
+
+    def __del__(self) -> None:
+        if self._error is not None and not self._retrieved:
+            loggers.bot_session.error(
+                "Error of batched %s was never retrieved: %s: %s",
+                type(self.method).__name__,
+                type(self._error).__name__,
+                self._error,
+            )
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    @property
+    def error(self) -> BaseException | None:
+        self._retrieved = True
+        return self._error
+
+    def result(self) -> _ResultT:
+        """Результат запроса, ошибка запроса пробрасывается отсюда."""
+        if not self._done:
+            raise StateError("Batch is not executed yet")
+        if self._error is not None:
+            self._retrieved = True
+            raise self._error
+        return self._result  # type: ignore[return-value]
+
+    def _set(self, outcome: Any) -> None:
+        self._done = True
+        if isinstance(outcome, BaseException):
+            self._error = outcome
+        else:
+            self._result = outcome
+
+
+class Batch:
+    """
+    Пачка независимых запросов, которые выполняются одновременно.
+
+    Одновременно выполняется не больше ``max_concurrency`` запросов
+    (``None`` — без ограничения). Запросы идут через общий пул соединений
+    и middleware бота, в том числе ``RateLimiter``. Ошибка одного запроса
+    не отменяет остальные и пробрасывается только из
+    ``BatchCall.result()`` этого запроса.
+    """
+
+    __slots__ = ("_call", "_pending", "max_concurrency")
+
+    def __init__(
+        self,
+        call: Callable[[MaxoMethod[Any]], Awaitable[Any]],
+        max_concurrency: int | None = DEFAULT_BATCH_CONCURRENCY,
+    ) -> None:
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("`max_concurrency` should be greater than 0")
+
+        self._call = call
+        self._pending: list[BatchCall[Any]] = []
+        self.max_concurrency = max_concurrency
+
+    def add(self, method: MaxoMethod[_ResultT]) -> BatchCall[_ResultT]:
+        call: BatchCall[_ResultT] = BatchCall(method)
+        self._pending.append(call)
+        return call
+
+    async def execute(self) -> None:
+        """Выполняет добавленные с прошлого вызова запросы."""
+        calls, self._pending = self._pending, []
+        if not calls:
+            return
+
+        semaphore = None
+        if self.max_concurrency is not None and len(calls) > self.max_concurrency:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        outcomes = await asyncio.gather(
+            *(self._execute(call.method, semaphore) for call in calls),
+            return_exceptions=True,
+        )
+        for call, outcome in zip(calls, outcomes, strict=True):
+            call._set(outcome)  # noqa: SLF001
+
+    async def _execute(
+        self,
+        method: MaxoMethod[Any],
+        semaphore: asyncio.Semaphore | None,
+    ) -> Any:
+        if semaphore is None:
+            return await self._call(method)
+        async with semaphore:
+            return await self._call(method)
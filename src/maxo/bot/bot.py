@@ -1,16 +1,26 @@
+import asyncio
 import json
-import pathlib
-from collections.abc import AsyncIterator, Callable
+from collections.abc import AsyncIterator, Callable, Iterable
 from contextlib import asynccontextmanager
 from typing import Any, BinaryIO, Self, TypeVar
 
 from adaptix import Retort
+from aiohttp import ClientSession
 from unihttp.bind_method import bind_method
 from unihttp.middlewares import AsyncMiddleware
 
 from maxo import loggers
 from maxo.bot.api_client import MaxApiClient
+from maxo.bot.background import BackgroundCalls, BackgroundCallsConfig
+from maxo.bot.batch import DEFAULT_BATCH_CONCURRENCY, Batch
+from maxo.bot.coalescing import CoalescingConfig
 from maxo.bot.defaults import BotDefaults
+from maxo.bot.downloads import (
+    DownloadDestination,
+    DownloadReport,
+    DownloadRequest,
+    DownloadResult,
+)
 from maxo.bot.methods import (
     AddMembers,
     AnswerOnCallback,
@@ -46,6 +56,9 @@ from maxo.bot.methods import (
     UploadMedia,
 )
 from maxo.bot.methods.base import MaxoMethod
+from maxo.bot.prepared import PreparedMessage
+from maxo.bot.retry import RetryPolicy
+from maxo.bot.session import SessionConfig
 from maxo.bot.state import (
     BotState,
     ClosedBotState,
@@ -53,22 +66,39 @@ from maxo.bot.state import (
     EmptyBotState,
     RunningBotState,
 )
+from maxo.enums.text_format import TextFormat
 from maxo.errors import MaxBotApiError
+from maxo.errors.state import StateError
+from maxo.omit import Omittable, Omitted
 from maxo.serialization import create_retort
-from maxo.types import AttachmentPayload, MaxoType
+from maxo.types import (
+    AttachmentPayload,
+    Attachments,
+    AttachmentsRequests,
+    MaxoType,
+    NewMessageLink,
+)
+from maxo.utils.upload_media.cache import BaseUploadCache
 
 _MethodResultT = TypeVar("_MethodResultT", bound=MaxoType)
 
 
 class Bot:
     __slots__ = (
+        "_background",
+        "_background_config",
+        "_coalescing",
         "_defaults",
         "_json_dumps",
         "_json_loads",
         "_middleware",
         "_retort",
+        "_retry_policy",
+        "_session",
+        "_session_config",
         "_state",
         "_token",
+        "_upload_cache",
         "_warming_up",
     )
 
@@ -81,6 +111,12 @@ class Bot:
         middleware: list[AsyncMiddleware] | None = None,
         json_dumps: Callable[[Any], str] = json.dumps,
         json_loads: Callable[[str | bytes | bytearray], Any] = json.loads,
+        retry_policy: RetryPolicy | None = None,
+        session: ClientSession | None = None,
+        session_config: SessionConfig | None = None,
+        upload_cache: BaseUploadCache | None = None,
+        coalescing: CoalescingConfig | None = None,
+        background_calls: BackgroundCallsConfig | None = None,
     ) -> None:
         self._defaults = defaults or BotDefaults()
         self._token = token
@@ -88,6 +124,13 @@ class Bot:
         self._middleware = middleware
         self._json_dumps = json_dumps
         self._json_loads = json_loads
+        self._retry_policy = retry_policy
+        self._session = session
+        self._session_config = session_config or SessionConfig()
+        self._upload_cache = upload_cache
+        self._coalescing = coalescing
+        self._background_config = background_calls or BackgroundCallsConfig()
+        self._background: BackgroundCalls | None = None
 
         self._retort = create_retort(defaults=self._defaults, warming_up=warming_up)
 
@@ -109,6 +152,18 @@ class Bot:
     def token(self) -> str:
         return self._token
 
+    @property
+    def json_loads(self) -> Callable[[str | bytes | bytearray], Any]:
+        return self._json_loads
+
+    @property
+    def json_dumps(self) -> Callable[[Any], str]:
+        return self._json_dumps
+
+    @property
+    def upload_cache(self) -> BaseUploadCache | None:
+        return self._upload_cache
+
     async def start(self) -> None:
         if self.state.started:
             return
@@ -120,11 +175,28 @@ class Bot:
             middleware=self._middleware,
             json_dumps=self._json_dumps,
             json_loads=self._json_loads,
+            retry_policy=self._retry_policy,
+            session=self._session,
+            session_config=self._session_config,
+            coalescing=self._coalescing,
         )
         self._state = ConnectingBotState(api_client=api_client)
 
-        info = await self.get_my_info()
+        try:
+            if self._session_config.preconnect:
+                info, _ = await asyncio.gather(
+                    self.get_my_info(),
+                    api_client.preconnect(self._session_config.preconnect),
+                )
+            else:
+                info = await self.get_my_info()
+        except BaseException:
+            # Бот не запущен: сессию закрываем, чтобы ``start`` можно было повторить
+            await api_client.close()
+            self._state = EmptyBotState()
+            raise
         self._state = RunningBotState(info=info, api_client=api_client)
+        self._background = BackgroundCalls(self.call_method, self._background_config)
 
     @asynccontextmanager
     async def context(self, auto_close: bool = True) -> AsyncIterator[Self]:
@@ -151,20 +223,94 @@ class Bot:
             # For debugging here is added logging.
             loggers.bot.error("Failed to make answer: %s: %s", e.__class__.__name__, e)
 
+    def prepare_message(
+        self,
+        text: str | None = None,
+        attachments: list[AttachmentsRequests | Attachments] | None = None,
+        link: NewMessageLink | None = None,
+        format: Omittable[TextFormat | None] = Omitted(),
+        notify: Omittable[bool] = Omitted(),
+    ) -> PreparedMessage:
+        """
+        Сериализует тело сообщения один раз для многих отправок.
+
+        .. code-block:: python
+
+            prepared = bot.prepare_message(text="Новости", attachments=[keyboard])
+            for user_id in user_ids:
+                await bot.call_method(
+                    SendPreparedMessage(user_id=user_id, prepared=prepared),
+                )
+        """
+        return PreparedMessage.build(
+            retort=self._retort,
+            json_dumps=self._json_dumps,
+            text=text,
+            attachments=attachments,
+            link=link,
+            format=format,
+            notify=notify,
+        )
+
+    @asynccontextmanager
+    async def batch(
+        self,
+        max_concurrency: int | None = DEFAULT_BATCH_CONCURRENCY,
+    ) -> AsyncIterator[Batch]:
+        """
+        Собирает независимые запросы и выполняет их одновременно при выходе.
+
+        Одновременно выполняется не больше ``max_concurrency`` запросов.
+
+        .. code-block:: python
+
+            async with bot.batch() as batch:
+                chat = batch.add(GetChat(chat_id=chat_id))
+                pinned = batch.add(GetPinnedMessage(chat_id=chat_id))
+            print(chat.result().title, pinned.result().message)
+        """
+        batch = Batch(self.call_method, max_concurrency)
+        yield batch
+        await batch.execute()
+
+    def call_soon(self, method: MaxoMethod[Any]) -> bool:
+        """
+        Ставит запрос в фоновую очередь и сразу возвращает управление.
+
+        Для запросов, результат которых не нужен: ответ на callback без
+        уведомления, индикатор набора текста и т.п. Ошибки запроса только
+        логируются.
+
+        :return: ``False``, если очередь переполнена и запрос отброшен.
+        """
+        if self._background is None:
+            raise StateError("Not started bot")
+        return self._background.submit(method)
+
+    async def flush(self, timeout: float | None = None) -> bool:
+        """Ждёт выполнения запросов из ``call_soon``."""
+        if self._background is None:
+            return True
+        return await self._background.flush(timeout)
+
     async def close(self) -> None:
         if self.state.closed or not self.state.started:
             return
 
+        if self._background is not None:
+            await self._background.close()
+            self._background = None
         await self.state.api_client.close()
         self._state = ClosedBotState()
 
     async def download(
         self,
         url: str | AttachmentPayload,
-        destination: BinaryIO | pathlib.Path | str | None = None,
+        destination: DownloadDestination | None = None,
         timeout: int = 30,
         chunk_size: int = 65536,
         seek: bool = True,
+        offset: int = 0,
     ) -> BinaryIO | None:
         return await self.state.api_client.download(
             url=url,
@@ -172,6 +318,23 @@ class Bot:
             timeout=timeout,
             chunk_size=chunk_size,
             seek=seek,
+            offset=offset,
+        )
+
+    async def download_many(
+        self,
+        downloads: Iterable[DownloadRequest | str | AttachmentPayload],
+        concurrency: int = 8,
+        timeout: int = 30,
+        chunk_size: int = 65536,
+        on_result: Callable[[DownloadResult], Any] | None = None,
+    ) -> DownloadReport:
+        return await self.state.api_client.download_many(
+            downloads=downloads,
+            concurrency=concurrency,
+            timeout=timeout,
+            chunk_size=chunk_size,
+            on_result=on_result,
         )
 
     # Bots
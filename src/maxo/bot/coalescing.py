@@ -0,0 +1,149 @@
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from copy import deepcopy
+from dataclasses import dataclass, field
+from typing import Any
+
+from cachetools import LRUCache
+from unihttp.http import HTTPRequest
+
+from maxo.bot.methods.base import MaxoMethod
+from maxo.bot.methods.subscriptions.get_updates import GetUpdates
+from maxo.omit import Omitted
+
+
+@dataclass(slots=True, frozen=True)
+class CoalescingConfig:
+    """
+    Настройки объединения одинаковых GET-запросов.
+
+    Одновременные вызовы GET-метода с одинаковыми аргументами выполняются
+    одним запросом, его результат получают все вызвавшие. ``cache_ttl``
+    дополнительно кеширует ответы по классу метода (с учётом наследования)
+    на указанное число секунд. Если ответ достаётся нескольким вызвавшим
+    или кешируется, каждый получает свою копию, поэтому изменение ответа
+    в одном обработчике не влияет на другие.
+    """
+
+    enabled: bool = True
+    exclude: frozenset[type[MaxoMethod[Any]]] = frozenset({GetUpdates})
+    """Методы, которые всегда выполняются отдельным запросом."""
+    cache_ttl: Mapping[type[MaxoMethod[Any]], float] = field(default_factory=dict)
+    cache_size: int = 1024
+
+    def __post_init__(self) -> None:
+        if self.cache_size < 1:
+            raise ValueError("`cache_size` should be greater than 0")
+        if any(ttl <= 0 for ttl in self.cache_ttl.values()):
+            raise ValueError("`cache_ttl` values should be greater than 0")
+
+    @classmethod
+    def disabled(cls) -> "CoalescingConfig":
+        return cls(enabled=False)
+
+    def should_coalesce(self, method_type: type[Any]) -> bool:
+        if not self.enabled or getattr(method_type, "__method__", None) != "get":
+            return False
+        return not any(class_ in self.exclude for class_ in method_type.__mro__)
+
+    def get_ttl(self, method_type: type[Any]) -> float | None:
+        for class_ in method_type.__mro__:
+            if class_ in self.cache_ttl:
+                return self.cache_ttl[class_]
+        return None
+
+
+RequestKey = tuple[type[MaxoMethod[Any]], str]
+
+
+@dataclass(slots=True)
+class _Flight:
+    task: asyncio.Task[Any]
+    waiters: int = 1
+
+
+class RequestCoalescer:
+    __slots__ = ("_cache", "_in_flight", "config")
+
+    def __init__(self, config: CoalescingConfig) -> None:
+        self.config = config
+        self._in_flight: dict[RequestKey, _Flight] = {}
+        self._cache: LRUCache[RequestKey, tuple[float, Any]] = LRUCache(
+            maxsize=config.cache_size,
+        )
+
+    async def call[T](
+        self,
+        method: MaxoMethod[T],
+        request: HTTPRequest,
+        send: Callable[[MaxoMethod[T]], Awaitable[T]],
+    ) -> T:
+        """Выполняет ``method``, объединяя его с такими же запросами ``request``."""
+        key = (type(method), _request_key(request))
+        ttl = self.config.get_ttl(type(method))
+        if ttl is not None:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                return _copy(cached[1])  # type: ignore[no-any-return]
+
+        flight = self._in_flight.get(key)
+        if flight is None:
+            # Запрос выполняется отдельной задачей: отмена одного
+            # из ожидающих не должна отменять его для остальных
+            task = asyncio.create_task(self._send(key, method, send, ttl))
+            flight = self._in_flight[key] = _Flight(task)
+        else:
+            flight.waiters += 1
+
+        result = await asyncio.shield(flight.task)
+        # Новые ожидающие к завершённому запросу уже не добавятся: если ответ
+        # достался только этому вызову и не кешируется, копия не нужна
+        if flight.waiters == 1 and ttl is None:
+            return result  # type: ignore[no-any-return]
+        return _copy(result)  # type: ignore[no-any-return]
+
+    def invalidate(self, method_type: type[MaxoMethod[Any]] | None = None) -> None:
+        """Сбрасывает кеш ответов, целиком или для класса методов."""
+        if method_type is None:
+            self._cache.clear()
+            return
+        for key in [key for key in self._cache if issubclass(key[0], method_type)]:
+            del self._cache[key]
+
+    async def _send[T](
+        self,
+        key: RequestKey,
+        method: MaxoMethod[T],
+        send: Callable[[MaxoMethod[T]], Awaitable[T]],
+        ttl: float | None,
+    ) -> T:
+        try:
+            result = await send(method)
+        finally:
+            del self._in_flight[key]
+        if ttl is not None:
+            self._cache[key] = (time.monotonic() + ttl, result)
+        return result
+
+
+def _copy(result: Any) -> Any:
+    # ``Omitted`` — синглтон, копия должна ссылаться на тот же объект
+    omitted = Omitted()
+    return deepcopy(result, {id(omitted): omitted})
+
+
+def _request_key(request: HTTPRequest) -> str:
+    # Ключ строится по тому, что реально уходит на сервер
+    return json.dumps(
+        [
+            request.method,
+            request.url,
+            request.path,
+            request.query,
+            request.body,
+        ],
+        sort_keys=True,
+        default=repr,
+    )
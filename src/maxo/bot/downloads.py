@@ -0,0 +1,62 @@
+import pathlib
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from maxo.types import AttachmentPayload
+
+DownloadDestination = BinaryIO | pathlib.Path | str | bytearray | memoryview | int
+"""
+Куда записать файл:
+
+- ``BinaryIO`` — файловый объект, ``flush`` вызывается один раз в конце;
+- ``str`` или ``Path`` — путь к файлу;
+- ``bytearray`` или ``memoryview`` — заранее выделенный буфер;
+- ``int`` — файловый дескриптор, запись через ``os.pwrite`` с ``offset``.
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class DownloadRequest:
+    url: str | AttachmentPayload
+    destination: DownloadDestination | None = None
+    """``None`` — скачать в ``io.BytesIO``, он вернётся в ``DownloadResult.file``."""
+    offset: int = 0
+    """Смещение для записи в буфер или файловый дескриптор."""
+
+
+@dataclass(slots=True, frozen=True)
+class DownloadResult:
+    request: DownloadRequest
+    size: int
+    """Сколько байт записано."""
+    elapsed: float
+    """Время скачивания в секундах."""
+    file: BinaryIO | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(slots=True, frozen=True)
+class DownloadReport:
+    results: Sequence[DownloadResult]
+    """Результаты в порядке запросов."""
+    elapsed: float
+
+    @property
+    def size(self) -> int:
+        return sum(result.size for result in self.results)
+
+    @property
+    def failed(self) -> list[DownloadResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def throughput(self) -> float:
+        """Средняя скорость скачивания, байт в секунду."""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.size / self.elapsed
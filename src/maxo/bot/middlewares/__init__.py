@@ -0,0 +1,8 @@
+from .rate_limit import Priority, RateLimiter, TokenBucket, use_priority
+
+__all__ = (
+    "Priority",
+    "RateLimiter",
+    "TokenBucket",
+    "use_priority",
+)
@@ -0,0 +1,217 @@
+import asyncio
+import heapq
+import itertools
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Final, cast
+
+from cachetools import LRUCache
+from unihttp.http import HTTPRequest, HTTPResponse
+from unihttp.middlewares import AsyncHandler, AsyncMiddleware
+
+PLATFORM_RPS_LIMIT: Final = 30
+
+
+class Priority(IntEnum):
+    """Чем меньше значение, тем раньше запрос получит токен."""
+
+    INTERACTIVE = 0
+    DEFAULT = 10
+    BROADCAST = 20
+
+
+_priority: ContextVar[Priority] = ContextVar(
+    "maxo_rate_limit_priority",
+    default=Priority.DEFAULT,
+)
+
+
+@contextmanager
+def use_priority(priority: Priority) -> Iterator[None]:
+    """Задаёт приоритет для всех запросов к API внутри блока."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    """
+    Асинхронный token bucket с очередью ожидающих по приоритету.
+
+    Токены пополняются со скоростью ``rate`` в секунду, но не больше
+    ``capacity``. Пока есть ожидающие, новые запросы встают в очередь
+    и не могут обогнать более приоритетные.
+    """
+
+    __slots__ = (
+        "_counter",
+        "_tokens",
+        "_updated_at",
+        "_waiters",
+        "_wakeup",
+        "capacity",
+        "rate",
+    )
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        if rate <= 0:
+            raise ValueError("`rate` should be greater than 0")
+        self.rate = rate
+        self.capacity = rate if capacity is None else capacity
+        self._tokens = self.capacity
+        self._updated_at: float | None = None
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+
+    @property
+    def waiting(self) -> int:
+        return sum(not future.done() for _, _, future in self._waiters)
+
+    async def acquire(self, priority: int = Priority.DEFAULT) -> None:
+        loop = asyncio.get_running_loop()
+        self._refill(loop.time())
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        future: asyncio.Future[None] = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        self._schedule(loop)
+        await future
+
+    def drain(self) -> None:
+        """Обнуляет запас токенов, например после ответа 429."""
+        self._tokens = min(self._tokens, 0)
+
+    def _refill(self, now: float) -> None:
+        if self._updated_at is not None:
+            elapsed = now - self._updated_at
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._wakeup is not None:
+            return
+        delay = max(0.0, (1 - self._tokens) / self.rate)
+        self._wakeup = loop.call_later(delay, self._wake, loop)
+
+    def _wake(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._wakeup = None
+        self._refill(loop.time())
+        while self._waiters:
+            _, _, future = self._waiters[0]
+            if future.done():  # cancelled
+                heapq.heappop(self._waiters)
+                continue
+            if self._tokens < 1:
+                break
+            heapq.heappop(self._waiters)
+            self._tokens -= 1
+            future.set_result(None)
+        if self._waiters:
+            self._schedule(loop)
+
+
+class RateLimiter(AsyncMiddleware):
+    """
+    Клиентский ограничитель частоты запросов к Bot API.
+
+    Подключается как middleware бота. Один экземпляр можно передать
+    нескольким ``Bot`` с одним токеном, тогда лимит будет общим::
+
+        limiter = RateLimiter()
+        bot = Bot(token, middleware=[limiter])
+
+    Все запросы к platform-api проходят через общий лимит ``rate``.
+    Если задан ``chat_rate``, отправка и редактирование сообщений
+    дополнительно ограничиваются для каждого чата отдельно. Запрос на
+    редактирование содержит только ``message_id``, поэтому чат берётся из
+    запомненных ответов на отправку (последние ``max_messages`` сообщений):
+    редактирование сообщения, отправленного не через этот ограничитель,
+    проходит только через общий лимит. Приоритет задаётся через
+    ``use_priority``: ответы пользователям обгоняют рассылки.
+    """
+
+    __slots__ = ("_chats", "_global", "_messages", "chat_capacity", "chat_rate")
+
+    def __init__(
+        self,
+        rate: float = PLATFORM_RPS_LIMIT,
+        capacity: float | None = None,
+        chat_rate: float | None = None,
+        chat_capacity: float | None = None,
+        max_chats: int = 10_000,
+        max_messages: int = 10_000,
+    ) -> None:
+        self._global = TokenBucket(rate, capacity)
+        self.chat_rate = chat_rate
+        self.chat_capacity = chat_capacity
+        self._chats: LRUCache[tuple[str, Any], TokenBucket] = LRUCache(
+            maxsize=max_chats,
+        )
+        self._messages: LRUCache[str, tuple[str, Any]] = LRUCache(
+            maxsize=max_messages,
+        )
+
+    @property
+    def waiting(self) -> int:
+        return self._global.waiting
+
+    async def handle(
+        self,
+        request: HTTPRequest,
+        next_handler: AsyncHandler,
+    ) -> HTTPResponse:
+        if "://" in request.url:
+            # Загрузка файлов идёт на другие хосты и не входит в лимит platform-api
+            return await next_handler(request)
+
+        priority = _priority.get()
+        chat_key = self._chat_key(request)
+        if chat_key is not None:
+            await self._chat_bucket(chat_key).acquire(priority)
+        await self._global.acquire(priority)
+
+        response = await next_handler(request)
+        if response.status_code == 429:  # noqa: PLR2004
+            self._global.drain()
+        elif chat_key is not None and request.method == "post":
+            self._remember_message(chat_key, response.data)
+        return response
+
+    def _chat_key(self, request: HTTPRequest) -> tuple[str, Any] | None:
+        if self.chat_rate is None or request.url != "messages":
+            return None
+        if request.method == "post":
+            if (chat_id := request.query.get("chat_id")) is not None:
+                return ("chat_id", chat_id)
+            if (user_id := request.query.get("user_id")) is not None:
+                return ("user_id", user_id)
+        elif request.method == "put":
+            message_id = request.query.get("message_id")
+            if message_id is not None:
+                return cast(tuple[str, Any] | None, self._messages.get(message_id))
+        return None
+
+    def _chat_bucket(self, chat_key: tuple[str, Any]) -> TokenBucket:
+        bucket = cast(TokenBucket | None, self._chats.get(chat_key))
+        if bucket is None:
+            bucket = self._chats[chat_key] = TokenBucket(
+                cast(float, self.chat_rate),
+                self.chat_capacity,
+            )
+        return bucket
+
+    def _remember_message(self, chat_key: tuple[str, Any], data: Any) -> None:
+        # Ответ на отправку: ``{"message": {"body": {"mid": ...}, ...}}``
+        if not isinstance(data, dict):
+            return
+        message = data.get("message")
+        body = message.get("body") if isinstance(message, dict) else None
+        if isinstance(body, dict) and (mid := body.get("mid")) is not None:
+            self._messages[mid] = chat_key
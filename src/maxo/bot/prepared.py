@@ -0,0 +1,106 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from adaptix import Retort
+from unihttp.http import HTTPRequest
+from unihttp.serialize import RequestDumper
+
+from maxo.bot.methods.messages.edit_message import EditMessage
+from maxo.bot.methods.messages.send_message import SendMessage
+from maxo.enums.text_format import TextFormat
+from maxo.omit import Omittable, Omitted, is_defined
+from maxo.types.attachments import Attachments, AttachmentsRequests
+from maxo.types.new_message_link import NewMessageLink
+
+
+@dataclass(slots=True, frozen=True)
+class PreparedMessage:
+    """
+    Тело сообщения (``NewMessageBody``), сериализованное в JSON один раз.
+
+    Отправляется методами ``SendPreparedMessage`` и ``EditPreparedMessage``
+    как есть, без повторной сериализации, поэтому одно и то же сообщение
+    для тысяч получателей почти не тратит CPU. Вложения с файлами нужно
+    загрузить заранее и передать готовыми запросами с токенами.
+    """
+
+    data: bytes
+
+    @classmethod
+    def build(
+        cls,
+        retort: Retort,
+        json_dumps: Callable[[Any], str],
+        text: str | None = None,
+        attachments: list[AttachmentsRequests | Attachments] | None = None,
+        link: NewMessageLink | None = None,
+        format: Omittable[TextFormat | None] = Omitted(),
+        notify: Omittable[bool] = Omitted(),
+    ) -> "PreparedMessage":
+        method = SendMessage(
+            text=text,
+            attachments=attachments,
+            link=link,
+            format=format,
+            notify=notify,
+        )
+        body = retort.dump(method)["body"]
+        return cls(data=json_dumps(body).encode())
+
+
+def _build_request(
+    url: str,
+    method: str,
+    query: dict[str, Any],
+    body: PreparedMessage,
+) -> HTTPRequest:
+    return HTTPRequest(
+        url=url,
+        method=method,
+        header={"Content-Type": "application/json"},
+        path={},
+        query=query,
+        body=body,
+        file={},
+        form={},
+    )
+
+
+class SendPreparedMessage(SendMessage):
+    """
+    ``SendMessage`` с заранее сериализованным телом ``prepared``.
+
+    Из полей ``SendMessage`` используются только параметры запроса:
+    ``chat_id``, ``user_id`` и ``disable_link_preview``.
+    """
+
+    prepared: PreparedMessage
+
+    def build_http_request(self, request_dumper: RequestDumper) -> HTTPRequest:
+        query: dict[str, Any] = {}
+        if is_defined(self.chat_id):
+            query["chat_id"] = self.chat_id
+        if is_defined(self.user_id):
+            query["user_id"] = self.user_id
+        if is_defined(self.disable_link_preview):
+            query["disable_link_preview"] = int(self.disable_link_preview)
+        return _build_request(self.__url__, self.__method__, query, self.prepared)
+
+
+class EditPreparedMessage(EditMessage):
+    """
+    ``EditMessage`` с заранее сериализованным телом ``prepared``.
+
+    Из полей ``EditMessage`` используется только ``message_id``.
+    """
+
+    prepared: PreparedMessage
+
+    def build_http_request(self, request_dumper: RequestDumper) -> HTTPRequest:
+        return _build_request(
+            self.__url__,
+            self.__method__,
+            {"message_id": self.message_id},
+            self.prepared,
+        )
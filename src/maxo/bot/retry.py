@@ -0,0 +1,123 @@
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from maxo.backoff import BackoffConfig
+from maxo.bot.methods.base import MaxoMethod
+from maxo.bot.methods.messages.edit_message import EditMessage
+from maxo.bot.methods.messages.send_message import SendMessage
+from maxo.errors import (
+    MaxBotApiError,
+    MaxBotServiceUnavailableError,
+    MaxBotTooManyRequestsError,
+)
+
+ATTACHMENT_NOT_READY = "attachment.not.ready"
+
+DEFAULT_BACKOFF_CONFIG = BackoffConfig(
+    min_delay=0.5,
+    max_delay=10.0,
+    factor=2.0,
+    jitter=0.1,
+)
+ATTACHMENT_BACKOFF_CONFIG = BackoffConfig(
+    min_delay=0.1,
+    max_delay=3.0,
+    factor=2.0,
+    jitter=0.02,
+)
+
+
+@dataclass(slots=True, frozen=True)
+class RetryRule:
+    """
+    Правило повтора запроса.
+
+    Запрос повторяется, если исключение относится к одному из ``retry_on``
+    или его ``code`` входит в ``retry_codes``. ``max_attempts`` учитывает
+    и первую попытку, ``max_attempts=1`` отключает повторы.
+    """
+
+    max_attempts: int = 5
+    backoff: BackoffConfig = DEFAULT_BACKOFF_CONFIG
+    retry_on: tuple[type[MaxBotApiError], ...] = (
+        MaxBotTooManyRequestsError,
+        MaxBotServiceUnavailableError,
+    )
+    retry_codes: frozenset[str] = frozenset()
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError("`max_attempts` should be greater than 0")
+
+    def should_retry(self, error: MaxBotApiError) -> bool:
+        return isinstance(error, self.retry_on) or error.code in self.retry_codes
+
+
+DEFAULT_RETRY_RULE = RetryRule()
+# Отправка и редактирование не идемпотентны: после 503 сообщение могло уже
+# уйти, поэтому повторяются только отклонённые сервером запросы (429) и
+# ``attachment.not.ready``
+ATTACHMENT_RETRY_RULE = RetryRule(
+    max_attempts=10,
+    backoff=ATTACHMENT_BACKOFF_CONFIG,
+    retry_on=(MaxBotTooManyRequestsError,),
+    retry_codes=frozenset({ATTACHMENT_NOT_READY}),
+)
+NO_RETRY_RULE = RetryRule(max_attempts=1)
+
+_retries_disabled: ContextVar[bool] = ContextVar(
+    "maxo_retries_disabled",
+    default=False,
+)
+
+
+@contextmanager
+def without_retries() -> Iterator[None]:
+    """
+    Отключает повторы клиента для всех запросов к API внутри блока.
+
+    Нужен коду, который повторяет запросы сам: иначе каждая его попытка
+    повторялась бы ещё и клиентом.
+    """
+    token = _retries_disabled.set(True)
+    try:
+        yield
+    finally:
+        _retries_disabled.reset(token)
+
+
+def retries_disabled() -> bool:
+    return _retries_disabled.get()
+
+
+@dataclass(slots=True, frozen=True)
+class RetryPolicy:
+    """
+    Правила повтора запросов по классам методов.
+
+    Правило ищется по MRO класса метода, поэтому правило для базового
+    класса действует и на его наследников. Если ничего не нашлось,
+    используется ``default``.
+    """
+
+    default: RetryRule = DEFAULT_RETRY_RULE
+    rules: Mapping[type[MaxoMethod[Any]], RetryRule] = field(
+        default_factory=lambda: {
+            SendMessage: ATTACHMENT_RETRY_RULE,
+            EditMessage: ATTACHMENT_RETRY_RULE,
+        },
+    )
+
+    @classmethod
+    def disabled(cls) -> "RetryPolicy":
+        return cls(default=NO_RETRY_RULE, rules={})
+
+    def get_rule(self, method_type: type[Any]) -> RetryRule:
+        for class_ in method_type.__mro__:
+            rule = self.rules.get(class_)
+            if rule is not None:
+                return rule
+        return self.default
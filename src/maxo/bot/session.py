@@ -0,0 +1,59 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+from maxo.bot.methods.base import MaxoMethod
+from maxo.bot.methods.subscriptions.get_updates import GetUpdates
+from maxo.bot.methods.upload.upload_media import UploadMedia
+
+
+@dataclass(slots=True, frozen=True)
+class SessionConfig:
+    """
+    Настройки HTTP-сессии бота.
+
+    Параметры пула соединений передаются в ``aiohttp.TCPConnector``
+    и действуют, только если сессию создаёт сам бот. Тайм-ауты
+    применяются к каждому запросу и для своей сессии тоже: ``timeout``
+    по умолчанию, ``method_timeouts`` — по классу метода (с учётом
+    наследования), ``None`` снимает ограничение.
+    """
+
+    limit: int = 100
+    limit_per_host: int = 0
+    keepalive_timeout: float = 30.0
+    ttl_dns_cache: int | None = 300
+    connect_timeout: float | None = 10.0
+    timeout: float | None = 60.0
+    method_timeouts: Mapping[type[MaxoMethod[Any]], float | None] = field(
+        default_factory=lambda: {GetUpdates: 120.0, UploadMedia: 300.0},
+    )
+    preconnect: int = 0
+    """Сколько соединений открыть заранее при ``Bot.start()``."""
+
+    def __post_init__(self) -> None:
+        if self.preconnect < 0:
+            raise ValueError("`preconnect` should not be negative")
+        if self.limit and self.preconnect > self.limit:
+            raise ValueError("`preconnect` should not be greater than `limit`")
+
+    def get_timeout(self, method_type: type[Any]) -> float | None:
+        for class_ in method_type.__mro__:
+            if class_ in self.method_timeouts:
+                return self.method_timeouts[class_]
+        return self.timeout
+
+    def create_session(self) -> ClientSession:
+        connector = TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=self.ttl_dns_cache != 0,
+        )
+        return ClientSession(
+            connector=connector,
+            timeout=ClientTimeout(total=None, sock_connect=self.connect_timeout),
+        )
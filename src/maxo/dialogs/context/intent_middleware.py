@@ -361,7 +361,7 @@ class IntentMiddlewareFactory:
         result = await next(ctx)
         if result is UNHANDLED and ctx.get(FORBIDDEN_STACK_KEY):
             facade = cast(MessageCallbackFacade, ctx[FACADE_KEY])
-            await facade.callback_answer(notification="")
+            facade.callback_answer_soon(notification="")
         return result
 
     async def process_bot_started(
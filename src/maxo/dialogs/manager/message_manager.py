@@ -1,9 +1,16 @@
 import warnings
 from collections.abc import Sequence
+from datetime import UTC, datetime
 from logging import getLogger
 
 from maxo import Bot
-from maxo.dialogs.api.entities import MediaAttachment, NewMessage, OldMessage, ShowMode
+from maxo.dialogs.api.entities import (
+    MediaAttachment,
+    NewMessage,
+    OldMessage,
+    ShowMode,
+    UnknownText,
+)
 from maxo.dialogs.api.protocols import (
     MediaIdStorageProtocol,
     MessageManagerProtocol,
@@ -14,14 +21,19 @@ from maxo.enums import AttachmentType, UploadType
 from maxo.errors import MaxBotApiError, MaxBotBadRequestError
 from maxo.omit import Omitted
 from maxo.types import (
+    Attachments,
     AttachmentsRequests,
     AudioAttachmentRequest,
     Callback,
     FileAttachmentRequest,
     InlineButtons,
+    InlineKeyboardAttachment,
+    InlineKeyboardAttachmentRequest,
+    Keyboard,
     MediaAttachments,
     MediaAttachmentsRequests,
     Message,
+    MessageBody,
     PhotoAttachmentRequest,
     VideoAttachmentRequest,
 )
@@ -53,6 +65,65 @@ def _combine(sent_message: NewMessage, message_result: Message) -> OldMessage:
     )
 
 
+def _edited(
+    old_message: OldMessage,
+    text: str | None | UnknownText,
+    attachments: list[Attachments],
+) -> Message:
+    return Message(
+        timestamp=datetime.now(UTC),
+        recipient=old_message.recipient,
+        body=MessageBody(
+            mid=old_message.message_id,
+            seq=old_message.sequence_id,
+            text=None if isinstance(text, UnknownText) else text,
+            attachments=attachments,
+        ),
+    )
+
+
+def _edited_attachments(
+    old_message: OldMessage,
+    requests: Sequence[AttachmentsRequests],
+) -> list[Attachments] | None:
+    """
+    Восстанавливает вложения отредактированного сообщения без запроса к API.
+
+    Клавиатуру можно собрать из запроса, а медиа — только переиспользовать
+    из старого сообщения: для новых файлов сервер сам выдаёт ``payload``.
+    Если медиа изменились, возвращает ``None``.
+    """
+    old_media = [
+        attachment
+        for attachment in old_message.attachments
+        if not isinstance(attachment, InlineKeyboardAttachment)
+    ]
+    keyboard: list[Attachments] = []
+    media_requests: list[AttachmentsRequests] = []
+    for request in requests:
+        if isinstance(request, InlineKeyboardAttachmentRequest):
+            keyboard.append(
+                InlineKeyboardAttachment(
+                    payload=Keyboard(buttons=request.payload.buttons),
+                ),
+            )
+        else:
+            media_requests.append(request)
+
+    old_requests = [attachment.to_request() for attachment in old_media]
+    if list(map(_request_key, media_requests)) != list(map(_request_key, old_requests)):
+        return None
+    return [*old_media, *keyboard]
+
+
+def _request_key(request: AttachmentsRequests) -> object:
+    # Запросы с одним токеном могут отличаться пустыми полями (None/Omitted)
+    token = getattr(getattr(request, "payload", None), "token", None)
+    if isinstance(token, str):
+        return request.type, token
+    return request
+
+
 class MessageManager(MessageManagerProtocol):
     def __init__(self, media_id_storage: MediaIdStorageProtocol) -> None:
         self.media_id_storage = media_id_storage
@@ -174,15 +245,15 @@ class MessageManager(MessageManagerProtocol):
         logger.debug("remove_inline_kbd in %s", old_message.recipient)
         try:
             new_attachments = [
-                attach.to_request()
+                attach
                 for attach in old_message.attachments
                 if attach.type != AttachmentType.INLINE_KEYBOARD
             ]
             await bot.edit_message(
                 message_id=old_message.message_id,
-                attachments=new_attachments,
+                attachments=[attach.to_request() for attach in new_attachments],
             )
-            return await bot.get_message_by_id(message_id=old_message.message_id)
+            return _edited(old_message, old_message.text, new_attachments)
         except MaxBotBadRequestError as err:
             if "message is not modified" in err.message:
                 pass  # nothing to remove
@@ -251,7 +322,11 @@ class MessageManager(MessageManagerProtocol):
             attachments=attachments,
             format=new_message.parse_mode,
         )
-        return await bot.get_message_by_id(message_id=old_message.message_id)
+
+        edited_attachments = _edited_attachments(old_message, attachments)
+        if edited_attachments is None:
+            return await bot.get_message_by_id(message_id=old_message.message_id)
+        return _edited(old_message, new_message.text, edited_attachments)
 
     async def send_message(self, bot: Bot, new_message: NewMessage) -> Message:
         if new_message.link_preview_options:
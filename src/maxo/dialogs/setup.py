@@ -33,7 +33,7 @@ from maxo.dialogs.manager.manager_middleware import (
 from maxo.dialogs.manager.message_manager import MessageManager
 from maxo.dialogs.manager.update_handler import handle_aiogd_update
 from maxo.fsm import State, StatesGroup
-from maxo.fsm.key_builder import DefaultKeyBuilder
+from maxo.fsm.key_builder import CachedKeyBuilder, DefaultKeyBuilder
 from maxo.fsm.storages.base import BaseEventIsolation
 from maxo.fsm.storages.memory import SimpleEventIsolation
 from maxo.routing.interfaces import BaseRouter
@@ -227,7 +227,9 @@ def _prepare_events_isolation(
 ) -> BaseEventIsolation:
     if events_isolation:
         return events_isolation
-    return SimpleEventIsolation(DefaultKeyBuilder(with_destiny=True))
+    return SimpleEventIsolation(
+        CachedKeyBuilder(DefaultKeyBuilder(with_destiny=True)),
+    )
 
 
 def collect_dialogs(router: BaseRouter) -> Iterable[DialogProtocol]:
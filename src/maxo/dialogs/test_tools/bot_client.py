@@ -3,6 +3,7 @@ from datetime import UTC, datetime
 from typing import Any
 
 from maxo import Bot, Dispatcher
+from maxo.bot.methods.base import MaxoMethod
 from maxo.bot.state import RunningBotState
 from maxo.enums import ChatStatus, ChatType, MessageLinkType
 from maxo.routing.signals import MaxoUpdate
@@ -39,10 +40,16 @@ class FakeBot(Bot):
             last_activity_time=datetime.fromtimestamp(1234567890, tz=UTC),
         )
         self._state = RunningBotState(info=info, api_client=None)
+        self.background_calls: list[MaxoMethod[Any]] = []
 
     def answer_on_callback(self, *_: Any, **__: Any) -> None:
         pass
 
+    def call_soon(self, method: MaxoMethod[Any]) -> bool:
+        # Фоновой очереди у тестового бота нет: запросы только запоминаются
+        self.background_calls.append(method)
+        return True
+
     def __hash__(self) -> int:
         return 1000
 
@@ -1,7 +1,9 @@
 from abc import abstractmethod
+from collections.abc import Callable
 from dataclasses import dataclass
 from enum import StrEnum
-from typing import Final, Protocol
+from functools import lru_cache
+from typing import Final, Generic, NamedTuple, Protocol, TypeVar
 
 DESTINY_DEFAULT: Final = "default"
 
@@ -20,6 +22,22 @@ class StorageKeyType(StrEnum):
     LOCK = "lock"
 
 
+_KeyT = TypeVar("_KeyT", str, bytes)
+
+
+class BuiltKeys(NamedTuple, Generic[_KeyT]):
+    data: _KeyT
+    state: _KeyT
+    lock: _KeyT
+
+
+_TYPE_INDEX: Final = {
+    StorageKeyType.DATA: 0,
+    StorageKeyType.STATE: 1,
+    StorageKeyType.LOCK: 2,
+}
+
+
 class BaseKeyBuilder(Protocol):
     __slots__ = ()
 
@@ -31,6 +49,15 @@ class BaseKeyBuilder(Protocol):
     ) -> str:
         raise NotImplementedError
 
+    def parse(self, value: str, bot_id: int = 0) -> tuple[StorageKey, StorageKeyType]:
+        """
+        Восстанавливает ``StorageKey`` из ключа, собранного с ``type_``.
+
+        Нужен для ``BaseStorage.scan``. Если билдер не пишет ``bot_id``
+        в ключ, в результат подставляется переданный ``bot_id``.
+        """
+        raise NotImplementedError
+
 
 class DefaultKeyBuilder(BaseKeyBuilder):
     __slots__ = ("prefix", "separator", "with_bot_id", "with_destiny")
@@ -65,3 +92,100 @@ class DefaultKeyBuilder(BaseKeyBuilder):
             parts.append(type_)
 
         return self.separator.join(parts)
+
+    def parse(self, value: str, bot_id: int = 0) -> tuple[StorageKey, StorageKeyType]:
+        head = self.prefix + self.separator
+        if not value.startswith(head):
+            raise ValueError(f"Key {value!r} does not start with {head!r}")
+
+        chat_id, user_id, *rest = value[len(head) :].split(self.separator)
+        if len(rest) < 1 + self.with_bot_id:
+            raise ValueError(f"Unexpected key {value!r}")
+        if self.with_bot_id:
+            bot_id = int(rest.pop(0))
+
+        type_ = StorageKeyType(rest.pop())
+        destiny = DESTINY_DEFAULT
+        if self.with_destiny:
+            destiny = self.separator.join(rest)
+        elif rest:
+            raise ValueError(f"Unexpected key {value!r}")
+
+        return (
+            StorageKey(
+                bot_id=bot_id,
+                chat_id=_parse_id(chat_id),
+                user_id=_parse_id(user_id),
+                destiny=destiny,
+            ),
+            type_,
+        )
+
+
+def _parse_id(value: str) -> int | None:
+    if value == "None":
+        return None
+    return int(value)
+
+
+class CachedKeyBuilder(BaseKeyBuilder):
+    """
+    Обёртка над билдером, собирающая все типизированные ключи за один вызов.
+
+    Ключи ``DATA``, ``STATE`` и ``LOCK`` строятся вместе и кешируются в LRU
+    по ``StorageKey``, поэтому повторные обращения в рамках одного апдейта
+    не собирают строку заново. ``build_bytes`` отдаёт готовые ``bytes``
+    (например, для Redis).
+    """
+
+    __slots__ = ("_build_bytes", "_build_keys", "key_builder")
+
+    def __init__(
+        self,
+        key_builder: BaseKeyBuilder | None = None,
+        *,
+        maxsize: int = 1024,
+    ) -> None:
+        if key_builder is None:
+            key_builder = DefaultKeyBuilder()
+        self.key_builder = key_builder
+
+        self._build_keys: Callable[[StorageKey], BuiltKeys[str]] = lru_cache(
+            maxsize,
+        )(self._build_keys_uncached)
+        self._build_bytes: Callable[[StorageKey], BuiltKeys[bytes]] = lru_cache(
+            maxsize,
+        )(self._build_bytes_uncached)
+
+    def build(self, key: StorageKey, type_: StorageKeyType | None = None) -> str:
+        if type_ is None:
+            return self.key_builder.build(key)
+        return self._build_keys(key)[_TYPE_INDEX[type_]]
+
+    def parse(self, value: str, bot_id: int = 0) -> tuple[StorageKey, StorageKeyType]:
+        return self.key_builder.parse(value, bot_id)
+
+    def build_keys(self, key: StorageKey) -> BuiltKeys[str]:
+        return self._build_keys(key)
+
+    def build_bytes(self, key: StorageKey, type_: StorageKeyType) -> bytes:
+        return self._build_bytes(key)[_TYPE_INDEX[type_]]
+
+    def clear(self) -> None:
+        self._build_keys.cache_clear()  # type: ignore[attr-defined]
+        self._build_bytes.cache_clear()  # type: ignore[attr-defined]
+
+    def _build_keys_uncached(self, key: StorageKey) -> BuiltKeys[str]:
+        return BuiltKeys(
+            data=self.key_builder.build(key, StorageKeyType.DATA),
+            state=self.key_builder.build(key, StorageKeyType.STATE),
+            lock=self.key_builder.build(key, StorageKeyType.LOCK),
+        )
+
+    def _build_bytes_uncached(self, key: StorageKey) -> BuiltKeys[bytes]:
+        data, state, lock = self._build_keys(key)
+        return BuiltKeys(
+            data=data.encode("utf-8"),
+            state=state.encode("utf-8"),
+            lock=lock.encode("utf-8"),
+        )
@@ -1,8 +1,13 @@
 from abc import ABC, abstractmethod
-from collections.abc import AsyncIterator, MutableMapping
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    MutableMapping,
+)
 from contextlib import asynccontextmanager
 from copy import copy
-from typing import Any, NewType, Protocol
+from typing import Any, NamedTuple, NewType, Protocol, TypeVar
 
 from maxo.fsm.key_builder import StorageKey
 from maxo.fsm.state import State
@@ -10,6 +15,16 @@ from maxo.fsm.state import State
 _RawState = NewType("_RawState", str)
 RawState = _RawState | None
 
+_T = TypeVar("_T")
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class StorageRecord(NamedTuple):
+    key: StorageKey
+    state: str | None
+    data: MutableMapping[str, Any]
+
 
 class BaseStorage(ABC):
     __slots__ = ()
@@ -54,6 +69,79 @@ class BaseStorage(ABC):
 
         return copy(current_data)
 
+    async def get_many(
+        self,
+        keys: Iterable[StorageKey] | AsyncIterable[StorageKey],
+    ) -> AsyncIterator[StorageRecord]:
+        """Отдаёт состояние и данные для каждого ключа по мере загрузки."""
+        async for batch in iter_batches(keys, DEFAULT_BATCH_SIZE):
+            for key in batch:
+                yield StorageRecord(
+                    key=key,
+                    state=await self.get_state(key),
+                    data=await self.get_data(key),
+                )
+
+    async def set_many(
+        self,
+        records: Iterable[StorageRecord] | AsyncIterable[StorageRecord],
+    ) -> None:
+        async for batch in iter_batches(records, DEFAULT_BATCH_SIZE):
+            for record in batch:
+                await self.set_state(record.key, raw_state_to_state(record.state))
+                await self.set_data(record.key, record.data)
+
+    async def delete_many(
+        self,
+        keys: Iterable[StorageKey] | AsyncIterable[StorageKey],
+    ) -> None:
+        async for batch in iter_batches(keys, DEFAULT_BATCH_SIZE):
+            for key in batch:
+                await self.set_state(key, None)
+                await self.set_data(key, {})
+
+    def scan(self, prefix: str = "") -> AsyncIterator[StorageKey]:
+        """
+        Отдаёт ключи, у которых есть состояние или данные.
+
+        ``prefix`` сравнивается с ключом, собранным билдером ключей хранилища.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support scanning keys",
+        )
+
+
+def raw_state_to_state(raw_state: str | None) -> State | None:
+    if raw_state is None:
+        return None
+    if raw_state == "*":
+        return State(raw_state)
+    group, sep, state = raw_state.partition(":")
+    if not sep:
+        raise ValueError(f"Invalid raw state {raw_state!r}")
+    return State(state, group_name=group)
+
+
+async def iter_batches(
+    items: Iterable[_T] | AsyncIterable[_T],
+    size: int,
+) -> AsyncIterator[list[_T]]:
+    batch: list[_T] = []
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            batch.append(item)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    else:
+        for item in items:
+            batch.append(item)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
 
 class BaseEventIsolation(Protocol):
     __slots__ = ()
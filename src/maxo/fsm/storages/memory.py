@@ -1,9 +1,19 @@
+import time
 from asyncio import Lock
 from collections import defaultdict
-from collections.abc import AsyncIterator, Hashable, MutableMapping
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Hashable,
+    Iterable,
+    MutableMapping,
+)
 from contextlib import asynccontextmanager
 from copy import copy
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, cast
+
+from cachetools import LRUCache
 
 from maxo.fsm.key_builder import (
     BaseKeyBuilder,
@@ -12,7 +22,13 @@ from maxo.fsm.key_builder import (
     StorageKeyType,
 )
 from maxo.fsm.state import State
-from maxo.fsm.storages.base import BaseEventIsolation, BaseStorage
+from maxo.fsm.storages.base import (
+    DEFAULT_BATCH_SIZE,
+    BaseEventIsolation,
+    BaseStorage,
+    StorageRecord,
+    iter_batches,
+)
 
 
 class MemoryStorage(BaseStorage):
@@ -52,6 +68,61 @@ class MemoryStorage(BaseStorage):
         built_key = self._key_builder.build(key, StorageKeyType.DATA)
         return copy(self._data.get(built_key, {}))
 
+    async def get_many(
+        self,
+        keys: Iterable[StorageKey] | AsyncIterable[StorageKey],
+    ) -> AsyncIterator[StorageRecord]:
+        async for batch in iter_batches(keys, DEFAULT_BATCH_SIZE):
+            for key in batch:
+                yield StorageRecord(
+                    key=key,
+                    state=self._state.get(
+                        self._key_builder.build(key, StorageKeyType.STATE),
+                    ),
+                    data=copy(
+                        self._data.get(
+                            self._key_builder.build(key, StorageKeyType.DATA),
+                            {},
+                        ),
+                    ),
+                )
+
+    async def set_many(
+        self,
+        records: Iterable[StorageRecord] | AsyncIterable[StorageRecord],
+    ) -> None:
+        async for batch in iter_batches(records, DEFAULT_BATCH_SIZE):
+            for key, state, data in batch:
+                self._state[self._key_builder.build(key, StorageKeyType.STATE)] = state
+                self._data[self._key_builder.build(key, StorageKeyType.DATA)] = copy(
+                    data,
+                )
+
+    async def delete_many(
+        self,
+        keys: Iterable[StorageKey] | AsyncIterable[StorageKey],
+    ) -> None:
+        async for batch in iter_batches(keys, DEFAULT_BATCH_SIZE):
+            for key in batch:
+                state_key = self._key_builder.build(key, StorageKeyType.STATE)
+                data_key = self._key_builder.build(key, StorageKeyType.DATA)
+                self._state.pop(state_key, None)
+                self._data.pop(data_key, None)
+
+    async def scan(self, prefix: str = "") -> AsyncIterator[StorageKey]:
+        built_keys = [
+            *(k for k, v in self._state.items() if v is not None),
+            *(k for k, v in self._data.items() if v),
+        ]
+        seen: set[StorageKey] = set()
+        for built_key in built_keys:
+            if not built_key.startswith(prefix):
+                continue
+            key, _ = self._key_builder.parse(built_key)
+            if key not in seen:
+                seen.add(key)
+                yield key
+
     async def close(self) -> None:
         self._data.clear()
         self._state.clear()
@@ -82,6 +153,108 @@ class SimpleEventIsolation(BaseEventIsolation):
         self._locks.clear()
 
 
+@dataclass(slots=True)
+class LockStats:
+    """Статистика ожидания блокировки для одного ключа."""
+
+    contended: int = 0
+    waiting: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+
+class _KeyLock:
+    __slots__ = ("lock", "users")
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.users = 0
+
+
+class FairEventIsolation(BaseEventIsolation):
+    """
+    Изоляция событий с FIFO-очередью на каждый ``StorageKey``.
+
+    В отличие от ``SimpleEventIsolation`` ключ не собирается в строку:
+    ``StorageKey`` хешируется напрямую, поэтому ``bot_id`` и ``destiny``
+    всегда учитываются. Блокировка удаляется, когда её никто не держит
+    и не ждёт, так что память не растёт с числом чатов.
+
+    Для ключей, на которых апдейты хотя бы раз ждали друг друга,
+    собирается ``LockStats`` (последние ``stats_maxsize`` ключей).
+
+    Общие блокировки на несколько ключей (striping) не используются
+    намеренно: диалоги берут блокировку стека внутри блокировки
+    ``FSMContextMiddleware``, и совпадение полос привело бы к дедлоку.
+    """
+
+    __slots__ = ("_entries", "_stats")
+
+    def __init__(self, stats_maxsize: int = 1024) -> None:
+        self._entries: dict[StorageKey, _KeyLock] = {}
+        self._stats: LRUCache[StorageKey, LockStats] = LRUCache(maxsize=stats_maxsize)
+
+    @asynccontextmanager
+    async def lock(self, key: StorageKey) -> AsyncIterator[None]:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _KeyLock()
+
+        entry.users += 1
+        try:
+            if entry.lock.locked():
+                await self._acquire_contended(key, entry.lock)
+            else:
+                await entry.lock.acquire()
+            try:
+                yield
+            finally:
+                entry.lock.release()
+        finally:
+            entry.users -= 1
+            # После ``close()`` под ключом может лежать уже другая блокировка
+            if not entry.users and self._entries.get(key) is entry:
+                del self._entries[key]
+
+    async def _acquire_contended(self, key: StorageKey, lock: Lock) -> None:
+        stats = cast(LockStats | None, self._stats.get(key))
+        if stats is None:
+            stats = self._stats[key] = LockStats()
+
+        stats.contended += 1
+        stats.waiting += 1
+        started = time.monotonic()
+        try:
+            await lock.acquire()
+        finally:
+            stats.waiting -= 1
+            waited = time.monotonic() - started
+            stats.total_wait += waited
+            stats.max_wait = max(stats.max_wait, waited)
+
+    def queue_length(self, key: StorageKey) -> int:
+        """Количество апдейтов, ожидающих блокировку ключа прямо сейчас."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return 0
+        return max(entry.users - 1, 0)
+
+    def stats(self, key: StorageKey) -> LockStats | None:
+        return cast(LockStats | None, self._stats.get(key))
+
+    def hot_keys(self, limit: int = 10) -> list[tuple[StorageKey, LockStats]]:
+        """Ключи с наибольшим суммарным временем ожидания."""
+        return sorted(
+            self._stats.items(),
+            key=lambda item: item[1].total_wait,
+            reverse=True,
+        )[:limit]
+
+    async def close(self) -> None:
+        self._entries.clear()
+        self._stats.clear()
+
+
 class DisabledEventIsolation(BaseEventIsolation):
     @asynccontextmanager
     async def lock(self, key: StorageKey) -> AsyncIterator[None]:
@@ -1,24 +1,49 @@
 try:
     from redis.asyncio import ConnectionPool, Redis
+    from redis.asyncio.client import PubSub
     from redis.asyncio.lock import Lock
+    from redis.exceptions import RedisError
     from redis.typing import ExpiryT
 except ImportError as e:
     e.add_note("* Please run `pip install maxo[redis]`")
     raise
 
+import asyncio
 import json
-from collections.abc import AsyncIterator, Callable, MutableMapping
-from contextlib import asynccontextmanager
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    MutableMapping,
+    Sequence,
+)
+from contextlib import asynccontextmanager, suppress
 from typing import Any, cast
+from uuid import uuid4
 
+from maxo import loggers
+from maxo.backoff import Backoff, BackoffConfig
 from maxo.fsm import State
 from maxo.fsm.key_builder import (
     BaseKeyBuilder,
+    CachedKeyBuilder,
     DefaultKeyBuilder,
     StorageKey,
     StorageKeyType,
 )
-from maxo.fsm.storages.base import BaseEventIsolation, BaseStorage
+from maxo.fsm.storages.base import (
+    DEFAULT_BATCH_SIZE,
+    BaseEventIsolation,
+    BaseStorage,
+    StorageRecord,
+    iter_batches,
+)
+from maxo.fsm.storages.tiered import (
+    BaseCacheInvalidator,
+    InvalidateCallback,
+    ResetCallback,
+)
 
 
 class RedisStorage(BaseStorage):
@@ -30,6 +55,7 @@ class RedisStorage(BaseStorage):
         data_ttl: ExpiryT | None = None,
         json_loads: Callable[[Any], Any] = json.loads,
         json_dumps: Callable[[Any], str] = json.dumps,
+        batch_size: int = DEFAULT_BATCH_SIZE,
     ) -> None:
         if key_builder is None:
             key_builder = DefaultKeyBuilder()
@@ -40,9 +66,10 @@ class RedisStorage(BaseStorage):
         self.data_ttl = data_ttl
         self.json_loads = json_loads
         self.json_dumps = json_dumps
+        self.batch_size = batch_size
 
     async def set_state(self, key: StorageKey, state: State | None = None) -> None:
-        built_key = self.key_builder.build(key, StorageKeyType.STATE)
+        built_key = self._build_key(key, StorageKeyType.STATE)
         if state is None:
             await self.redis.delete(built_key)
         else:
@@ -53,14 +80,14 @@ class RedisStorage(BaseStorage):
             )
 
     async def get_state(self, key: StorageKey) -> str | None:
-        built_key = self.key_builder.build(key, StorageKeyType.STATE)
+        built_key = self._build_key(key, StorageKeyType.STATE)
         value = await self.redis.get(built_key)
         if isinstance(value, bytes):
             return value.decode("utf-8")
         return cast(str | None, value)
 
     async def set_data(self, key: StorageKey, data: MutableMapping[str, Any]) -> None:
-        built_key = self.key_builder.build(key, StorageKeyType.DATA)
+        built_key = self._build_key(key, StorageKeyType.DATA)
         if not data:
             await self.redis.delete(built_key)
         else:
@@ -71,8 +98,91 @@ class RedisStorage(BaseStorage):
             )
 
     async def get_data(self, key: StorageKey) -> MutableMapping[str, Any]:
-        built_key = self.key_builder.build(key, StorageKeyType.DATA)
+        built_key = self._build_key(key, StorageKeyType.DATA)
         value = await self.redis.get(built_key)
+        return self._load_data(value)
+
+    async def get_many(
+        self,
+        keys: Iterable[StorageKey] | AsyncIterable[StorageKey],
+    ) -> AsyncIterator[StorageRecord]:
+        async for batch in iter_batches(keys, self.batch_size):
+            values = await self.redis.mget(
+                [
+                    self._build_key(key, type_)
+                    for key in batch
+                    for type_ in (StorageKeyType.STATE, StorageKeyType.DATA)
+                ],
+            )
+
+            for i, key in enumerate(batch):
+                state = values[2 * i]
+                if isinstance(state, bytes):
+                    state = state.decode("utf-8")
+                yield StorageRecord(
+                    key=key,
+                    state=state,
+                    data=self._load_data(values[2 * i + 1]),
+                )
+
+    async def set_many(
+        self,
+        records: Iterable[StorageRecord] | AsyncIterable[StorageRecord],
+    ) -> None:
+        async for batch in iter_batches(records, self.batch_size):
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, state, data in batch:
+                    state_key = self._build_key(key, StorageKeyType.STATE)
+                    if state is None:
+                        pipe.delete(state_key)  # type: ignore[unused-awaitable]
+                    else:
+                        pipe.set(  # type: ignore[unused-awaitable]
+                            state_key,
+                            state,
+                            ex=self.state_ttl,
+                        )
+
+                    data_key = self._build_key(key, StorageKeyType.DATA)
+                    if not data:
+                        pipe.delete(data_key)  # type: ignore[unused-awaitable]
+                    else:
+                        pipe.set(  # type: ignore[unused-awaitable]
+                            data_key,
+                            self.json_dumps(data),
+                            ex=self.data_ttl,
+                        )
+                await pipe.execute()
+
+    async def delete_many(
+        self,
+        keys: Iterable[StorageKey] | AsyncIterable[StorageKey],
+    ) -> None:
+        async for batch in iter_batches(keys, self.batch_size):
+            built_keys = [
+                self._build_key(key, type_)
+                for key in batch
+                for type_ in (StorageKeyType.STATE, StorageKeyType.DATA)
+            ]
+            await self.redis.delete(*built_keys)
+
+    async def scan(self, prefix: str = "") -> AsyncIterator[StorageKey]:
+        seen: set[StorageKey] = set()
+        async for built_key in self.redis.scan_iter(
+            match=_escape_glob(prefix) + "*",
+            count=self.batch_size,
+        ):
+            if isinstance(built_key, bytes):
+                built_key = built_key.decode("utf-8")
+            try:
+                key, type_ = self.key_builder.parse(built_key)
+            except ValueError:
+                continue  # not an FSM key
+            if type_ is StorageKeyType.LOCK or key in seen:
+                continue
+            seen.add(key)
+            yield key
+
+    def _load_data(self, value: Any) -> MutableMapping[str, Any]:
         if value is None:
             return {}
 
@@ -84,6 +194,9 @@ class RedisStorage(BaseStorage):
     async def close(self) -> None:
         await self.redis.aclose()
 
+    def _build_key(self, key: StorageKey, type_: StorageKeyType) -> str | bytes:
+        return _build_redis_key(self.key_builder, key, type_)
+
     @classmethod
     def from_url(
         cls,
@@ -104,6 +217,25 @@ class RedisStorage(BaseStorage):
             **kwargs,
         )
 
+    def create_cache_invalidator(self, **kwargs: Any) -> "RedisCacheInvalidator":
+        return RedisCacheInvalidator(redis=self.redis, **kwargs)
+
+
+def _escape_glob(value: str) -> str:
+    for char in "\\*?[]":
+        value = value.replace(char, "\\" + char)
+    return value
+
+
+def _build_redis_key(
+    key_builder: BaseKeyBuilder,
+    key: StorageKey,
+    type_: StorageKeyType,
+) -> str | bytes:
+    if isinstance(key_builder, CachedKeyBuilder):
+        return key_builder.build_bytes(key, type_)
+    return key_builder.build(key, type_)
+
 
 DEFAULT_REDIS_LOCK_KWARGS = {"timeout": 60}
 
@@ -128,9 +260,129 @@ class RedisEventIsolation(BaseEventIsolation):
 
     @asynccontextmanager
     async def lock(self, key: StorageKey) -> AsyncIterator[None]:
-        redis_key = self.key_builder.build(key, StorageKeyType.LOCK)
+        redis_key = _build_redis_key(self.key_builder, key, StorageKeyType.LOCK)
         async with self.redis.lock(name=redis_key, **self.lock_kwargs, lock_class=Lock):
             yield
 
     async def close(self) -> None:
         await self.redis.aclose()
+
+
+DEFAULT_INVALIDATION_CHANNEL = "maxo:fsm:invalidate"
+DEFAULT_INVALIDATION_BACKOFF = BackoffConfig(
+    min_delay=0.5,
+    max_delay=30.0,
+    factor=2.0,
+    jitter=0.1,
+)
+
+
+class RedisCacheInvalidator(BaseCacheInvalidator):
+    """
+    Инвалидация кеша ``TieredStorage`` через Redis pub/sub.
+
+    Каждая реплика публикует изменённые ключи в ``channel`` и выбрасывает
+    из своего кеша ключи, изменённые другими репликами. При обрыве
+    соединения подписка восстанавливается с ``backoff``, а локальный кеш
+    сбрасывается целиком: pub/sub не хранит сообщения, пропущенные за время
+    переподключения.
+    """
+
+    __slots__ = ("_listener", "_origin", "_pubsub", "backoff", "channel", "redis")
+
+    def __init__(
+        self,
+        redis: Redis,
+        channel: str = DEFAULT_INVALIDATION_CHANNEL,
+        backoff: BackoffConfig = DEFAULT_INVALIDATION_BACKOFF,
+    ) -> None:
+        self.redis = redis
+        self.channel = channel
+        self.backoff = backoff
+        self._origin = uuid4().hex
+        self._pubsub: PubSub | None = None
+        self._listener: asyncio.Task[None] | None = None
+
+    async def start(self, callback: InvalidateCallback, reset: ResetCallback) -> None:
+        await self._subscribe()
+        self._listener = asyncio.create_task(self._listen(callback, reset))
+
+    async def publish(self, keys: Sequence[StorageKey]) -> None:
+        if not keys:
+            return
+        payload = [
+            self._origin,
+            [[key.bot_id, key.chat_id, key.user_id, key.destiny] for key in keys],
+        ]
+        await self.redis.publish(self.channel, json.dumps(payload))
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        await self._unsubscribe()
+
+    async def _subscribe(self) -> PubSub:
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(self.channel)
+        except BaseException:
+            await pubsub.aclose()  # type: ignore[no-untyped-call]
+            raise
+        self._pubsub = pubsub
+        return pubsub
+
+    async def _unsubscribe(self) -> None:
+        if self._pubsub is not None:
+            pubsub, self._pubsub = self._pubsub, None
+            with suppress(RedisError, OSError):
+                await pubsub.aclose()  # type: ignore[no-untyped-call]
+
+    async def _listen(self, callback: InvalidateCallback, reset: ResetCallback) -> None:
+        backoff = Backoff(self.backoff)
+        while True:
+            try:
+                pubsub = self._pubsub
+                if pubsub is None:
+                    pubsub = await self._subscribe()
+                    # Инвалидации за время обрыва потеряны
+                    reset()
+                    loggers.fsm.info("Cache invalidation channel reconnected")
+                backoff.reset()
+                async for message in pubsub.listen():
+                    self._dispatch(message, callback)
+                # Подписка закрыта без ошибки: переподключаемся
+                await self._unsubscribe()
+            except (RedisError, OSError) as e:
+                await self._unsubscribe()
+                reset()
+                backoff.next()
+                loggers.fsm.warning(
+                    "Cache invalidation channel failed with %s: %s, "
+                    "reconnecting in %f seconds",
+                    type(e).__name__,
+                    e,
+                    backoff.current_delay,
+                )
+                await backoff.sleep()
+
+    def _dispatch(self, message: Any, callback: InvalidateCallback) -> None:
+        try:
+            origin, raw_keys = json.loads(message["data"])
+            keys = [
+                StorageKey(
+                    bot_id=bot_id,
+                    chat_id=chat_id,
+                    user_id=user_id,
+                    destiny=destiny,
+                )
+                for bot_id, chat_id, user_id, destiny in raw_keys
+            ]
+        except (TypeError, ValueError):
+            loggers.fsm.warning("Malformed cache invalidation message: %r", message)
+            return
+        if origin != self._origin:
+            for key in keys:
+                callback(key)
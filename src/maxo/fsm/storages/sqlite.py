@@ -0,0 +1,331 @@
+import asyncio
+import json
+import sqlite3
+import time
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    MutableMapping,
+)
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+from maxo import loggers
+from maxo.fsm.key_builder import (
+    BaseKeyBuilder,
+    DefaultKeyBuilder,
+    StorageKey,
+    StorageKeyType,
+)
+from maxo.fsm.state import State
+from maxo.fsm.storages.base import (
+    DEFAULT_BATCH_SIZE,
+    BaseStorage,
+    StorageRecord,
+    iter_batches,
+)
+
+_T = TypeVar("_T")
+
+TTL = float | timedelta
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS fsm ("
+    " key TEXT PRIMARY KEY,"
+    " value TEXT NOT NULL,"
+    " expires_at REAL"
+    ") WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS fsm_expires_at ON fsm (expires_at)"
+    " WHERE expires_at IS NOT NULL",
+)
+_ALIVE = "(expires_at IS NULL OR expires_at > ?)"
+# SQLite до 3.32 принимает не больше 999 параметров в запросе: на каждый
+# ключ приходится два параметра (состояние и данные) плюс текущее время
+_MAX_KEYS_PER_QUERY = 499
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    Хранилище FSM в локальном файле SQLite.
+
+    Все обращения к базе выполняются в одном выделенном потоке, база открыта
+    в режиме WAL. Запись попадает в открытую транзакцию и фиксируется пачкой:
+    не реже раза в ``commit_interval`` секунд или сразу после ``commit_batch``
+    изменений. При аварийном завершении процесса теряются только изменения
+    последнего интервала; ``commit_interval=0`` фиксирует каждую запись.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        key_builder: BaseKeyBuilder | None = None,
+        state_ttl: TTL | None = None,
+        data_ttl: TTL | None = None,
+        json_loads: Callable[[Any], Any] = json.loads,
+        json_dumps: Callable[[Any], str] = json.dumps,
+        commit_interval: float = 0.05,
+        commit_batch: int = 256,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        if key_builder is None:
+            key_builder = DefaultKeyBuilder()
+
+        self.path = path
+        self.key_builder = key_builder
+        self.state_ttl = _ttl_seconds(state_ttl)
+        self.data_ttl = _ttl_seconds(data_ttl)
+        self.json_loads = json_loads
+        self.json_dumps = json_dumps
+        self.commit_interval = commit_interval
+        self.commit_batch = commit_batch
+        self.batch_size = batch_size
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="maxo-sqlite",
+        )
+        self._connection: sqlite3.Connection | None = None
+        self._pending = 0
+        self._commit_handle: asyncio.TimerHandle | None = None
+
+    async def set_state(self, key: StorageKey, state: State | None = None) -> None:
+        built_key = self.key_builder.build(key, StorageKeyType.STATE)
+        raw_state = None if state is None else state.state
+        await self._write(self._put, [(built_key, raw_state, self.state_ttl)])
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        built_key = self.key_builder.build(key, StorageKeyType.STATE)
+        return await self._run(self._get, built_key)
+
+    async def set_data(self, key: StorageKey, data: MutableMapping[str, Any]) -> None:
+        built_key = self.key_builder.build(key, StorageKeyType.DATA)
+        value = self.json_dumps(data) if data else None
+        await self._write(self._put, [(built_key, value, self.data_ttl)])
+
+    async def get_data(self, key: StorageKey) -> MutableMapping[str, Any]:
+        built_key = self.key_builder.build(key, StorageKeyType.DATA)
+        return self._load_data(await self._run(self._get, built_key))
+
+    async def get_many(
+        self,
+        keys: Iterable[StorageKey] | AsyncIterable[StorageKey],
+    ) -> AsyncIterator[StorageRecord]:
+        batch_size = min(self.batch_size, _MAX_KEYS_PER_QUERY)
+        async for batch in iter_batches(keys, batch_size):
+            built_keys = [
+                self.key_builder.build(key, type_)
+                for key in batch
+                for type_ in (StorageKeyType.STATE, StorageKeyType.DATA)
+            ]
+            values = await self._run(self._get_many, built_keys)
+            for key, state_key, data_key in zip(
+                batch,
+                built_keys[::2],
+                built_keys[1::2],
+                strict=True,
+            ):
+                yield StorageRecord(
+                    key=key,
+                    state=values.get(state_key),
+                    data=self._load_data(values.get(data_key)),
+                )
+
+    async def set_many(
+        self,
+        records: Iterable[StorageRecord] | AsyncIterable[StorageRecord],
+    ) -> None:
+        async for batch in iter_batches(records, self.batch_size):
+            rows: list[tuple[str, str | None, float | None]] = []
+            for key, state, data in batch:
+                rows.append(
+                    (
+                        self.key_builder.build(key, StorageKeyType.STATE),
+                        state,
+                        self.state_ttl,
+                    ),
+                )
+                rows.append(
+                    (
+                        self.key_builder.build(key, StorageKeyType.DATA),
+                        self.json_dumps(data) if data else None,
+                        self.data_ttl,
+                    ),
+                )
+            await self._write(self._put, rows)
+
+    async def delete_many(
+        self,
+        keys: Iterable[StorageKey] | AsyncIterable[StorageKey],
+    ) -> None:
+        async for batch in iter_batches(keys, self.batch_size):
+            rows = [
+                (self.key_builder.build(key, type_), None, None)
+                for key in batch
+                for type_ in (StorageKeyType.STATE, StorageKeyType.DATA)
+            ]
+            await self._write(self._put, rows)
+
+    async def scan(self, prefix: str = "") -> AsyncIterator[StorageKey]:
+        seen: set[StorageKey] = set()
+        after = None
+        while True:
+            built_keys = await self._run(self._scan_page, prefix, after)
+            if not built_keys:
+                return
+            after = built_keys[-1]
+            for built_key in built_keys:
+                key, _ = self.key_builder.parse(built_key)
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    async def purge_expired(self) -> int:
+        """Удаляет записи с истёкшим TTL и возвращает их количество."""
+        return await self._write(self._purge)
+
+    async def close(self) -> None:
+        if self._commit_handle is not None:
+            self._commit_handle.cancel()
+            self._commit_handle = None
+        await self._run(self._close)
+        self._executor.shutdown(wait=True)
+
+    def _load_data(self, value: str | None) -> MutableMapping[str, Any]:
+        if value is None:
+            return {}
+        return cast("MutableMapping[str, Any]", self.json_loads(value))
+
+    async def _run(self, func: Callable[..., _T], *args: Any) -> _T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _write(self, func: Callable[..., _T], *args: Any) -> _T:
+        result = await self._run(func, *args)
+        self._pending += 1
+        if self._pending >= self.commit_batch or self.commit_interval <= 0:
+            await self._flush()
+        elif self._commit_handle is None:
+            loop = asyncio.get_running_loop()
+            self._commit_handle = loop.call_later(
+                self.commit_interval,
+                self._schedule_flush,
+            )
+        return result
+
+    def _schedule_flush(self) -> None:
+        self._commit_handle = None
+        self._pending = 0
+        future = self._executor.submit(self._commit)
+        future.add_done_callback(_log_commit_error)
+
+    async def _flush(self) -> None:
+        if self._commit_handle is not None:
+            self._commit_handle.cancel()
+            self._commit_handle = None
+        self._pending = 0
+        await self._run(self._commit)
+
+    # Методы ниже выполняются только в потоке ``self._executor``
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, isolation_level="DEFERRED")
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _get(self, built_key: str) -> str | None:
+        row = (
+            self._connect()
+            .execute(
+                f"SELECT value FROM fsm WHERE key = ? AND {_ALIVE}",  # noqa: S608
+                (built_key, time.time()),
+            )
+            .fetchone()
+        )
+        return None if row is None else cast(str, row[0])
+
+    def _get_many(self, built_keys: list[str]) -> dict[str, str]:
+        placeholders = ", ".join("?" * len(built_keys))
+        rows = (
+            self._connect()
+            .execute(
+                f"SELECT key, value FROM fsm"  # noqa: S608
+                f" WHERE key IN ({placeholders}) AND {_ALIVE}",
+                (*built_keys, time.time()),
+            )
+            .fetchall()
+        )
+        return dict(rows)
+
+    def _put(self, rows: list[tuple[str, str | None, float | None]]) -> None:
+        now = time.time()
+        connection = self._connect()
+        connection.executemany(
+            "DELETE FROM fsm WHERE key = ?",
+            [(built_key,) for built_key, value, _ in rows if value is None],
+        )
+        connection.executemany(
+            "INSERT OR REPLACE INTO fsm (key, value, expires_at) VALUES (?, ?, ?)",
+            [
+                (built_key, value, None if ttl is None else now + ttl)
+                for built_key, value, ttl in rows
+                if value is not None
+            ],
+        )
+
+    def _scan_page(self, prefix: str, after: str | None) -> list[str]:
+        query = f"SELECT key FROM fsm WHERE {_ALIVE} AND key >= ?"  # noqa: S608
+        params: list[Any] = [time.time(), prefix]
+        if after is not None:
+            query += " AND key > ?"
+            params.append(after)
+        if prefix:
+            query += " AND key < ?"
+            params.append(prefix + "\U0010ffff")
+        query += " ORDER BY key LIMIT ?"
+        params.append(self.batch_size)
+        rows = self._connect().execute(query, params).fetchall()
+        return [row[0] for row in rows]
+
+    def _purge(self) -> int:
+        cursor = self._connect().execute(
+            "DELETE FROM fsm WHERE expires_at <= ?",
+            (time.time(),),
+        )
+        return cursor.rowcount
+
+    def _commit(self) -> None:
+        if self._connection is not None:
+            self._connection.commit()
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
+
+
+def _log_commit_error(future: "Future[None]") -> None:
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        loggers.fsm.error(
+            "SQLite storage commit failed",
+            exc_info=(type(error), error, error.__traceback__),
+        )
+
+
+def _ttl_seconds(ttl: TTL | None) -> float | None:
+    if isinstance(ttl, timedelta):
+        return ttl.total_seconds()
+    return ttl
@@ -0,0 +1,273 @@
+from abc import abstractmethod
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    MutableMapping,
+    Sequence,
+)
+from copy import copy
+from typing import Any, Protocol, TypeVar, cast
+
+from cachetools import Cache, LRUCache, TTLCache
+
+from maxo.fsm.key_builder import StorageKey
+from maxo.fsm.state import State
+from maxo.fsm.storages.base import DEFAULT_BATCH_SIZE, BaseStorage, StorageRecord
+
+_MISSING: Any = object()
+
+_T = TypeVar("_T")
+
+InvalidateCallback = Callable[[StorageKey], None]
+ResetCallback = Callable[[], None]
+
+
+class BaseCacheInvalidator(Protocol):
+    """Канал, по которому реплики сообщают друг другу об изменённых ключах."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    async def start(self, callback: InvalidateCallback, reset: ResetCallback) -> None:
+        """
+        Подписывается на изменения других реплик.
+
+        ``callback`` вызывается для каждого изменённого ключа, ``reset`` —
+        когда часть сообщений могла потеряться (например, после
+        переподключения) и весь локальный кеш нужно сбросить.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def publish(self, keys: Sequence[StorageKey]) -> None:
+        """Сообщает остальным репликам об изменённых ключах одним сообщением."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def close(self) -> None:
+        raise NotImplementedError
+
+
+class TieredStorage(BaseStorage):
+    """
+    Хранилище с локальным LRU-кешем перед любым другим хранилищем.
+
+    Запись всегда уходит в ``storage``, чтение по возможности отдаётся из кеша.
+    Согласованность между репликами обеспечивается одним из способов:
+
+    * ``sticky=True`` — процесс единолично владеет своими чатами
+      (например, апдейты шардированы по ``chat_id``), кеш считается
+      источником истины и никогда не устаревает;
+    * ``invalidator`` — реплики рассылают изменённые ключи, и остальные
+      выбрасывают их из кеша (см. ``RedisCacheInvalidator``);
+    * ``ttl`` — ограничивает время, в течение которого чтение может
+      вернуть устаревшие данные, записанные другой репликой.
+    """
+
+    __slots__ = (
+        "_data",
+        "_generations",
+        "_invalidator",
+        "_readers",
+        "_started",
+        "_states",
+        "sticky",
+        "storage",
+    )
+
+    def __init__(
+        self,
+        storage: BaseStorage,
+        maxsize: int = 10_000,
+        ttl: float | None = None,
+        sticky: bool = False,
+        invalidator: BaseCacheInvalidator | None = None,
+    ) -> None:
+        self.storage = storage
+        self.sticky = sticky
+        self._invalidator = invalidator
+        self._started = False
+        self._states: Cache[StorageKey, str | None] = _make_cache(maxsize, ttl)
+        self._data: Cache[StorageKey, MutableMapping[str, Any]] = _make_cache(
+            maxsize,
+            ttl,
+        )
+        # Поколения ключей, которые сейчас читаются из ``storage``:
+        # инвалидация во время чтения увеличивает поколение, и устаревший
+        # результат не попадает в кеш
+        self._readers: dict[StorageKey, int] = {}
+        self._generations: dict[StorageKey, int] = {}
+
+    async def set_state(self, key: StorageKey, state: State | None = None) -> None:
+        await self._start()
+        generation = self._track(key)
+        try:
+            await self.storage.set_state(key, state)
+        finally:
+            fresh = self._untrack(key, generation)
+        self._bump(key)
+        if fresh:
+            self._states[key] = None if state is None else state.state
+        else:
+            self._states.pop(key, None)
+        await self._publish(key)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        await self._start()
+        state = self._states.get(key, _MISSING)
+        if state is _MISSING:
+            generation = self._track(key)
+            try:
+                state = await self.storage.get_state(key)
+            finally:
+                fresh = self._untrack(key, generation)
+            if fresh:
+                self._states[key] = state
+        return cast(str | None, state)
+
+    async def set_data(self, key: StorageKey, data: MutableMapping[str, Any]) -> None:
+        await self._start()
+        generation = self._track(key)
+        try:
+            await self.storage.set_data(key, data)
+        finally:
+            fresh = self._untrack(key, generation)
+        self._bump(key)
+        if fresh:
+            self._data[key] = copy(data)
+        else:
+            self._data.pop(key, None)
+        await self._publish(key)
+
+    async def get_data(self, key: StorageKey) -> MutableMapping[str, Any]:
+        await self._start()
+        data = self._data.get(key, _MISSING)
+        if data is _MISSING:
+            generation = self._track(key)
+            try:
+                data = await self.storage.get_data(key)
+            finally:
+                fresh = self._untrack(key, generation)
+            if fresh:
+                self._data[key] = copy(data)
+        return copy(cast("MutableMapping[str, Any]", data))
+
+    async def get_many(
+        self,
+        keys: Iterable[StorageKey] | AsyncIterable[StorageKey],
+    ) -> AsyncIterator[StorageRecord]:
+        # Пачки читаются мимо кеша: записи приходят из буфера ``storage``,
+        # и инвалидацию, пришедшую во время чтения, уже не отследить
+        await self._start()
+        async for record in self.storage.get_many(keys):
+            yield record
+
+    async def set_many(
+        self,
+        records: Iterable[StorageRecord] | AsyncIterable[StorageRecord],
+    ) -> None:
+        await self._start()
+        keys: list[StorageKey] = []
+        await self.storage.set_many(_collect_keys(records, keys, _record_key))
+        await self._forget(keys)
+
+    async def delete_many(
+        self,
+        keys: Iterable[StorageKey] | AsyncIterable[StorageKey],
+    ) -> None:
+        await self._start()
+        deleted: list[StorageKey] = []
+        await self.storage.delete_many(_collect_keys(keys, deleted, _same_key))
+        await self._forget(deleted)
+
+    def scan(self, prefix: str = "") -> AsyncIterator[StorageKey]:
+        return self.storage.scan(prefix)
+
+    def invalidate(self, key: StorageKey) -> None:
+        """Выбрасывает ключ из локального кеша."""
+        self._states.pop(key, None)
+        self._data.pop(key, None)
+        self._bump(key)
+
+    def clear_cache(self) -> None:
+        self._states.clear()
+        self._data.clear()
+        for key in self._readers:
+            self._bump(key)
+
+    async def close(self) -> None:
+        self.clear_cache()
+        if self._invalidator is not None:
+            await self._invalidator.close()
+        await self.storage.close()
+
+    async def _start(self) -> None:
+        if self._started:
+            return
+        self._started = True
+        if self._invalidator is not None:
+            await self._invalidator.start(self.invalidate, self.clear_cache)
+
+    def _track(self, key: StorageKey) -> int:
+        self._readers[key] = self._readers.get(key, 0) + 1
+        return self._generations.get(key, 0)
+
+    def _untrack(self, key: StorageKey, generation: int) -> bool:
+        """Снимает отметку о чтении, ``False`` — ключ изменился за это время."""
+        fresh = self._generations.get(key, 0) == generation
+        readers = self._readers[key] - 1
+        if readers:
+            self._readers[key] = readers
+        else:
+            del self._readers[key]
+            self._generations.pop(key, None)
+        return fresh
+
+    def _bump(self, key: StorageKey) -> None:
+        if key in self._readers:
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    async def _publish(self, key: StorageKey) -> None:
+        if self._invalidator is not None and not self.sticky:
+            await self._invalidator.publish([key])
+
+    async def _forget(self, keys: list[StorageKey]) -> None:
+        for key in keys:
+            self.invalidate(key)
+        if self._invalidator is None or self.sticky:
+            return
+        # Ключи пачки уходят несколькими крупными сообщениями,
+        # а не отдельным запросом на каждый ключ
+        for start in range(0, len(keys), DEFAULT_BATCH_SIZE):
+            await self._invalidator.publish(keys[start : start + DEFAULT_BATCH_SIZE])
+
+
+async def _collect_keys(
+    items: Iterable[_T] | AsyncIterable[_T],
+    keys: list[StorageKey],
+    get_key: Callable[[_T], StorageKey],
+) -> AsyncIterator[_T]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            keys.append(get_key(item))
+            yield item
+    else:
+        for item in items:
+            keys.append(get_key(item))
+            yield item
+
+
+def _record_key(record: StorageRecord) -> StorageKey:
+    return record.key
+
+
+def _same_key(key: StorageKey) -> StorageKey:
+    return key
+
+
+def _make_cache(maxsize: int, ttl: float | None) -> Cache:
+    if ttl is None:
+        return LRUCache(maxsize=maxsize)
+    return TTLCache(maxsize=maxsize, ttl=ttl)
@@ -2,6 +2,10 @@ from logging import getLogger
 
 dispatcher = getLogger("maxo.dispatcher")
 long_polling = getLogger("maxo.long_polling")
+webhook = getLogger("maxo.webhook")
+queue_consumer = getLogger("maxo.queue_consumer")
+runner = getLogger("maxo.runner")
+fsm = getLogger("maxo.fsm")
 update_context = getLogger("maxo.routing.update_context")
 utils = getLogger("maxo.utils")
 bot = getLogger("maxo.bot")
@@ -3,13 +3,16 @@ from collections.abc import MutableMapping
 from typing import Any
 
 from maxo import Bot, loggers
-from maxo.fsm.key_builder import BaseKeyBuilder, DefaultKeyBuilder
+from maxo.fsm.key_builder import BaseKeyBuilder, CachedKeyBuilder
 from maxo.fsm.storages.base import BaseEventIsolation, BaseStorage
 from maxo.fsm.storages.memory import MemoryStorage, SimpleEventIsolation
 from maxo.routing.ctx import Ctx
 from maxo.routing.middlewares.error import ErrorMiddleware
 from maxo.routing.middlewares.fsm_context import FSMContextMiddleware
-from maxo.routing.middlewares.update_context import UpdateContextMiddleware
+from maxo.routing.middlewares.update_context import (
+    UpdateContextCache,
+    UpdateContextMiddleware,
+)
 from maxo.routing.observers import UpdateObserver
 from maxo.routing.routers.simple import Router
 from maxo.routing.sentinels import UNHANDLED, SkipHandler
@@ -33,6 +36,9 @@ class Dispatcher(Router):
         events_isolation: BaseEventIsolation | None = None,
         key_builder: BaseKeyBuilder | None = None,
         disable_fsm: bool = False,
+        # Кеш обогащения контекста, ``UpdateContextCache.update_types``
+        # должны входить в получаемые апдейты
+        update_context_cache: UpdateContextCache | None = None,
     ) -> None:
         super().__init__(self.__class__.__name__)
 
@@ -43,14 +49,16 @@ class Dispatcher(Router):
 
         self.update = self._observers[MaxoUpdate] = UpdateObserver[MaxoUpdate[Any]]()
         self.update.middleware.outer(ErrorMiddleware(self))
-        self.update.middleware.outer(UpdateContextMiddleware())
+        self.update.middleware.outer(
+            UpdateContextMiddleware(cache=update_context_cache),
+        )
 
         self.update.handler(self._feed_update_handler)
 
         # State system settings
         if not disable_fsm:
             if key_builder is None:
-                key_builder = DefaultKeyBuilder()
+                key_builder = CachedKeyBuilder()
 
             if storage is None:
                 storage = MemoryStorage(key_builder=key_builder)
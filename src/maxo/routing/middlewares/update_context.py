@@ -1,8 +1,11 @@
-from typing import Any, Final
+from copy import deepcopy
+from typing import Any, Final, TypeVar
+
+from cachetools import TTLCache
 
 from maxo import loggers
-from maxo.enums import ChatType
-from maxo.omit import is_defined
+from maxo.enums import ChatType, UpdateType
+from maxo.omit import Omitted, is_defined
 from maxo.routing.ctx import Ctx
 from maxo.routing.interfaces.middleware import BaseMiddleware, NextMiddleware
 from maxo.routing.signals.update import MaxoUpdate
@@ -21,13 +24,77 @@ from maxo.routing.updates.message_edited import MessageEdited
 from maxo.routing.updates.message_removed import MessageRemoved
 from maxo.routing.updates.user_added_to_chat import UserAddedToChat
 from maxo.routing.updates.user_removed_from_chat import UserRemovedFromChat
-from maxo.types import User
+from maxo.types import Chat, ChatMember, ChatMembersList, User
 from maxo.types.update_context import UpdateContext
 
 UPDATE_CONTEXT_KEY: Final = "update_context"
 EVENT_FROM_USER_KEY: Final = "event_from_user"
 EVENT_CHAT_KEY: Final = "event_chat"
 
+DEFAULT_CACHE_TTL: Final = 60.0
+DEFAULT_CACHE_SIZE: Final = 10_000
+
+_T = TypeVar("_T")
+
+
+class UpdateContextCache:
+    """
+    Кеш чатов и участников чатов для обогащения контекста.
+
+    Записи живут ``ttl`` секунд и сбрасываются раньше апдейтами,
+    которые их меняют: сменой названия чата, добавлением и удалением
+    участников, удалением бота из чата. Такие апдейты приходят, только
+    если на них подписан поллинг или вебхук (``update_types``), иначе
+    записи могут устареть на весь ``ttl``. Обработчики получают копии
+    записей и могут менять их, не затрагивая кеш.
+    """
+
+    update_types: Final = (
+        UpdateType.CHAT_TITLE_CHANGED,
+        UpdateType.USER_ADDED,
+        UpdateType.USER_REMOVED,
+        UpdateType.BOT_ADDED,
+        UpdateType.BOT_REMOVED,
+    )
+
+    __slots__ = ("chats", "members")
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_CACHE_TTL,
+        maxsize: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.chats: TTLCache[int, Chat] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.members: TTLCache[tuple[int, int], ChatMember] = TTLCache(
+            maxsize=maxsize,
+            ttl=ttl,
+        )
+
+    def get_chat(self, chat_id: int) -> Chat | None:
+        return _copy(self.chats.get(chat_id))
+
+    def set_chat(self, chat: Chat) -> None:
+        self.chats[chat.chat_id] = _copy(chat)
+
+    def get_member(self, chat_id: int, user_id: int) -> ChatMember | None:
+        return _copy(self.members.get((chat_id, user_id)))
+
+    def set_member(self, chat_id: int, member: ChatMember) -> None:
+        self.members[(chat_id, member.user_id)] = _copy(member)
+
+    def invalidate(self, update: Any) -> None:
+        """Сбрасывает записи, которые устарели после ``update``."""
+        if isinstance(update, ChatTitleChanged):
+            self.chats.pop(update.chat_id, None)
+        elif isinstance(update, (UserAddedToChat, UserRemovedFromChat)):
+            # Меняется и число участников чата
+            self.chats.pop(update.chat_id, None)
+            self.members.pop((update.chat_id, update.user.user_id), None)
+        elif isinstance(update, (BotAddedToChat, BotRemovedFromChat)):
+            self.chats.pop(update.chat_id, None)
+            for key in [key for key in self.members if key[0] == update.chat_id]:
+                self.members.pop(key, None)
+
 
 class UpdateContextMiddleware(BaseMiddleware[MaxoUpdate[Any]]):
     """
@@ -39,11 +106,17 @@ class UpdateContextMiddleware(BaseMiddleware[MaxoUpdate[Any]]):
         enrich: при True запрашивать чат и при необходимости пользователя через Bot API.
         Можно также передать enrich_update_context=True в workflow_data
         (например при LongPolling.run).
+        cache: кеш запрошенных чатов и участников, ``None`` отключает кеширование.
 
     """
 
-    def __init__(self, enrich: bool = False) -> None:
+    def __init__(
+        self,
+        enrich: bool = False,
+        cache: UpdateContextCache | None = None,
+    ) -> None:
         self._enrich = enrich
+        self._cache = cache
 
     async def __call__(
         self,
@@ -51,6 +124,9 @@ class UpdateContextMiddleware(BaseMiddleware[MaxoUpdate[Any]]):
         ctx: Ctx,
         next: NextMiddleware[MaxoUpdate[Any]],
     ) -> Any:
+        if self._cache is not None:
+            self._cache.invalidate(update.update)
+
         do_enrich = self._enrich or ctx.get("enrich_update_context", False)
         update_context = await self._resolve_update_context(
             update.update,
@@ -72,11 +148,7 @@ class UpdateContextMiddleware(BaseMiddleware[MaxoUpdate[Any]]):
 
         if update_context.chat_id is not None and update_context.chat is None:
             try:
-                loggers.update_context.debug(
-                    "Обогащение контекста чатом: chat_id=%s",
-                    update_context.chat_id,
-                )
-                chat = await bot.get_chat(chat_id=update_context.chat_id)
+                chat = await self._get_chat(bot, update_context.chat_id)
                 update_context.chat = chat
                 update_context.type = chat.type
             except Exception:  # noqa: BLE001
@@ -97,9 +169,9 @@ class UpdateContextMiddleware(BaseMiddleware[MaxoUpdate[Any]]):
             chat_id = update_context.chat_id
             user_id = update_context.user_id
             try:
-                members = await bot.get_members(chat_id=chat_id, user_ids=[user_id])
-                if members.members:
-                    update_context.user = members.members[0]
+                member = await self._get_member(bot, chat_id, user_id)
+                if member is not None:
+                    update_context.user = member
                 else:
                     raise ValueError(  # noqa: TRY301
                         f"Юзер user_id={user_id} не найден в чате chat_id={chat_id}",
@@ -110,6 +182,43 @@ class UpdateContextMiddleware(BaseMiddleware[MaxoUpdate[Any]]):
                     exc_info=True,
                 )
 
+    async def _get_chat(self, bot: Any, chat_id: int) -> Chat:
+        if self._cache is not None:
+            cached_chat = self._cache.get_chat(chat_id)
+            if cached_chat is not None:
+                return cached_chat
+
+        loggers.update_context.debug(
+            "Обогащение контекста чатом: chat_id=%s",
+            chat_id,
+        )
+        chat: Chat = await bot.get_chat(chat_id=chat_id)
+        if self._cache is not None:
+            self._cache.set_chat(chat)
+        return chat
+
+    async def _get_member(
+        self,
+        bot: Any,
+        chat_id: int,
+        user_id: int,
+    ) -> ChatMember | None:
+        if self._cache is not None:
+            cached_member = self._cache.get_member(chat_id, user_id)
+            if cached_member is not None:
+                return cached_member
+
+        members: ChatMembersList = await bot.get_members(
+            chat_id=chat_id,
+            user_ids=[user_id],
+        )
+        if not members.members:
+            return None
+        member = members.members[0]
+        if self._cache is not None:
+            self._cache.set_member(chat_id, member)
+        return member
+
     async def _resolve_update_context(
         self,
         update: Any,
@@ -177,3 +286,9 @@ class UpdateContextMiddleware(BaseMiddleware[MaxoUpdate[Any]]):
             await self._enrich_context(ctx, update_context)
 
         return update_context
+
+
+def _copy(value: _T) -> _T:
+    # Omitted сравнивается по ``is``, поэтому в копии остаётся тот же объект
+    omitted = Omitted()
+    return deepcopy(value, {id(omitted): omitted})
@@ -0,0 +1,12 @@
+from maxo.transport.queue.base import BaseUpdateQueue, QueueMessage
+from maxo.transport.queue.consumer import QueueConsumer
+from maxo.transport.queue.file import FileUpdateQueue
+from maxo.transport.queue.memory import MemoryUpdateQueue
+
+__all__ = (
+    "BaseUpdateQueue",
+    "FileUpdateQueue",
+    "MemoryUpdateQueue",
+    "QueueConsumer",
+    "QueueMessage",
+)
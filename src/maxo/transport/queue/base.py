@@ -0,0 +1,51 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class QueueMessage:
+    id: str
+    """Идентификатор сообщения в очереди, передаётся в ``ack``."""
+    data: bytes
+    """Тело апдейта в том виде, в каком его прислал Max.ru."""
+
+
+class BaseUpdateQueue(ABC):
+    """
+    Очередь сырых апдейтов между приёмом вебхука и их обработкой.
+
+    ``WebhookEngine`` только кладёт тело запроса в очередь, а
+    :class:`~maxo.transport.queue.QueueConsumer` читает и обрабатывает его,
+    в том же процессе или в отдельных. Сообщение считается обработанным
+    после ``ack``: доставка — «хотя бы один раз».
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    async def put(self, data: bytes) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def read(
+        self,
+        consumer: str,
+        count: int,
+        timeout: float,
+    ) -> Sequence[QueueMessage]:
+        """
+        Отдаёт до ``count`` сообщений для ``consumer``.
+
+        Ждёт не дольше ``timeout`` секунд и возвращает пустой список,
+        если новых сообщений нет.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def ack(self, consumer: str, ids: Sequence[str]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def close(self) -> None:
+        raise NotImplementedError
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import socket
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import uuid4
+
+from adaptix.load_error import LoadError
+
+from maxo import loggers
+from maxo.backoff import Backoff, BackoffConfig
+from maxo.bot.bot import Bot
+from maxo.bot.methods.base import MaxoMethod
+from maxo.routing.dispatcher import Dispatcher
+from maxo.routing.signals.shutdown import AfterShutdown, BeforeShutdown
+from maxo.routing.signals.startup import AfterStartup, BeforeStartup
+from maxo.routing.signals.update import MaxoUpdate
+from maxo.routing.updates import Updates
+from maxo.transport.queue.base import BaseUpdateQueue, QueueMessage
+
+_DEFAULT_BACKOFF_CONFIG = BackoffConfig(
+    min_delay=1.0,
+    max_delay=5.0,
+    factor=1.3,
+    jitter=0.1,
+)
+
+
+def _default_consumer_name() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid4().hex[:8]}"
+
+
+class QueueConsumer:
+    """
+    Транспорт, обрабатывающий апдейты из очереди вебхука.
+
+    Работает как :class:`~maxo.transport.long_polling.LongPolling`, но
+    получает апдейты не из ``get_updates``, а из ``queue``, в которую их
+    складывает ``WebhookEngine``. Одновременно обрабатывается не больше
+    ``max_concurrency`` апдейтов; сообщение подтверждается после обработки.
+    Для горизонтального масштабирования запустите несколько потребителей
+    с разными ``name`` на общей очереди.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        queue: BaseUpdateQueue,
+        name: str | None = None,
+        batch_size: int = 100,
+        read_timeout: float = 5.0,
+        max_concurrency: int = 100,
+        backoff_config: BackoffConfig = _DEFAULT_BACKOFF_CONFIG,
+    ) -> None:
+        self._dispatcher = dispatcher
+        self._queue = queue
+        self.name = name or _default_consumer_name()
+        self._batch_size = batch_size
+        self._read_timeout = read_timeout
+        self._max_concurrency = max_concurrency
+        self._backoff_config = backoff_config
+        self._lock = asyncio.Lock()
+        self._stopped = asyncio.Event()
+
+    def run(
+        self,
+        bot: Bot,
+        auto_close_bot: bool = True,
+        **workflow_data: Any,
+    ) -> None:
+        asyncio.run(
+            self.start(
+                bot=bot,
+                auto_close_bot=auto_close_bot,
+                **workflow_data,
+            ),
+        )
+
+    async def start(
+        self,
+        bot: Bot,
+        auto_close_bot: bool = True,
+        **workflow_data: Any,
+    ) -> None:
+        dispatcher = self._dispatcher
+
+        async with self._lock:
+            self._stopped.clear()
+            dispatcher.workflow_data.update(bot=bot, **workflow_data)
+
+            await dispatcher.feed_signal(BeforeStartup())
+
+            async with bot.context(auto_close=auto_close_bot):
+                loggers.queue_consumer.info("Queue consumer %s started", self.name)
+
+                await dispatcher.feed_signal(AfterStartup(), bot)
+
+                slots = asyncio.Semaphore(self._max_concurrency)
+                async with asyncio.TaskGroup() as tg:
+                    async for message in self._read_messages():
+                        await slots.acquire()
+                        task = tg.create_task(self._process(bot, message))
+                        task.add_done_callback(lambda _: slots.release())
+
+                await dispatcher.feed_signal(BeforeShutdown(), bot)
+
+                loggers.queue_consumer.info("Queue consumer %s stopped", self.name)
+
+        await dispatcher.feed_signal(AfterShutdown())
+
+    def stop(self) -> None:
+        """Прекращает чтение очереди после текущей пачки."""
+        self._stopped.set()
+
+    async def _read_messages(self) -> AsyncIterator[QueueMessage]:
+        backoff = Backoff(self._backoff_config)
+
+        failed = False
+        while not self._stopped.is_set():
+            try:
+                messages = await self._queue.read(
+                    consumer=self.name,
+                    count=self._batch_size,
+                    timeout=self._read_timeout,
+                )
+            except Exception as exception:  # noqa: BLE001
+                failed = True
+                loggers.queue_consumer.exception(
+                    "Failed to read updates - %s: %s",
+                    type(exception).__name__,
+                    exception,
+                )
+                backoff.next()
+                await backoff.sleep()
+                continue
+
+            if failed:
+                loggers.queue_consumer.info(
+                    "Queue is available again (tryings = %d)",
+                    backoff.counter,
+                )
+                backoff.reset()
+                failed = False
+
+            for message in messages:
+                yield message
+
+    async def _process(self, bot: Bot, message: QueueMessage) -> None:
+        try:
+            raw_update = bot.json_loads(message.data)
+            update = MaxoUpdate(update=bot.retort.load(raw_update, Updates))
+        except (ValueError, LoadError):
+            # Повторная доставка не поможет, сообщение подтверждается
+            loggers.queue_consumer.exception("Skip malformed update %s", message.id)
+        else:
+            loggers.queue_consumer.debug("New update: %s", update)
+            try:
+                result = await self._dispatcher.feed_max_update(update, bot)
+                if isinstance(result, MaxoMethod):
+                    await bot.silent_call_method(method=result)
+            except Exception:  # noqa: BLE001
+                loggers.queue_consumer.exception(
+                    "Failed to answer update %s",
+                    message.id,
+                )
+
+        try:
+            await self._queue.ack(self.name, [message.id])
+        except Exception:  # noqa: BLE001
+            # Сообщение будет доставлено повторно
+            loggers.queue_consumer.exception("Failed to ack update %s", message.id)
@@ -0,0 +1,207 @@
+import asyncio
+import os
+import struct
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO
+
+from maxo.transport.queue.base import BaseUpdateQueue, QueueMessage
+
+_HEADER = struct.Struct(">I")
+
+DEFAULT_COMPACT_SIZE = 16 * 1024 * 1024
+
+
+class FileUpdateQueue(BaseUpdateQueue):
+    """
+    Очередь в локальном файле, доступном только для дозаписи.
+
+    Каждый апдейт записывается как длина и тело. Позиция, до которой все
+    сообщения подтверждены, хранится рядом в файле ``<path>.offset``, поэтому
+    после перезапуска чтение продолжается с первого неподтверждённого
+    сообщения. Читать файл может один процесс (в нём может работать
+    несколько ``QueueConsumer``). Каждая запись уходит одним ``os.write``
+    в файл, открытый с ``O_APPEND``, под блокировкой ``flock``, поэтому
+    на Unix писать в файл могут несколько процессов; на Windows писатель
+    должен быть один. ``fsync=True`` сбрасывает каждую запись на диск.
+
+    Когда все записанные сообщения подтверждены, а файл вырос больше
+    ``compact_size`` байт, он обрезается до нуля.
+    """
+
+    __slots__ = (
+        "_acked",
+        "_committed",
+        "_lock",
+        "_read_lock",
+        "_read_offset",
+        "_reader",
+        "_unacked",
+        "_writer",
+        "compact_size",
+        "fsync",
+        "offset_path",
+        "path",
+        "poll_interval",
+    )
+
+    def __init__(
+        self,
+        path: str | Path,
+        fsync: bool = False,
+        poll_interval: float = 0.1,
+        compact_size: int = DEFAULT_COMPACT_SIZE,
+    ) -> None:
+        self.path = Path(path)
+        self.offset_path = self.path.with_name(self.path.name + ".offset")
+        self.fsync = fsync
+        self.poll_interval = poll_interval
+        self.compact_size = compact_size
+        self._lock = asyncio.Lock()
+        self._read_lock = asyncio.Lock()
+        self._writer: int | None = None
+        self._reader: BinaryIO | None = None
+        self._committed = self._load_offset()
+        self._read_offset = self._committed
+        self._unacked: dict[int, int] = {}
+        self._acked: set[int] = set()
+
+    async def put(self, data: bytes) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._append, _HEADER.pack(len(data)) + data)
+
+    async def read(
+        self,
+        consumer: str,
+        count: int,
+        timeout: float,
+    ) -> Sequence[QueueMessage]:
+        deadline = time.monotonic() + timeout
+        while True:
+            async with self._read_lock:
+                records = await asyncio.to_thread(self._read_records, count)
+                for start, end, _ in records:
+                    self._unacked[start] = end
+                if records:
+                    self._read_offset = records[-1][1]
+                    return [
+                        QueueMessage(id=str(start), data=data)
+                        for start, _, data in records
+                    ]
+
+            delay = min(self.poll_interval, deadline - time.monotonic())
+            if delay <= 0:
+                return []
+            await asyncio.sleep(delay)
+
+    async def ack(self, consumer: str, ids: Sequence[str]) -> None:
+        async with self._read_lock:
+            self._acked.update(int(id_) for id_ in ids)
+            committed = self._committed
+            while committed in self._acked:
+                self._acked.remove(committed)
+                committed = self._unacked.pop(committed)
+            if committed != self._committed:
+                self._committed = committed
+                await asyncio.to_thread(self._save_offset, committed)
+                if committed >= self.compact_size:
+                    await asyncio.to_thread(self._compact)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            os.close(self._writer)
+        if self._reader is not None:
+            self._reader.close()
+        self._writer = self._reader = None
+
+    def _append(self, record: bytes) -> None:
+        if self._writer is None:
+            self._writer = os.open(
+                self.path,
+                os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+                0o644,
+            )
+        with _locked(self._writer):
+            view = memoryview(record)
+            while view:
+                view = view[os.write(self._writer, view) :]
+            if self.fsync:
+                os.fsync(self._writer)
+
+    def _compact(self) -> None:
+        """Обрезает файл, если все сообщения в нём подтверждены."""
+        if self._reader is None:
+            return
+        # Писатели держат ту же блокировку, пока дописывают запись
+        with _locked(self._reader.fileno()):
+            if os.fstat(self._reader.fileno()).st_size != self._committed:
+                return
+            # Сначала позиция: если процесс упадёт до обрезки, подтверждённые
+            # сообщения будут прочитаны повторно, но не потеряны
+            self._save_offset(0)
+            os.truncate(self.path, 0)
+        # В буфере читателя остались данные обрезанного файла
+        self._reader.close()
+        self._reader = None
+        self._committed = self._read_offset = 0
+
+    def _read_records(self, count: int) -> list[tuple[int, int, bytes]]:
+        if self._reader is None:
+            if not self.path.exists():
+                return []
+            self._reader = self.path.open("rb")
+
+        records: list[tuple[int, int, bytes]] = []
+        offset = self._read_offset
+        self._reader.seek(offset)
+        while len(records) < count:
+            header = self._reader.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                break
+            (size,) = _HEADER.unpack(header)
+            data = self._reader.read(size)
+            if len(data) < size:
+                # Запись ещё не дописана до конца
+                break
+            end = offset + _HEADER.size + size
+            records.append((offset, end, data))
+            offset = end
+        return records
+
+    def _load_offset(self) -> int:
+        try:
+            offset = int(self.offset_path.read_text())
+        except FileNotFoundError:
+            return 0
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+        # Файл обрезали или пересоздали
+        return offset if offset <= size else 0
+
+    def _save_offset(self, offset: int) -> None:
+        tmp_path = self.offset_path.with_name(self.offset_path.name + ".tmp")
+        tmp_path.write_text(str(offset))
+        tmp_path.replace(self.offset_path)
+
+
+if sys.platform == "win32":
+
+    @contextmanager
+    def _locked(fd: int) -> Iterator[None]:
+        yield
+
+else:
+    import fcntl
+
+    @contextmanager
+    def _locked(fd: int) -> Iterator[None]:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
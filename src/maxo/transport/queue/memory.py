@@ -0,0 +1,50 @@
+import asyncio
+import itertools
+from collections.abc import Sequence
+
+from maxo.transport.queue.base import BaseUpdateQueue, QueueMessage
+
+
+class MemoryUpdateQueue(BaseUpdateQueue):
+    """
+    Очередь в памяти процесса на основе ``asyncio.Queue``.
+
+    Отделяет ответ на вебхук от обработки апдейтов в пределах одного
+    процесса. При заполнении (``maxsize``) ``put`` ждёт свободного места.
+    Неподтверждённые сообщения теряются вместе с процессом.
+    """
+
+    __slots__ = ("_ids", "_queue", "pending")
+
+    def __init__(self, maxsize: int = 0) -> None:
+        self._queue: asyncio.Queue[QueueMessage] = asyncio.Queue(maxsize=maxsize)
+        self._ids = itertools.count()
+        self.pending: dict[str, QueueMessage] = {}
+
+    async def put(self, data: bytes) -> None:
+        await self._queue.put(QueueMessage(id=str(next(self._ids)), data=data))
+
+    async def read(
+        self,
+        consumer: str,
+        count: int,
+        timeout: float,
+    ) -> Sequence[QueueMessage]:
+        try:
+            message = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except TimeoutError:
+            return []
+
+        messages = [message]
+        while len(messages) < count and not self._queue.empty():
+            messages.append(self._queue.get_nowait())
+        for message in messages:
+            self.pending[message.id] = message
+        return messages
+
+    async def ack(self, consumer: str, ids: Sequence[str]) -> None:
+        for id_ in ids:
+            self.pending.pop(id_, None)
+
+    async def close(self) -> None:
+        pass
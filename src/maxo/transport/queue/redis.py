@@ -0,0 +1,140 @@
+try:
+    from redis.asyncio import ConnectionPool, Redis
+    from redis.exceptions import ResponseError
+except ImportError as e:
+    e.add_note("* Please run `pip install maxo[redis]`")
+    raise
+
+from collections.abc import Sequence
+from typing import Any
+
+from maxo.transport.queue.base import BaseUpdateQueue, QueueMessage
+
+DEFAULT_STREAM = "maxo:updates"
+DEFAULT_GROUP = "maxo"
+_DATA_FIELD = b"data"
+
+
+class RedisStreamQueue(BaseUpdateQueue):
+    """
+    Очередь в Redis Streams с группой потребителей.
+
+    Вебхук добавляет апдейты в поток ``stream`` через ``XADD``, а
+    ``QueueConsumer`` на любом числе серверов читают их через ``XREADGROUP``
+    в группе ``group``: каждое сообщение получает один потребитель.
+    Сообщения, не подтверждённые дольше ``claim_idle`` секунд (например,
+    после падения потребителя), забираются другими через ``XAUTOCLAIM``.
+    ``maxlen`` приблизительно ограничивает длину потока. Клиент Redis
+    должен возвращать байты (без ``decode_responses``).
+    """
+
+    __slots__ = ("_group_created", "claim_idle", "group", "maxlen", "redis", "stream")
+
+    def __init__(
+        self,
+        redis: Redis,
+        stream: str = DEFAULT_STREAM,
+        group: str = DEFAULT_GROUP,
+        maxlen: int | None = None,
+        claim_idle: float | None = 60.0,
+    ) -> None:
+        self.redis = redis
+        self.stream = stream
+        self.group = group
+        self.maxlen = maxlen
+        self.claim_idle = claim_idle
+        self._group_created = False
+
+    @classmethod
+    def from_url(
+        cls,
+        url: str,
+        connection_kwargs: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> "RedisStreamQueue":
+        if connection_kwargs is None:
+            connection_kwargs = {}
+        pool = ConnectionPool.from_url(url, **connection_kwargs)
+        redis = Redis(connection_pool=pool)
+        return cls(redis=redis, **kwargs)
+
+    async def put(self, data: bytes) -> None:
+        await self.redis.xadd(
+            self.stream,
+            {_DATA_FIELD: data},
+            maxlen=self.maxlen,
+            approximate=True,
+        )
+
+    async def read(
+        self,
+        consumer: str,
+        count: int,
+        timeout: float,
+    ) -> Sequence[QueueMessage]:
+        await self._ensure_group()
+
+        if self.claim_idle is not None:
+            _, claimed, *_ = await self.redis.xautoclaim(
+                self.stream,
+                self.group,
+                consumer,
+                min_idle_time=int(self.claim_idle * 1000),
+                count=count,
+            )
+            messages = self._build_messages(claimed)
+            if messages:
+                return messages
+
+        response: Any = await self.redis.xreadgroup(
+            self.group,
+            consumer,
+            {self.stream: ">"},
+            count=count,
+            block=max(int(timeout * 1000), 1),
+        )
+        if not response:
+            return []
+        # RESP3 возвращает словарь по имени потока, RESP2 — список пар
+        if isinstance(response, dict):
+            return self._build_messages(next(iter(response.values()))[0])
+        return self._build_messages(response[0][1])
+
+    async def ack(self, consumer: str, ids: Sequence[str]) -> None:
+        if ids:
+            await self.redis.xack(self.stream, self.group, *ids)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+    async def _ensure_group(self) -> None:
+        if self._group_created:
+            return
+        try:
+            await self.redis.xgroup_create(
+                self.stream,
+                self.group,
+                id="0",
+                mkstream=True,
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_created = True
+
+    def _build_messages(
+        self,
+        entries: Sequence[Any],
+    ) -> list[QueueMessage]:
+        messages = []
+        for id_, fields in entries:
+            # Запись могла быть удалена из потока по ``maxlen``
+            if not fields:
+                continue
+            messages.append(
+                QueueMessage(
+                    id=id_.decode() if isinstance(id_, bytes) else id_,
+                    data=fields[_DATA_FIELD],
+                ),
+            )
+        return messages
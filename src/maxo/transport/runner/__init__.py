@@ -0,0 +1,11 @@
+from maxo.transport.runner.polling import PollingRunner, get_shard_key
+from maxo.transport.runner.supervisor import WorkerSupervisor
+from maxo.transport.runner.webhook import WebhookRunner, create_reuse_port_socket
+
+__all__ = (
+    "PollingRunner",
+    "WebhookRunner",
+    "WorkerSupervisor",
+    "create_reuse_port_socket",
+    "get_shard_key",
+)
@@ -0,0 +1,304 @@
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import signal
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pipe
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any
+
+from maxo import loggers
+from maxo.bot.bot import Bot
+from maxo.omit import Omittable, Omitted, is_defined
+from maxo.routing.dispatcher import Dispatcher
+from maxo.routing.signals.shutdown import AfterShutdown, BeforeShutdown
+from maxo.routing.signals.startup import AfterStartup, BeforeStartup
+from maxo.routing.signals.update import MaxoUpdate
+from maxo.routing.utils import collect_used_updates
+from maxo.transport.long_polling import LongPolling
+from maxo.transport.runner.supervisor import WorkerSupervisor
+
+_RECEIVE_TIMEOUT = 1.0
+_MAX_PENDING_UPDATES = 1000
+_DRAIN_SIGNAL = signal.SIGUSR1
+
+
+def get_shard_key(update: Any) -> int:
+    """Ключ шардирования апдейта: id чата, а если его нет — пользователя."""
+    chat_id = getattr(update, "chat_id", None)
+    if chat_id is not None:
+        return int(chat_id)
+
+    message = getattr(update, "message", None)
+    if message is not None:
+        recipient = message.recipient
+        return int(recipient.chat_id or recipient.user_id or 0)
+
+    user = getattr(update, "user", None)
+    if user is not None:
+        return int(user.user_id)
+    return 0
+
+
+def _receive(
+    connection: Connection,
+    count: int,
+    timeout: float,
+) -> list[MaxoUpdate[Any]] | None:
+    """Читает до ``count`` апдейтов, ``None`` — родительский процесс закрыл канал."""
+    updates: list[MaxoUpdate[Any]] = []
+    try:
+        if not connection.poll(timeout):
+            return updates
+        while len(updates) < count:
+            updates.append(connection.recv())
+            if not connection.poll():
+                break
+    except EOFError:
+        return updates or None
+    return updates
+
+
+class _UpdateSender:
+    """
+    Передаёт апдейты в канал рабочего процесса из отдельного потока.
+
+    Запись в заполненный канал блокирует этот поток, а не цикл событий.
+    Поток один, поэтому порядок апдейтов сохраняется. Когда отправки ждут
+    ``max_pending`` апдейтов, ``send`` ждёт, пока место освободится.
+    """
+
+    __slots__ = ("_connection", "_executor", "_pending", "_slots", "index")
+
+    def __init__(self, index: int, connection: Connection, max_pending: int) -> None:
+        self.index = index
+        self._connection = connection
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix=f"maxo-sender-{index}",
+        )
+        self._slots = asyncio.Semaphore(max_pending)
+        self._pending: set[asyncio.Future[None]] = set()
+
+    async def send(self, update: MaxoUpdate[Any]) -> None:
+        await self._slots.acquire()
+        future = asyncio.wrap_future(
+            self._executor.submit(self._connection.send, update),
+        )
+        self._pending.add(future)
+        future.add_done_callback(self._sent)
+
+    async def flush(self) -> None:
+        """Ждёт, пока все принятые апдейты будут записаны в канал."""
+        if self._pending:
+            await asyncio.wait(set(self._pending))
+
+    def close(self) -> None:
+        """Отменяет неотправленные апдейты, не дожидаясь записи в канал."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _sent(self, future: asyncio.Future[None]) -> None:
+        self._pending.discard(future)
+        self._slots.release()
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            loggers.runner.error(
+                "Failed to pass update to worker %d: %s",
+                self.index,
+                error,
+            )
+
+
+class PollingRunner:
+    """
+    Long polling с обработкой апдейтов в нескольких процессах.
+
+    Родительский процесс только получает апдейты через ``get_updates`` и
+    передаёт их по каналам (``multiprocessing.Pipe``) рабочим процессам.
+    Апдейты одного чата всегда попадают в один процесс (шардирование по
+    ``chat_id``), поэтому FSM и порядок сообщений в чате сохраняются.
+    Каждый рабочий процесс создаёт свой ``Bot`` через ``bot_factory`` и
+    вызывает сигналы запуска и остановки диспетчера.
+
+    Апдейты пишутся в каналы из отдельных потоков, поэтому медленный
+    процесс не блокирует цикл событий, но когда для него накопится
+    ``1000`` неотправленных апдейтов, получение новых приостановится.
+    Рабочие процессы запускает и перезапускает отдельный процесс-надзиратель,
+    созданный до цикла событий. При остановке рабочие процессы дочитывают
+    свои каналы и только через ``stop_timeout`` секунд получают ``SIGTERM``.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot_factory: Callable[[], Bot],
+        workers: int | None = None,
+        timeout: Omittable[int] = 30,
+        limit: Omittable[int] = 100,
+        types: Omittable[Sequence[str]] = Omitted(),
+        drop_pending_updates: bool = False,
+        max_concurrency: int = 100,
+        restart_delay: float = 1.0,
+        stop_timeout: float = 30.0,
+        **workflow_data: Any,
+    ) -> None:
+        self.dispatcher = dispatcher
+        self.bot_factory = bot_factory
+        self.timeout = timeout
+        self.limit = limit
+        self.types = types
+        self.drop_pending_updates = drop_pending_updates
+        self.max_concurrency = max_concurrency
+        self.workflow_data = workflow_data
+        self.supervisor = WorkerSupervisor(
+            self._run_worker,
+            workers=workers,
+            restart_delay=restart_delay,
+            stop_timeout=stop_timeout,
+        )
+        self._pipes: list[tuple[Connection, Connection]] = []
+        self._senders: list[_UpdateSender] = []
+
+    def run(self) -> None:
+        self._pipes = [Pipe(duplex=False) for _ in range(self.supervisor.workers)]
+        # Рабочие процессы создаются и перезапускаются в отдельном процессе:
+        # fork из родителя унаследовал бы его цикл событий и сессию бота
+        supervisor = multiprocessing.get_context("fork").Process(
+            target=self._supervise,
+            name="maxo-supervisor",
+        )
+        signals = {signal.SIGINT, signal.SIGTERM, _DRAIN_SIGNAL}
+        signal.pthread_sigmask(signal.SIG_BLOCK, signals)
+        try:
+            supervisor.start()
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, signals)
+        for reader, _ in self._pipes:
+            reader.close()
+
+        try:
+            asyncio.run(self._poll(supervisor))
+        finally:
+            # Рабочие процессы дочитывают каналы до EOF и завершаются сами,
+            # надзиратель больше не перезапускает их
+            if supervisor.is_alive() and supervisor.pid is not None:
+                os.kill(supervisor.pid, _DRAIN_SIGNAL)
+            for _, writer in self._pipes:
+                writer.close()
+            supervisor.join()
+
+    def _supervise(self) -> None:
+        for _, writer in self._pipes:
+            writer.close()
+        # Ctrl+C приходит всей группе процессов, а остановкой рабочих
+        # процессов управляет родитель
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        self.supervisor.run(
+            stop_signals={signal.SIGTERM},
+            drain_signals={_DRAIN_SIGNAL},
+        )
+
+    async def _poll(self, supervisor: BaseProcess) -> None:
+        loop = asyncio.get_running_loop()
+        stopped = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stopped.set)
+
+        self._senders = [
+            _UpdateSender(index, writer, _MAX_PENDING_UPDATES)
+            for index, (_, writer) in enumerate(self._pipes)
+        ]
+        bot = self.bot_factory()
+        async with bot.context():
+            forwarder = asyncio.create_task(self._forward_updates(bot))
+            try:
+                while not stopped.is_set() and not forwarder.done():
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(
+                            stopped.wait(),
+                            timeout=self.supervisor.restart_delay,
+                        )
+                    if not supervisor.is_alive():
+                        loggers.runner.error(
+                            "Worker supervisor exited with code %s, stopping",
+                            supervisor.exitcode,
+                        )
+                        break
+            finally:
+                forwarder.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await forwarder
+                await self._flush()
+
+    async def _flush(self) -> None:
+        try:
+            async with asyncio.timeout(self.supervisor.stop_timeout):
+                await asyncio.gather(*(sender.flush() for sender in self._senders))
+        except TimeoutError:
+            loggers.runner.warning(
+                "Workers did not accept pending updates in time, dropping them",
+            )
+        for sender in self._senders:
+            sender.close()
+
+    async def _forward_updates(self, bot: Bot) -> None:
+        types = self.types
+        if not is_defined(types):
+            types = collect_used_updates(self.dispatcher)
+
+        workers = self.supervisor.workers
+        updates = LongPolling(self.dispatcher)._get_updates(  # noqa: SLF001
+            bot=bot,
+            timeout=self.timeout,
+            limit=self.limit,
+            types=list(types),
+            drop_pending_updates=self.drop_pending_updates,
+        )
+        async for update in updates:
+            index = get_shard_key(update.update) % workers
+            await self._senders[index].send(update)
+
+    def _run_worker(self, index: int) -> None:
+        for pipe_index, (reader, writer) in enumerate(self._pipes):
+            writer.close()
+            if pipe_index != index:
+                reader.close()
+        asyncio.run(self._serve(self._pipes[index][0]))
+
+    async def _serve(self, reader: Connection) -> None:
+        dispatcher = self.dispatcher
+        bot = self.bot_factory()
+        stopped = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set)
+
+        dispatcher.workflow_data.update(bot=bot, **self.workflow_data)
+        await dispatcher.feed_signal(BeforeStartup())
+
+        async with bot.context():
+            await dispatcher.feed_signal(AfterStartup(), bot)
+
+            slots = asyncio.Semaphore(self.max_concurrency)
+            async with asyncio.TaskGroup() as tg:
+                while not stopped.is_set():
+                    updates = await asyncio.to_thread(
+                        _receive,
+                        reader,
+                        self.max_concurrency,
+                        _RECEIVE_TIMEOUT,
+                    )
+                    if updates is None:
+                        loggers.runner.info("Update channel closed, stopping worker")
+                        break
+                    for update in updates:
+                        await slots.acquire()
+                        task = tg.create_task(dispatcher.feed_max_update(update, bot))
+                        task.add_done_callback(lambda _: slots.release())
+
+            await dispatcher.feed_signal(BeforeShutdown(), bot)
+
+        await dispatcher.feed_signal(AfterShutdown())
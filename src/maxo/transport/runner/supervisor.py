@@ -0,0 +1,192 @@
+import multiprocessing
+import os
+import signal
+import time
+from collections.abc import Callable, Collection
+from multiprocessing.connection import wait
+from multiprocessing.process import BaseProcess
+from types import FrameType
+
+from maxo import loggers
+
+_STOP_SIGNALS = {signal.SIGINT, signal.SIGTERM}
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+class WorkerSupervisor:
+    """
+    Запускает ``workers`` процессов ``target(index)`` и перезапускает упавшие.
+
+    Процессы создаются через ``fork``, поэтому ``target`` и всё, что он
+    использует, не обязаны сериализоваться. Процесс, завершившийся раньше
+    ``restart_delay`` секунд после запуска, перезапускается не сразу, чтобы
+    не уйти в цикл перезапусков. При остановке процессы получают
+    ``SIGTERM`` и через ``stop_timeout`` секунд — ``SIGKILL``. Сигналы из
+    ``drain_signals`` метода ``run`` останавливают процессы мягко: сначала
+    им даётся ``stop_timeout`` секунд, чтобы завершиться самим.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[int], None],
+        workers: int | None = None,
+        restart_delay: float = 1.0,
+        stop_timeout: float = 30.0,
+    ) -> None:
+        if workers is None:
+            workers = default_workers()
+        if workers < 1:
+            raise ValueError("`workers` should be greater than 0")
+
+        self.workers = workers
+        self.restart_delay = restart_delay
+        self.stop_timeout = stop_timeout
+        self.processes: dict[int, BaseProcess] = {}
+        self.restarts = 0
+        self._target = target
+        self._started_at: dict[int, float] = {}
+        self._stopping = False
+        self._draining = False
+        self._drain_signals: frozenset[int] = frozenset()
+        self._context = multiprocessing.get_context("fork")
+
+    @property
+    def stopping(self) -> bool:
+        return self._stopping
+
+    def start(self) -> None:
+        for index in range(self.workers):
+            self._spawn(index)
+
+    def restart_dead(self) -> list[int]:
+        """Перезапускает завершившиеся процессы, возвращает их номера."""
+        if self._stopping:
+            return []
+
+        restarted = []
+        now = time.monotonic()
+        for index, process in self.processes.items():
+            if process.is_alive():
+                continue
+            if now - self._started_at[index] < self.restart_delay:
+                continue
+
+            process.join()
+            loggers.runner.warning(
+                "Worker %d (pid=%s) exited with code %s, restarting",
+                index,
+                process.pid,
+                process.exitcode,
+            )
+            self._spawn(index)
+            self.restarts += 1
+            restarted.append(index)
+        return restarted
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Ждёт завершения любого из процессов не дольше ``timeout`` секунд."""
+        wait([process.sentinel for process in self.processes.values()], timeout)
+
+    def request_stop(self, drain: bool = False) -> None:
+        self._stopping = True
+        self._draining = self._draining or drain
+
+    def stop(self, drain: bool = False) -> None:
+        """
+        Останавливает процессы и ждёт их завершения.
+
+        С ``drain=True`` процессы сначала ``stop_timeout`` секунд завершаются
+        сами (например, дочитывают закрытый канал), и только оставшиеся
+        получают ``SIGTERM``.
+        """
+        self._stopping = True
+        if drain:
+            deadline = time.monotonic() + self.stop_timeout
+            for process in self.processes.values():
+                process.join(max(deadline - time.monotonic(), 0))
+
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + self.stop_timeout
+        for index, process in self.processes.items():
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                loggers.runner.warning(
+                    "Worker %d (pid=%s) did not stop in time, killing",
+                    index,
+                    process.pid,
+                )
+                process.kill()
+                process.join()
+
+    def run(
+        self,
+        stop_signals: Collection[int] = _STOP_SIGNALS,
+        drain_signals: Collection[int] = (),
+    ) -> None:
+        """Запускает процессы и следит за ними до сигнала остановки."""
+        self._drain_signals = frozenset(drain_signals)
+        handlers = {
+            signum: signal.signal(signum, self._handle_signal)
+            for signum in stop_signals
+        }
+        handlers.update(
+            (signum, signal.signal(signum, self._handle_drain_signal))
+            for signum in self._drain_signals
+        )
+        # Сигналы, пришедшие до установки обработчиков, могли быть
+        # заблокированы процессом, который нас запустил
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, handlers)
+        try:
+            self.start()
+            while not self._stopping:
+                self.wait(timeout=self.restart_delay)
+                self.restart_dead()
+        finally:
+            self.stop(drain=self._draining)
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+    def _handle_signal(self, signum: int, frame: FrameType | None) -> None:
+        loggers.runner.info("Received %s, stopping workers", signal.strsignal(signum))
+        self.request_stop()
+
+    def _handle_drain_signal(self, signum: int, frame: FrameType | None) -> None:
+        loggers.runner.info(
+            "Received %s, waiting for workers to finish",
+            signal.strsignal(signum),
+        )
+        self.request_stop(drain=True)
+
+    def _spawn(self, index: int) -> None:
+        process = self._context.Process(
+            target=self._run_worker,
+            args=(index,),
+            name=f"maxo-worker-{index}",
+        )
+        # Сигнал, пришедший между fork и настройкой обработчиков в дочернем
+        # процессе, попал бы в обработчик родителя и потерялся
+        signals = _STOP_SIGNALS | self._drain_signals
+        signal.pthread_sigmask(signal.SIG_BLOCK, signals)
+        try:
+            process.start()
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, signals)
+        self.processes[index] = process
+        self._started_at[index] = time.monotonic()
+        loggers.runner.info("Worker %d started (pid=%s)", index, process.pid)
+
+    def _run_worker(self, index: int) -> None:
+        # Ctrl+C приходит всей группе процессов, рабочие останавливаются
+        # по SIGTERM от родителя, чтобы завершиться в одном порядке
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        for signum in self._drain_signals:
+            signal.signal(signum, signal.SIG_DFL)
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, _STOP_SIGNALS | self._drain_signals)
+        self._target(index)
@@ -0,0 +1,82 @@
+import socket
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiohttp import web
+
+from maxo.transport.runner.supervisor import WorkerSupervisor
+
+AppFactory = Callable[[], web.Application | Awaitable[web.Application]]
+
+
+def create_reuse_port_socket(
+    host: str,
+    port: int,
+    backlog: int = 128,
+) -> socket.socket:
+    """
+    Создаёт слушающий сокет с ``SO_REUSEPORT``.
+
+    Каждый рабочий процесс открывает свой сокет на том же порту, а ядро
+    распределяет между ними входящие соединения.
+    """
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise RuntimeError("SO_REUSEPORT is not supported on this platform")
+
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((host, port))
+        sock.listen(backlog)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class WebhookRunner:
+    """
+    Запускает aiohttp-приложение с вебхуком в нескольких процессах.
+
+    ``app_factory`` вызывается в каждом рабочем процессе и должен создавать
+    своё приложение, движок и ``Bot``: процессы ничего не разделяют.
+    Остановка рабочего процесса проходит через ``on_shutdown`` приложения,
+    то есть с дожиданием фоновых задач движка.
+    """
+
+    def __init__(
+        self,
+        app_factory: AppFactory,
+        host: str = "0.0.0.0",  # noqa: S104
+        port: int = 8080,
+        workers: int | None = None,
+        backlog: int = 128,
+        restart_delay: float = 1.0,
+        stop_timeout: float = 60.0,
+        **run_app_kwargs: Any,
+    ) -> None:
+        self.app_factory = app_factory
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        self.run_app_kwargs = run_app_kwargs
+        self.supervisor = WorkerSupervisor(
+            self._run_worker,
+            workers=workers,
+            restart_delay=restart_delay,
+            stop_timeout=stop_timeout,
+        )
+
+    def run(self) -> None:
+        self.supervisor.run()
+
+    def _run_worker(self, index: int) -> None:
+        sock = create_reuse_port_socket(self.host, self.port, self.backlog)
+        web.run_app(
+            self.app_factory(),
+            sock=sock,
+            print=None,
+            **self.run_app_kwargs,
+        )
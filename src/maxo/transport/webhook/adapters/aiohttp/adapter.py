@@ -12,7 +12,11 @@ from maxo.transport.webhook.adapters.aiohttp.mapping import (
     AiohttpHeadersMapping,
     AiohttpQueryMapping,
 )
-from maxo.transport.webhook.adapters.base_adapter import BoundRequest, WebAdapter
+from maxo.transport.webhook.adapters.base_adapter import (
+    BodyTooLargeError,
+    BoundRequest,
+    WebAdapter,
+)
 from maxo.transport.webhook.adapters.base_mapping import MappingABC
 
 
@@ -28,6 +32,22 @@ class AiohttpBoundRequest(BoundRequest[Request]):
         except ContentTypeError as e:
             raise JSONDecodeError(str(e), "", 0) from e
 
+    async def read_body(self, max_size: int | None = None) -> bytes:
+        if max_size is None:
+            return await self.request.read()
+
+        # Заявленный размер проверяется до чтения, фактический — по ходу чтения
+        content_length = self.request.content_length
+        if content_length is not None and content_length > max_size:
+            raise BodyTooLargeError(max_size)
+
+        body = bytearray()
+        async for chunk in self.request.content.iter_any():
+            body += chunk
+            if len(body) > max_size:
+                raise BodyTooLargeError(max_size)
+        return bytes(body)
+
     @property
     def client_ip(self) -> IPv4Address | IPv6Address | str | None:
         peer_name = cast(Transport, self.request.transport).get_extra_info("peername")
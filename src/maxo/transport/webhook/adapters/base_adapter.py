@@ -13,6 +13,14 @@ if TYPE_CHECKING:
 R = TypeVar("R")
 
 
+class BodyTooLargeError(ValueError):
+    """Тело запроса больше допустимого размера."""
+
+    def __init__(self, max_size: int) -> None:
+        super().__init__(f"Request body is larger than {max_size} bytes")
+        self.max_size = max_size
+
+
 class BoundRequest(ABC, Generic[R]):
     """Unified abstraction for requests across frameworks."""
 
@@ -26,6 +34,16 @@ class BoundRequest(ABC, Generic[R]):
         """Get JSON data from request."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def read_body(self, max_size: int | None = None) -> bytes:
+        """
+        Get raw request body.
+
+        :param max_size: Maximum body size in bytes, ``None`` for no limit.
+        :raises BodyTooLargeError: If the body is larger than ``max_size``.
+        """
+        raise NotImplementedError
+
     @property
     @abstractmethod
     def client_ip(self) -> IPv4Address | IPv6Address | str | None:
@@ -5,7 +5,11 @@ from typing import Any
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
-from maxo.transport.webhook.adapters.base_adapter import BoundRequest, WebAdapter
+from maxo.transport.webhook.adapters.base_adapter import (
+    BodyTooLargeError,
+    BoundRequest,
+    WebAdapter,
+)
 from maxo.transport.webhook.adapters.base_mapping import MappingABC
 from maxo.transport.webhook.adapters.fastapi.mapping import (
     FastApiHeadersMapping,
@@ -22,6 +26,26 @@ class FastApiBoundRequest(BoundRequest[Request]):
     async def json(self) -> dict[str, Any]:
         return await self.request.json()
 
+    async def read_body(self, max_size: int | None = None) -> bytes:
+        if max_size is None:
+            return await self.request.body()
+
+        # Заявленный размер проверяется до чтения, фактический — по ходу чтения
+        content_length = self.request.headers.get("content-length")
+        if (
+            content_length is not None
+            and content_length.isdigit()
+            and int(content_length) > max_size
+        ):
+            raise BodyTooLargeError(max_size)
+
+        body = bytearray()
+        async for chunk in self.request.stream():
+            body += chunk
+            if len(body) > max_size:
+                raise BodyTooLargeError(max_size)
+        return bytes(body)
+
     @property
     def client_ip(self) -> IPv4Address | IPv6Address | str | None:
         if self.request.client:
@@ -1,7 +1,15 @@
 from maxo.transport.webhook.engines.base import WebhookEngine
 from maxo.transport.webhook.engines.simple import SimpleEngine
+from maxo.transport.webhook.engines.task_pool import (
+    BackgroundTaskPool,
+    DrainResult,
+    TaskPoolStats,
+)
 
 __all__ = (
+    "BackgroundTaskPool",
+    "DrainResult",
     "SimpleEngine",
+    "TaskPoolStats",
     "WebhookEngine",
 )
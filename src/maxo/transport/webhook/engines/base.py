@@ -1,18 +1,25 @@
-import asyncio
 from abc import ABC, abstractmethod
-from json import JSONDecodeError
-from typing import Any
+from typing import Any, Final
 
 from adaptix.load_error import LoadError
 
-from maxo import Bot, Dispatcher
+from maxo import Bot, Dispatcher, loggers
 from maxo.bot.methods.base import MaxoMethod
 from maxo.routing.signals import MaxoUpdate
 from maxo.routing.updates import Updates
-from maxo.transport.webhook.adapters.base_adapter import BoundRequest, WebAdapter
+from maxo.transport.queue.base import BaseUpdateQueue
+from maxo.transport.webhook.adapters.base_adapter import (
+    BodyTooLargeError,
+    BoundRequest,
+    WebAdapter,
+)
+from maxo.transport.webhook.engines.task_pool import BackgroundTaskPool, DrainResult
 from maxo.transport.webhook.routing.base import BaseRouting
 from maxo.transport.webhook.security.security import Security
 
+DEFAULT_MAX_BODY_SIZE: Final = 1024 * 1024
+DEFAULT_SHUTDOWN_TIMEOUT: Final = 30.0
+
 
 class WebhookEngine(ABC):
     """
@@ -21,6 +28,18 @@ class WebhookEngine(ABC):
     Handles incoming webhook requests, bot resolution, security checks,
     routing, and dispatching updates to the maxo dispatcher. Supports
     both synchronous and background processing.
+
+    The request body is read once as raw bytes, limited by ``max_body_size``
+    (``None`` disables the limit), and decoded with ``Bot.json_loads``.
+
+    Background processing runs in a bounded ``task_pool``; updates that do
+    not fit into it are answered with 503. On shutdown the pool is drained:
+    new updates are rejected and outstanding ones get ``shutdown_timeout``
+    seconds to finish before they are cancelled.
+
+    With ``update_queue`` the engine works in ingestion mode: valid update
+    bodies are only appended to the queue and handled elsewhere by
+    :class:`~maxo.transport.queue.QueueConsumer`.
     """
 
     def __init__(
@@ -31,13 +50,22 @@ class WebhookEngine(ABC):
         routing: BaseRouting,
         security: Security | None = None,
         handle_in_background: bool = True,
+        max_body_size: int | None = DEFAULT_MAX_BODY_SIZE,
+        task_pool: BackgroundTaskPool | None = None,
+        shutdown_timeout: float | None = DEFAULT_SHUTDOWN_TIMEOUT,
+        update_queue: BaseUpdateQueue | None = None,
     ) -> None:
         self.dispatcher = dispatcher
         self.web_adapter = web_adapter
         self.routing = routing
         self.security = security
         self.handle_in_background = handle_in_background
-        self._background_feed_update_tasks: set[asyncio.Task[Any]] = set()
+        self.max_body_size = max_body_size
+        if task_pool is None:
+            task_pool = BackgroundTaskPool()
+        self.task_pool = task_pool
+        self.shutdown_timeout = shutdown_timeout
+        self.update_queue = update_queue
 
     @abstractmethod
     def _get_bot_from_request(self, bound_request: BoundRequest[Any]) -> Bot | None:
@@ -55,6 +83,26 @@ class WebhookEngine(ABC):
     async def on_shutdown(self, app: Any, *args: Any, **kwargs: Any) -> None:
         raise NotImplementedError
 
+    async def drain(self) -> DrainResult:
+        """
+        Stop accepting updates and wait for background tasks.
+
+        Tasks still running after ``shutdown_timeout`` are cancelled.
+        """
+        result = await self.task_pool.drain(timeout=self.shutdown_timeout)
+        if result.abandoned:
+            loggers.webhook.warning(
+                "Webhook drained: %d tasks finished, %d abandoned",
+                result.finished,
+                result.abandoned,
+            )
+        else:
+            loggers.webhook.info(
+                "Webhook drained: %d tasks finished",
+                result.finished,
+            )
+        return result
+
     def _build_workflow_data(self, app: Any, **kwargs: Any) -> dict[str, Any]:
         """Build workflow data for startup/shutdown events."""
         return {
@@ -82,8 +130,16 @@ class WebhookEngine(ABC):
             )
 
         try:
-            raw_update = await bound_request.json()
-        except JSONDecodeError:
+            body = await bound_request.read_body(max_size=self.max_body_size)
+        except BodyTooLargeError:
+            return self.web_adapter.create_json_response(
+                status=413,
+                payload={"detail": "Payload too large"},
+            )
+
+        try:
+            raw_update = bot.json_loads(body)
+        except ValueError:
             return self.web_adapter.create_json_response(
                 status=400,
                 payload={"detail": "Bad request"},
@@ -97,6 +153,8 @@ class WebhookEngine(ABC):
                 payload={"detail": "Bad request"},
             )
 
+        if self.update_queue is not None:
+            return await self._enqueue_update(self.update_queue, body)
         if self.handle_in_background:
             return await self._handle_request_background(bot=bot, update=update)
         return await self._handle_request(bot=bot, update=update)
@@ -123,6 +181,17 @@ class WebhookEngine(ABC):
         await bot.silent_call_method(method=result)
         return self.web_adapter.create_json_response(status=200, payload={})
 
+    async def _enqueue_update(self, queue: BaseUpdateQueue, body: bytes) -> Any:
+        try:
+            await queue.put(body)
+        except Exception:  # noqa: BLE001
+            loggers.webhook.exception("Failed to enqueue update")
+            return self.web_adapter.create_json_response(
+                status=503,
+                payload={"detail": "Service unavailable"},
+            )
+        return self.web_adapter.create_json_response(status=200, payload={})
+
     async def _background_feed_update(self, bot: Bot, update: MaxoUpdate[Any]) -> None:
         result = await self.dispatcher.feed_max_update(
             bot=bot,
@@ -136,10 +205,14 @@ class WebhookEngine(ABC):
         bot: Bot,
         update: MaxoUpdate[Any],
     ) -> Any:
-        feed_update_task = asyncio.create_task(
-            self._background_feed_update(bot=bot, update=update),
-        )
-        self._background_feed_update_tasks.add(feed_update_task)
-        feed_update_task.add_done_callback(self._background_feed_update_tasks.discard)
+        if not await self.task_pool.submit(
+            self._background_feed_update,
+            bot=bot,
+            update=update,
+        ):
+            return self.web_adapter.create_json_response(
+                status=503,
+                payload={"detail": "Service unavailable"},
+            )
 
         return self.web_adapter.create_json_response(status=200, payload={})
@@ -7,8 +7,14 @@ from maxo.routing.signals import (
     BeforeShutdown,
     BeforeStartup,
 )
+from maxo.transport.queue.base import BaseUpdateQueue
 from maxo.transport.webhook.adapters.base_adapter import BoundRequest, WebAdapter
-from maxo.transport.webhook.engines.base import WebhookEngine
+from maxo.transport.webhook.engines.base import (
+    DEFAULT_MAX_BODY_SIZE,
+    DEFAULT_SHUTDOWN_TIMEOUT,
+    WebhookEngine,
+)
+from maxo.transport.webhook.engines.task_pool import BackgroundTaskPool
 from maxo.transport.webhook.routing.base import BaseRouting
 from maxo.transport.webhook.security.security import Security
 
@@ -30,6 +36,10 @@ class SimpleEngine(WebhookEngine):
         routing: BaseRouting,
         security: Security | None = None,
         handle_in_background: bool = True,
+        max_body_size: int | None = DEFAULT_MAX_BODY_SIZE,
+        task_pool: BackgroundTaskPool | None = None,
+        shutdown_timeout: float | None = DEFAULT_SHUTDOWN_TIMEOUT,
+        update_queue: BaseUpdateQueue | None = None,
     ) -> None:
         self.bot = bot
         super().__init__(
@@ -38,6 +48,10 @@ class SimpleEngine(WebhookEngine):
             routing=routing,
             security=security,
             handle_in_background=handle_in_background,
+            max_body_size=max_body_size,
+            task_pool=task_pool,
+            shutdown_timeout=shutdown_timeout,
+            update_queue=update_queue,
         )
 
     def _get_bot_from_request(self, bound_request: BoundRequest[Any]) -> Bot | None:
@@ -81,8 +95,11 @@ class SimpleEngine(WebhookEngine):
         """
         Call on application shutdown.
 
-        Emits dispatcher shutdown event and closes bot session.
+        Drains background tasks, emits dispatcher shutdown event
+        and closes bot session.
         """
+        await self.drain()
+
         workflow_data = self._build_workflow_data(app=app, bot=self.bot, **kwargs)
         self.dispatcher.workflow_data.update(workflow_data)
 
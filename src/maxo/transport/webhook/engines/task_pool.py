@@ -0,0 +1,163 @@
+import asyncio
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from typing import Any
+
+from maxo import loggers
+
+
+@dataclass(slots=True, frozen=True)
+class TaskPoolStats:
+    """Snapshot of the background task pool counters."""
+
+    running: int
+    queued: int
+    accepted: int
+    shed: int
+
+
+@dataclass(slots=True, frozen=True)
+class DrainResult:
+    """Outcome of draining the background task pool."""
+
+    finished: int
+    """Tasks completed before the deadline."""
+    abandoned: int
+    """Tasks cancelled when the deadline passed."""
+
+
+class BackgroundTaskPool:
+    """
+    Bounded pool for webhook updates processed in background.
+
+    At most ``max_concurrency`` tasks run at once and up to ``max_queue_size``
+    more wait for a free slot. When the queue is full, ``submit`` either waits
+    for a slot (``wait_when_full=True``), holding the HTTP response and so
+    applying backpressure to the sender, or sheds the update and returns
+    ``False`` so the engine can answer 503 and let the platform retry later.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 100,
+        max_queue_size: int = 1000,
+        wait_when_full: bool = False,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("`max_concurrency` should be greater than 0")
+        if max_queue_size < 0:
+            raise ValueError("`max_queue_size` should not be negative")
+
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.wait_when_full = wait_when_full
+        self.tasks: set[asyncio.Task[Any]] = set()
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._admission = asyncio.Semaphore(max_concurrency + max_queue_size)
+        self._running = 0
+        self._accepted = 0
+        self._shed = 0
+        self._closed = False
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def queued(self) -> int:
+        return len(self.tasks) - self._running
+
+    @property
+    def accepted(self) -> int:
+        return self._accepted
+
+    @property
+    def shed(self) -> int:
+        return self._shed
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def stats(self) -> TaskPoolStats:
+        return TaskPoolStats(
+            running=self.running,
+            queued=self.queued,
+            accepted=self.accepted,
+            shed=self.shed,
+        )
+
+    async def submit(
+        self,
+        func: Callable[..., Coroutine[Any, Any, Any]],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> bool:
+        """
+        Schedule ``func(*args, **kwargs)`` in the pool.
+
+        The coroutine is created only once the update is admitted.
+
+        :return: ``False`` if the update was shed or the pool is closed.
+        """
+        if self.closed:
+            self._shed += 1
+            return False
+
+        if self._admission.locked() and not self.wait_when_full:
+            self._shed += 1
+            loggers.webhook.warning(
+                "Background task pool is full (running=%d, queued=%d), update is shed",
+                self.running,
+                self.queued,
+            )
+            return False
+
+        await self._admission.acquire()
+        if self._closed:
+            self._admission.release()
+            self._shed += 1
+            return False
+
+        self._accepted += 1
+        task = asyncio.create_task(self._run(func(*args, **kwargs)))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return True
+
+    def close(self) -> None:
+        """Stop accepting new tasks."""
+        self._closed = True
+
+    async def drain(self, timeout: float | None = None) -> DrainResult:
+        """
+        Close the pool and wait for outstanding tasks.
+
+        Tasks still pending after ``timeout`` seconds are cancelled.
+        """
+        self.close()
+        tasks = set(self.tasks)
+        if not tasks:
+            return DrainResult(finished=0, abandoned=0)
+
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+        return DrainResult(finished=len(done), abandoned=len(pending))
+
+    async def _run(self, coro: Coroutine[Any, Any, Any]) -> None:
+        try:
+            async with self._slots:
+                self._running += 1
+                try:
+                    await coro
+                finally:
+                    self._running -= 1
+        except Exception:  # noqa: BLE001
+            loggers.webhook.exception("Background update processing failed")
+        finally:
+            coro.close()
+            self._admission.release()
@@ -0,0 +1,22 @@
+from .broadcaster import BroadcastStats, Broadcaster, DeliveryResult, DeliveryStatus
+from .checkpoint import (
+    BaseCheckpointStore,
+    BroadcastCheckpoint,
+    FileCheckpointStore,
+    MemoryCheckpointStore,
+)
+from .message import BroadcastMessage, BroadcastRecipient, ChatRecipient
+
+__all__ = (
+    "BaseCheckpointStore",
+    "BroadcastCheckpoint",
+    "BroadcastMessage",
+    "BroadcastRecipient",
+    "BroadcastStats",
+    "Broadcaster",
+    "ChatRecipient",
+    "DeliveryResult",
+    "DeliveryStatus",
+    "FileCheckpointStore",
+    "MemoryCheckpointStore",
+)
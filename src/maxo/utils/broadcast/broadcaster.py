@@ -0,0 +1,322 @@
+import asyncio
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Sized
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import ClientError
+from unihttp.exceptions import NetworkError, RequestTimeoutError
+
+from maxo import loggers
+from maxo.backoff import Backoff, BackoffConfig
+from maxo.bot.methods.messages.send_message import SendMessage
+from maxo.bot.middlewares import Priority, TokenBucket, use_priority
+from maxo.bot.middlewares.rate_limit import PLATFORM_RPS_LIMIT
+from maxo.bot.retry import ATTACHMENT_NOT_READY, without_retries
+from maxo.errors import (
+    MaxBotApiError,
+    MaxBotForbiddenError,
+    MaxBotServiceUnavailableError,
+    MaxBotTooManyRequestsError,
+)
+from maxo.utils.broadcast.checkpoint import BaseCheckpointStore, BroadcastCheckpoint
+from maxo.utils.broadcast.message import BroadcastMessage, BroadcastRecipient
+
+if TYPE_CHECKING:
+    from maxo import Bot
+
+DEFAULT_BROADCAST_BACKOFF = BackoffConfig(
+    min_delay=1.0,
+    max_delay=30.0,
+    factor=2.0,
+    jitter=0.1,
+)
+
+_DELIVERY_ERRORS = (MaxBotApiError, NetworkError, RequestTimeoutError, ClientError)
+# После 503 или обрыва соединения сообщение могло уже уйти получателю
+_UNSAFE_RETRY_ERRORS = (
+    MaxBotServiceUnavailableError,
+    NetworkError,
+    RequestTimeoutError,
+    ClientError,
+)
+
+
+class DeliveryStatus(StrEnum):
+    SENT = "sent"
+    BLOCKED = "blocked"
+    """Бот заблокирован получателем или не имеет доступа к чату (403)."""
+    FAILED = "failed"
+
+
+@dataclass(slots=True, frozen=True)
+class DeliveryResult:
+    recipient: BroadcastRecipient
+    status: DeliveryStatus
+    error: Exception | None = None
+
+
+@dataclass(slots=True)
+class BroadcastStats:
+    """Живая статистика рассылки, обновляется после каждого получателя."""
+
+    total: int | None = None
+    """Число получателей, если оно известно."""
+    sent: int = 0
+    blocked: int = 0
+    failed: int = 0
+    resumed_from: int = 0
+    """Сколько получателей было обработано до продолжения рассылки."""
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: float | None = None
+
+    @property
+    def processed(self) -> int:
+        return self.sent + self.blocked + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        end = time.monotonic() if self.finished_at is None else self.finished_at
+        return end - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Получателей в секунду в текущем запуске."""
+        elapsed = self.elapsed
+        if elapsed <= 0:
+            return 0.0
+        return (self.processed - self.resumed_from) / elapsed
+
+    @property
+    def eta(self) -> float | None:
+        """Сколько секунд осталось, если известно ``total``."""
+        if self.total is None:
+            return None
+        remaining = max(self.total - self.processed, 0)
+        if remaining == 0:
+            return 0.0
+        throughput = self.throughput
+        if throughput <= 0:
+            return None
+        return remaining / throughput
+
+
+class Broadcaster:
+    """
+    Рассылает одно сообщение множеству получателей.
+
+    Одновременно отправляется не больше ``max_concurrency`` сообщений и не
+    чаще ``rate`` в секунду; запросы идут с приоритетом
+    ``Priority.BROADCAST``, поэтому ``RateLimiter`` бота пропускает ответы
+    пользователям вперёд. Ответ 429 приостанавливает всю рассылку, 429 и
+    ``attachment.not.ready`` повторяются до ``max_attempts`` раз, 403
+    означает, что получатель заблокировал бота. Ответ 503 и ошибки сети
+    считаются неудачной доставкой: сообщение могло уже уйти, и повтор
+    отправил бы его дважды. ``retry_unsafe=True`` повторяет и их.
+    Повторы клиента на время рассылки отключены: каждая попытка проходит
+    через ограничение ``rate``. Если передать ``store`` и ``key``,
+    прогресс сохраняется каждые ``checkpoint_every`` получателей и при
+    остановке рассылки, и повторный запуск с тем же ключом продолжит её.
+    """
+
+    __slots__ = (
+        "_bucket",
+        "backoff",
+        "bot",
+        "checkpoint_every",
+        "max_attempts",
+        "max_concurrency",
+        "retry_unsafe",
+        "stats",
+        "store",
+    )
+
+    def __init__(
+        self,
+        bot: "Bot",
+        rate: float = PLATFORM_RPS_LIMIT,
+        max_concurrency: int = 10,
+        max_attempts: int = 5,
+        backoff: BackoffConfig = DEFAULT_BROADCAST_BACKOFF,
+        store: BaseCheckpointStore | None = None,
+        checkpoint_every: int = 100,
+        retry_unsafe: bool = False,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("`max_concurrency` should be greater than 0")
+        if max_attempts < 1:
+            raise ValueError("`max_attempts` should be greater than 0")
+
+        self.bot = bot
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.store = store
+        self.checkpoint_every = checkpoint_every
+        self.retry_unsafe = retry_unsafe
+        self.stats: BroadcastStats | None = None
+        self._bucket = TokenBucket(rate)
+
+    async def broadcast(
+        self,
+        recipients: Iterable[BroadcastRecipient] | AsyncIterable[BroadcastRecipient],
+        message: BroadcastMessage,
+        key: str | None = None,
+        total: int | None = None,
+        on_result: Callable[[DeliveryResult], Any] | None = None,
+    ) -> BroadcastStats:
+        if total is None and isinstance(recipients, Sized):
+            total = len(recipients)
+
+        checkpoint = None
+        if self.store is not None and key is not None:
+            checkpoint = await self.store.load(key)
+        if checkpoint is None:
+            checkpoint = BroadcastCheckpoint()
+
+        stats = BroadcastStats(
+            total=total,
+            sent=checkpoint.sent,
+            blocked=checkpoint.blocked,
+            failed=checkpoint.failed,
+            resumed_from=checkpoint.position + len(checkpoint.completed),
+        )
+        self.stats = stats
+        if checkpoint.finished:
+            loggers.utils.info("Broadcast %s is already finished", key)
+            stats.finished_at = stats.started_at
+            return stats
+
+        # Тело сообщения сериализуется один раз на всю рассылку
+        prepared = message.prepare(self.bot)
+        position = checkpoint.position
+        completed = set(checkpoint.completed)
+        items = _enumerate(recipients)
+        read_lock = asyncio.Lock()
+        save_lock = asyncio.Lock()
+        unsaved = 0
+
+        async def save(finished: bool = False) -> None:
+            nonlocal unsaved
+            if self.store is None or key is None:
+                return
+            unsaved = 0
+            snapshot = BroadcastCheckpoint(
+                position=position,
+                completed=sorted(completed),
+                sent=stats.sent,
+                blocked=stats.blocked,
+                failed=stats.failed,
+                finished=finished,
+            )
+            async with save_lock:
+                await self.store.save(key, snapshot)
+
+        async def next_recipient() -> tuple[int, BroadcastRecipient] | None:
+            async with read_lock:
+                async for index, recipient in items:
+                    if index >= position and index not in completed:
+                        return index, recipient
+            return None
+
+        async def worker() -> None:
+            nonlocal position, unsaved
+            while (item := await next_recipient()) is not None:
+                index, recipient = item
+                result = await self._deliver(
+                    recipient,
+                    message.build_prepared(recipient, prepared),
+                )
+                match result.status:
+                    case DeliveryStatus.SENT:
+                        stats.sent += 1
+                    case DeliveryStatus.BLOCKED:
+                        stats.blocked += 1
+                    case DeliveryStatus.FAILED:
+                        stats.failed += 1
+
+                completed.add(index)
+                while position in completed:
+                    completed.remove(position)
+                    position += 1
+
+                if on_result is not None:
+                    on_result(result)
+
+                unsaved += 1
+                if unsaved >= self.checkpoint_every:
+                    await save()
+
+        finished = False
+        try:
+            with use_priority(Priority.BROADCAST), without_retries():
+                async with asyncio.TaskGroup() as tg:
+                    for _ in range(self.max_concurrency):
+                        tg.create_task(worker())
+            finished = True
+        finally:
+            # Прогресс сохраняется и при ошибке или отмене рассылки
+            stats.finished_at = time.monotonic()
+            await save(finished=finished)
+
+        loggers.utils.info(
+            "Broadcast finished: %d sent, %d blocked, %d failed in %.1f seconds",
+            stats.sent,
+            stats.blocked,
+            stats.failed,
+            stats.elapsed,
+        )
+        return stats
+
+    async def _deliver(
+        self,
+        recipient: BroadcastRecipient,
+        method: SendMessage,
+    ) -> DeliveryResult:
+        backoff = Backoff(self.backoff)
+        while True:
+            await self._bucket.acquire(Priority.BROADCAST)
+            try:
+                await self.bot.call_method(method)
+            except MaxBotForbiddenError as e:
+                return DeliveryResult(recipient, DeliveryStatus.BLOCKED, e)
+            except _DELIVERY_ERRORS as e:
+                if isinstance(e, MaxBotTooManyRequestsError):
+                    self._bucket.drain()
+                if (
+                    not self._should_retry(e)
+                    or backoff.counter + 1 >= self.max_attempts
+                ):
+                    return DeliveryResult(recipient, DeliveryStatus.FAILED, e)
+                backoff.next()
+                loggers.utils.warning(
+                    "Broadcast to %s failed with %s, retry in %f seconds",
+                    recipient,
+                    type(e).__name__,
+                    backoff.current_delay,
+                )
+                await backoff.sleep()
+            else:
+                return DeliveryResult(recipient, DeliveryStatus.SENT)
+
+    def _should_retry(self, error: Exception) -> bool:
+        if isinstance(error, MaxBotTooManyRequestsError):
+            return True
+        if isinstance(error, MaxBotApiError) and error.code == ATTACHMENT_NOT_READY:
+            return True
+        return self.retry_unsafe and isinstance(error, _UNSAFE_RETRY_ERRORS)
+
+
+async def _enumerate(
+    recipients: Iterable[BroadcastRecipient] | AsyncIterable[BroadcastRecipient],
+) -> AsyncIterator[tuple[int, BroadcastRecipient]]:
+    index = 0
+    if isinstance(recipients, AsyncIterable):
+        async for recipient in recipients:
+            yield index, recipient
+            index += 1
+    else:
+        for recipient in recipients:
+            yield index, recipient
+            index += 1
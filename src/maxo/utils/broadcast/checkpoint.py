@@ -0,0 +1,36 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from maxo.utils.stores import BaseKeyValueStore, JsonFileStore, MemoryKeyValueStore
+
+
+@dataclass(slots=True)
+class BroadcastCheckpoint:
+    """Прогресс рассылки, которого достаточно, чтобы её продолжить."""
+
+    position: int = 0
+    """Сколько первых получателей уже обработано."""
+    completed: list[int] = field(default_factory=list)
+    """Номера обработанных получателей после ``position``."""
+    sent: int = 0
+    blocked: int = 0
+    failed: int = 0
+    finished: bool = False
+
+
+BaseCheckpointStore = BaseKeyValueStore[BroadcastCheckpoint]
+
+
+class MemoryCheckpointStore(MemoryKeyValueStore[BroadcastCheckpoint]):
+    """Хранит прогресс в памяти: рассылку можно продолжить до перезапуска."""
+
+    __slots__ = ()
+
+
+class FileCheckpointStore(JsonFileStore[BroadcastCheckpoint]):
+    """Хранит прогресс JSON-файлами в каталоге: переживает перезапуск."""
+
+    __slots__ = ()
+
+    def __init__(self, directory: str | Path) -> None:
+        super().__init__(directory, BroadcastCheckpoint)
@@ -0,0 +1,116 @@
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from maxo.bot.methods.messages.send_message import SendMessage
+from maxo.bot.prepared import PreparedMessage, SendPreparedMessage
+from maxo.enums import TextFormat
+from maxo.omit import Omittable, Omitted
+from maxo.types import (
+    Attachments,
+    AttachmentsRequests,
+    InlineButtons,
+    InlineKeyboardAttachmentRequest,
+    InlineKeyboardAttachmentRequestPayload,
+)
+from maxo.utils.formatting import Text
+
+if TYPE_CHECKING:
+    from maxo import Bot
+
+
+@dataclass(slots=True, frozen=True)
+class ChatRecipient:
+    """Получатель рассылки — чат. Число в списке получателей — это ``user_id``."""
+
+    chat_id: int
+
+
+BroadcastRecipient = int | ChatRecipient
+
+
+@dataclass(slots=True, frozen=True)
+class BroadcastMessage:
+    """
+    Сообщение рассылки, одинаковое для всех получателей.
+
+    ``Text`` из :mod:`maxo.utils.formatting` отправляется как HTML.
+    Файлы нужно загрузить заранее и передать в ``attachments`` готовые
+    вложения с токенами, например ``PhotoAttachmentRequest.factory(token=...)``,
+    чтобы не загружать файл для каждого получателя.
+    """
+
+    text: str | Text | None = None
+    format: TextFormat | None = None
+    keyboard: Sequence[Sequence[InlineButtons]] | None = None
+    attachments: Sequence[AttachmentsRequests] = ()
+    notify: Omittable[bool] = field(default_factory=Omitted)
+    disable_link_preview: Omittable[bool] = field(default_factory=Omitted)
+    _text: str | None = field(init=False, repr=False)
+    _format: TextFormat | None = field(init=False, repr=False)
+    _attachments: list[AttachmentsRequests | Attachments] = field(
+        init=False,
+        repr=False,
+    )
+
+    def __post_init__(self) -> None:
+        # Текст и вложения собираются один раз на всю рассылку
+        if isinstance(self.text, Text):
+            object.__setattr__(self, "_text", self.text.as_html())
+            object.__setattr__(self, "_format", TextFormat.HTML)
+        else:
+            object.__setattr__(self, "_text", self.text)
+            object.__setattr__(self, "_format", self.format)
+
+        attachments: list[AttachmentsRequests | Attachments] = list(self.attachments)
+        if self.keyboard is not None:
+            attachments.append(
+                InlineKeyboardAttachmentRequest(
+                    payload=InlineKeyboardAttachmentRequestPayload(
+                        buttons=[list(row) for row in self.keyboard],
+                    ),
+                ),
+            )
+        object.__setattr__(self, "_attachments", attachments)
+
+    def prepare(self, bot: "Bot") -> PreparedMessage:
+        """Сериализует тело сообщения для ``build_prepared``."""
+        return bot.prepare_message(
+            text=self._text,
+            attachments=self._attachments,
+            format=self._format,
+            notify=self.notify,
+        )
+
+    def build(self, recipient: BroadcastRecipient) -> SendMessage:
+        chat_id, user_id = _recipient_params(recipient)
+        return SendMessage(
+            chat_id=chat_id,
+            user_id=user_id,
+            text=self._text,
+            format=self._format,
+            attachments=self._attachments,
+            notify=self.notify,
+            disable_link_preview=self.disable_link_preview,
+        )
+
+    def build_prepared(
+        self,
+        recipient: BroadcastRecipient,
+        prepared: PreparedMessage,
+    ) -> SendPreparedMessage:
+        chat_id, user_id = _recipient_params(recipient)
+        return SendPreparedMessage(
+            chat_id=chat_id,
+            user_id=user_id,
+            disable_link_preview=self.disable_link_preview,
+            prepared=prepared,
+        )
+
+
+def _recipient_params(
+    recipient: BroadcastRecipient,
+) -> tuple[Omittable[int], Omittable[int]]:
+    if isinstance(recipient, ChatRecipient):
+        return recipient.chat_id, Omitted()
+    return Omitted(), recipient
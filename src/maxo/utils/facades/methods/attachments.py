@@ -1,10 +1,11 @@
 import asyncio
-from collections.abc import Sequence
-
-from unihttp.http import UploadFile
+from collections.abc import Awaitable, Callable, Sequence
+from typing import TypeVar
 
 from maxo import loggers
+from maxo.bot.retry import ATTACHMENT_NOT_READY
 from maxo.enums import UploadType
+from maxo.errors import MaxBotBadRequestError
 from maxo.errors.api import RetvalReturnedServerException
 from maxo.omit import is_defined
 from maxo.types import (
@@ -21,7 +22,9 @@ from maxo.types import (
     VideoAttachmentRequest,
 )
 from maxo.utils.facades.methods.bot import BotMethodsFacade
-from maxo.utils.upload_media import InputFile
+from maxo.utils.upload_media import InputFile, streaming_upload_file
+
+_T = TypeVar("_T")
 
 
 class AttachmentsFacade(BotMethodsFacade):
@@ -41,15 +44,49 @@ class AttachmentsFacade(BotMethodsFacade):
             )
 
         if files:
-            # TODO: Исправить костыль со сном, https://github.com/K1rL3s/maxo/issues/10
-            # maxo.errors.api.MaxBotBadRequestError:
-            # ('attachment.not.ready',
-            # 'Key: errors.process.attachment.file.not.processed')
+            # Пока сервер обрабатывает файл, отправка отвечает ``attachment.not.ready``,
+            # такие запросы повторяет ``RetryPolicy`` клиента
             attachments.extend(await self.build_media_attachments(files))
-            await asyncio.sleep(0.5)
 
         return attachments
 
+    async def call_with_attachments(
+        self,
+        call: Callable[[Sequence[AttachmentsRequests]], Awaitable[_T]],
+        keyboard: Sequence[Sequence[InlineButtons]] | None = None,
+        files: Sequence[InputFile] | None = None,
+    ) -> _T:
+        """
+        Собирает вложения и вызывает с ними ``call``.
+
+        Если у бота есть кеш загрузок, а запрос с файлами отклонён (400),
+        взятый из кеша токен мог истечь: файлы удаляются из кеша,
+        загружаются заново, и запрос повторяется один раз.
+        """
+        attachments = await self.build_attachments(
+            base=[],
+            keyboard=keyboard,
+            files=files,
+        )
+        try:
+            return await call(attachments)
+        except MaxBotBadRequestError as e:
+            upload_cache = self.bot.upload_cache
+            if not files or upload_cache is None or e.code == ATTACHMENT_NOT_READY:
+                raise
+            loggers.utils.warning(
+                "Request with cached attachments is rejected (%s), upload files again",
+                e.code,
+            )
+            for file in files:
+                await upload_cache.forget(file)
+        attachments = await self.build_attachments(
+            base=[],
+            keyboard=keyboard,
+            files=files,
+        )
+        return await call(attachments)
+
     async def build_media_attachments(
         self,
         files: Sequence[InputFile],
@@ -74,13 +111,19 @@ class AttachmentsFacade(BotMethodsFacade):
         return attachments
 
     async def upload_media(self, file: InputFile) -> tuple[UploadType, str]:
+        upload_cache = self.bot.upload_cache
+        if upload_cache is None:
+            return await self._upload_media(file)
+        return await upload_cache.upload(file, self._upload_media)
+
+    async def _upload_media(self, file: InputFile) -> tuple[UploadType, str]:
         result: UploadEndpoint = await self.bot.get_upload_url(type=file.type)
 
         upload_result: UploadMediaResult | None
         try:
             upload_result = await self.bot.upload_media(
                 upload_url=result.url,
-                file=UploadFile(file=await file.read(), filename=file.file_name),
+                file=streaming_upload_file(file),
             )
         except RetvalReturnedServerException:
             upload_result = None
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 
+from maxo.bot.methods.messages.answer_on_callback import AnswerOnCallback
 from maxo.omit import Omittable, Omitted
 from maxo.types.callback import Callback
 from maxo.types.new_message_body import NewMessageBody
@@ -23,3 +24,17 @@ class CallbackMethodsFacade(BotMethodsFacade, ABC):
             notification=notification,
             message=message,
         )
+
+    def callback_answer_soon(
+        self,
+        notification: Omittable[str | None] = Omitted(),
+        message: NewMessageBody | None = None,
+    ) -> bool:
+        """Как ``callback_answer``, но не ждёт ответа (``Bot.call_soon``)."""
+        return self.bot.call_soon(
+            AnswerOnCallback(
+                callback_id=self.callback.callback_id,
+                notification=notification,
+                message=message,
+            ),
+        )
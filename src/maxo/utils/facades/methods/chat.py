@@ -2,8 +2,11 @@ from abc import ABC, abstractmethod
 from collections.abc import Sequence
 from datetime import datetime
 
+from maxo.bot.methods.chats.send_action import SendAction
 from maxo.enums import TextFormat
+from maxo.enums.sender_action import SenderAction
 from maxo.omit import Omittable, Omitted
+from maxo.types.attachments import AttachmentsRequests
 from maxo.types.buttons import InlineButtons
 from maxo.types.chat import Chat
 from maxo.types.chat_members_list import ChatMembersList
@@ -31,22 +34,23 @@ class ChatMethodsFacade(AttachmentsFacade, ABC):
         keyboard: Sequence[Sequence[InlineButtons]] | None = None,
         media: Sequence[InputFile] | None = None,
     ) -> Message:
-        attachments = await self.build_attachments(
-            base=[],
-            keyboard=keyboard,
-            files=media,
-        )
+        async def send(attachments: Sequence[AttachmentsRequests]) -> Message:
+            result = await self.bot.send_message(
+                chat_id=self.chat_id,
+                text=text,
+                attachments=attachments,
+                link=link,
+                notify=notify,
+                format=format,
+                disable_link_preview=disable_link_preview,
+            )
+            return result.message
 
-        result = await self.bot.send_message(
-            chat_id=self.chat_id,
-            text=text,
-            attachments=attachments,
-            link=link,
-            notify=notify,
-            format=format,
-            disable_link_preview=disable_link_preview,
-        )
-        return result.message
+        return await self.call_with_attachments(send, keyboard=keyboard, files=media)
+
+    def send_action_soon(self, action: SenderAction = SenderAction.TYPING_ON) -> bool:
+        """Показывает действие бота в чате, не дожидаясь ответа (``Bot.call_soon``)."""
+        return self.bot.call_soon(SendAction(chat_id=self.chat_id, action=action))
 
     async def get_chat(self) -> Chat:
         return await self.bot.get_chat(chat_id=self.chat_id)
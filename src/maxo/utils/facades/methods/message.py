@@ -3,6 +3,7 @@ from collections.abc import Sequence
 
 from maxo.enums import MessageLinkType, TextFormat
 from maxo.omit import Omittable, Omitted
+from maxo.types.attachments import AttachmentsRequests
 from maxo.types.buttons import InlineButtons
 from maxo.types.chat import Chat
 from maxo.types.chat_members_list import ChatMembersList
@@ -45,23 +46,20 @@ class MessageMethodsFacade(AttachmentsFacade, ABC):
             chat_type=recipient.chat_type,
         )
 
-        attachments = await self.build_attachments(
-            base=[],
-            keyboard=keyboard,
-            files=media,
-        )
-
-        result = await self.bot.send_message(
-            chat_id=chat_id,
-            user_id=user_id,
-            text=text,
-            attachments=attachments,
-            link=link,
-            notify=notify,
-            format=format,
-            disable_link_preview=disable_link_preview,
-        )
-        return result.message
+        async def send(attachments: Sequence[AttachmentsRequests]) -> Message:
+            result = await self.bot.send_message(
+                chat_id=chat_id,
+                user_id=user_id,
+                text=text,
+                attachments=attachments,
+                link=link,
+                notify=notify,
+                format=format,
+                disable_link_preview=disable_link_preview,
+            )
+            return result.message
+
+        return await self.call_with_attachments(send, keyboard=keyboard, files=media)
 
     async def answer_text(
         self,
@@ -133,20 +131,17 @@ class MessageMethodsFacade(AttachmentsFacade, ABC):
         if text is None:
             text = self.message.body.text
 
-        attachments = await self.build_attachments(
-            base=[],
-            keyboard=keyboard,
-            files=media,
-        )
-
-        return await self.bot.edit_message(
-            message_id=message_id,
-            text=text,
-            attachments=attachments,
-            link=link,
-            notify=notify,
-            format=format,
-        )
+        async def edit(attachments: Sequence[AttachmentsRequests]) -> Message:
+            return await self.bot.edit_message(
+                message_id=message_id,
+                text=text,
+                attachments=attachments,
+                link=link,
+                notify=notify,
+                format=format,
+            )
+
+        return await self.call_with_attachments(edit, keyboard=keyboard, files=media)
 
     def _make_new_message_link(self, type: MessageLinkType) -> NewMessageLink:
         return NewMessageLink(
@@ -0,0 +1,10 @@
+from .base import MAX_PAGE_SIZE, PrefetchingIterator
+from .chat_members import ChatMembersIterator
+from .chats import ChatsIterator
+
+__all__ = (
+    "MAX_PAGE_SIZE",
+    "ChatMembersIterator",
+    "ChatsIterator",
+    "PrefetchingIterator",
+)
@@ -0,0 +1,108 @@
+import asyncio
+import contextlib
+from abc import abstractmethod
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator, Sequence
+from types import TracebackType
+from typing import Generic, Self, TypeVar
+
+_ItemT = TypeVar("_ItemT")
+
+MAX_PAGE_SIZE = 100
+"""Максимальный ``count`` для постраничных методов Platform API."""
+
+
+class PrefetchingIterator(AsyncIterator[_ItemT], Generic[_ItemT]):
+    """
+    Итератор по постраничному методу API.
+
+    Следующая страница запрашивается в фоне сразу после получения текущей,
+    поэтому пока вызывающий код обрабатывает страницу, запрос уже в пути.
+    Элементы перебираются через ``async for``, целые страницы — через
+    ``batches()``. Если обход прерван раньше конца, фоновый запрос
+    отменяет ``aclose()``, поэтому итератор удобно использовать как
+    ``async with``.
+    """
+
+    __slots__ = ("_buffer", "_finished", "_marker", "_pages", "page_size")
+
+    def __init__(self, page_size: int, marker: int | None = None) -> None:
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"`page_size` should be between 1 and {MAX_PAGE_SIZE}")
+
+        self.page_size = page_size
+        self._marker = marker
+        self._finished = False
+        self._buffer: deque[_ItemT] = deque()
+        self._pages: AsyncGenerator[Sequence[_ItemT], None] | None = None
+
+    @property
+    def marker(self) -> int | None:
+        """
+        Маркер страницы после последней полученной, ``None`` — страниц больше нет.
+
+        Эта страница могла уже запрашиваться в фоне. Элементы последней
+        полученной страницы, ещё не выданные через ``async for``, маркер
+        уже пропускает.
+        """
+        return self._marker
+
+    @abstractmethod
+    async def _fetch_page(
+        self,
+        marker: int | None,
+    ) -> tuple[Sequence[_ItemT], int | None]:
+        """Возвращает элементы страницы и маркер следующей, ``None`` — это последняя."""
+        raise NotImplementedError
+
+    async def batches(self) -> AsyncGenerator[Sequence[_ItemT], None]:
+        """Перебирает непустые страницы целиком."""
+        if self._finished:
+            return
+
+        next_page: asyncio.Task[tuple[Sequence[_ItemT], int | None]] | None
+        next_page = asyncio.create_task(self._fetch_page(self._marker))
+        try:
+            while next_page is not None:
+                items, marker = await next_page
+                self._marker = marker
+                if marker is None:
+                    self._finished = True
+                    next_page = None
+                else:
+                    next_page = asyncio.create_task(self._fetch_page(marker))
+
+                if items:
+                    yield items
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await next_page
+
+    async def aclose(self) -> None:
+        """Отменяет фоновый запрос следующей страницы, если он ещё идёт."""
+        if self._pages is not None:
+            pages, self._pages = self._pages, None
+            await pages.aclose()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> _ItemT:
+        while not self._buffer:
+            if self._pages is None:
+                self._pages = self.batches()
+            self._buffer.extend(await anext(self._pages))
+        return self._buffer.popleft()
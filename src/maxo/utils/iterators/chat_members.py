@@ -1,54 +1,54 @@
-from collections import deque
-from collections.abc import AsyncIterator, Sequence
-from typing import Self, cast
+from collections.abc import Sequence
 
 from maxo.bot.bot import Bot
-from maxo.omit import Omittable, Omitted
+from maxo.omit import Omittable, Omitted, is_defined
 from maxo.types.chat_member import ChatMember
+from maxo.utils.iterators.base import PrefetchingIterator
 
+_DEFAULT_COUNT = 20
 
-class ChatMembersIterator(AsyncIterator[ChatMember]):
-    _marker: Omittable[int | None]
-    _chat_members: deque[ChatMember]
 
-    __slots__ = ("_bot", "_chat_id", "_chat_members", "_count", "_marker", "_user_ids")
+class ChatMembersIterator(PrefetchingIterator[ChatMember]):
+    """
+    Участники группового чата, страницами по ``count`` (до 100) участников.
+
+    С ``user_ids`` возвращаются только эти участники, одной страницей.
+    """
+
+    __slots__ = ("_bot", "_chat_id", "_user_ids")
 
     def __init__(
         self,
         bot: Bot,
         chat_id: int,
         user_ids: Omittable[Sequence[int] | None] = Omitted(),
-        marker: Omittable[int] = Omitted(),
-        count: Omittable[int] = 20,
+        marker: Omittable[int | None] = Omitted(),
+        count: Omittable[int] = _DEFAULT_COUNT,
     ) -> None:
+        super().__init__(
+            page_size=count if is_defined(count) else _DEFAULT_COUNT,
+            marker=marker if is_defined(marker) else None,
+        )
         self._bot = bot
         self._chat_id = chat_id
-
         self._user_ids = user_ids
-        self._marker = marker
-        self._count = count
-
-        self._chat_members = deque()
-
-    def __aiter__(self) -> Self:
-        return self
 
-    async def __anext__(self) -> ChatMember:
-        if self._chat_members:
-            return self._chat_members.popleft()
-
-        while True:
-            result = await self._bot.get_chat_members(
+    async def _fetch_page(
+        self,
+        marker: int | None,
+    ) -> tuple[Sequence[ChatMember], int | None]:
+        user_ids = self._user_ids
+        if is_defined(user_ids) and user_ids is not None:
+            result = await self._bot.get_members(
                 chat_id=self._chat_id,
-                user_ids=self._user_ids,
-                marker=cast("int | Omitted", self._marker),
-                count=self._count,
+                user_ids=list(user_ids),
             )
-            self._marker = result.marker
-
-            if not result.members:
-                raise StopAsyncIteration
-
-            self._chat_members.extend(result.members)
-
-            return self._chat_members.popleft()
+            return result.members, None
+
+        result = await self._bot.get_members(
+            chat_id=self._chat_id,
+            count=self.page_size,
+            marker=Omitted() if marker is None else marker,
+        )
+        next_marker = result.marker if is_defined(result.marker) else None
+        return result.members, next_marker
@@ -1,41 +1,37 @@
-from collections import deque
-from collections.abc import AsyncIterator
-from typing import Self
+from collections.abc import Sequence
 
 from maxo.bot.bot import Bot
-from maxo.omit import Omittable, is_omitted
+from maxo.omit import Omittable, Omitted, is_defined
 from maxo.types.chat import Chat
+from maxo.utils.iterators.base import PrefetchingIterator
 
+_DEFAULT_COUNT = 50
 
-class ChatsIterator(AsyncIterator[Chat]):
-    __slots__ = ("_bot", "_chats", "_count", "_marker")
+
+class ChatsIterator(PrefetchingIterator[Chat]):
+    """Групповые чаты бота, страницами по ``count`` (до 100) чатов."""
+
+    __slots__ = ("_bot",)
 
     def __init__(
         self,
         bot: Bot,
-        count: Omittable[int] = 50,
+        count: Omittable[int] = _DEFAULT_COUNT,
         marker: Omittable[int | None] = None,
     ) -> None:
+        super().__init__(
+            page_size=count if is_defined(count) else _DEFAULT_COUNT,
+            marker=marker if is_defined(marker) else None,
+        )
         self._bot = bot
-        self._count = count
-        self._marker = marker
-
-        self._chats: deque[Chat] = deque()
-
-    def __aiter__(self) -> Self:
-        return self
-
-    async def __anext__(self) -> Chat:
-        if self._chats:
-            return self._chats.popleft()
 
-        while True:
-            result = await self._bot.get_chats(count=self._count, marker=self._marker)
-
-            if result.marker is None or is_omitted(result.marker):
-                raise StopAsyncIteration
-
-            self._chats.extend(result.chats)
-            self._marker = result.marker
-
-            return self._chats.popleft()
+    async def _fetch_page(
+        self,
+        marker: int | None,
+    ) -> tuple[Sequence[Chat], int | None]:
+        result = await self._bot.get_chats(
+            count=self.page_size,
+            marker=Omitted() if marker is None else marker,
+        )
+        next_marker = result.marker if is_defined(result.marker) else None
+        return result.chats, next_marker
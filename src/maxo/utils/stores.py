@@ -0,0 +1,96 @@
+import hashlib
+import json
+from abc import abstractmethod
+from collections.abc import Callable
+from dataclasses import asdict
+from pathlib import Path
+from typing import Protocol, TypeVar
+
+from anyio import open_file, to_thread
+
+from maxo import loggers
+
+_T = TypeVar("_T")
+
+
+class BaseKeyValueStore(Protocol[_T]):
+    """Хранилище состояний по строковому ключу, например прогресса загрузки."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    async def load(self, key: str) -> _T | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def save(self, key: str, value: _T) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryKeyValueStore(BaseKeyValueStore[_T]):
+    """Хранит значения в памяти: они теряются при перезапуске."""
+
+    __slots__ = ("_values",)
+
+    def __init__(self) -> None:
+        self._values: dict[str, _T] = {}
+
+    async def load(self, key: str) -> _T | None:
+        return self._values.get(key)
+
+    async def save(self, key: str, value: _T) -> None:
+        self._values[key] = value
+
+    async def delete(self, key: str) -> None:
+        self._values.pop(key, None)
+
+
+class JsonFileStore(BaseKeyValueStore[_T]):
+    """
+    Хранит dataclass-значения JSON-файлами в каталоге: переживает перезапуск.
+
+    Значение восстанавливается вызовом ``factory(**data)``. Файл
+    записывается во временный и атомарно подменяется, поэтому упавший
+    процесс оставляет предыдущее значение, а не обрезанный файл.
+    """
+
+    __slots__ = ("directory", "factory")
+
+    def __init__(self, directory: str | Path, factory: Callable[..., _T]) -> None:
+        self.directory = Path(directory)
+        self.factory = factory
+
+    async def load(self, key: str) -> _T | None:
+        path = self._path(key)
+        try:
+            async with await open_file(path, "r") as file:
+                raw = json.loads(await file.read())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            loggers.utils.warning("Ignore corrupted store file %s", path)
+            return None
+        return self.factory(**raw)
+
+    async def save(self, key: str, value: _T) -> None:
+        data = json.dumps(asdict(value))  # type: ignore[call-overload]
+        # Запись не прерывается отменой задачи: иначе поток дописывал бы
+        # временный файл одновременно со следующим сохранением
+        await to_thread.run_sync(self._write, self._path(key), data)
+
+    async def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def _write(self, path: Path, data: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(data)
+        tmp_path.replace(path)
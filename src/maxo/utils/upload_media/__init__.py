@@ -1,9 +1,24 @@
 from .base import InputFile
 from .buffered import BufferedInputFile
 from .file_system import FSInputFile
+from .payload import InputFilePayload, streaming_upload_file
+from .resumable import (
+    BaseProgressStore,
+    FileProgressStore,
+    MemoryProgressStore,
+    ResumableUploader,
+    UploadProgress,
+)
 
 __all__ = (
+    "BaseProgressStore",
     "BufferedInputFile",
     "FSInputFile",
+    "FileProgressStore",
     "InputFile",
+    "InputFilePayload",
+    "MemoryProgressStore",
+    "ResumableUploader",
+    "UploadProgress",
+    "streaming_upload_file",
 )
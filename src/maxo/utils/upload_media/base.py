@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 
 from maxo.enums import UploadType
 
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
 
 class InputFile(ABC):
     __slots__ = ()
@@ -16,6 +19,35 @@ class InputFile(ABC):
     def type(self) -> UploadType:
         raise NotImplementedError
 
+    @property
+    def size(self) -> int | None:
+        """Размер файла в байтах, если он известен заранее."""
+        return None
+
     @abstractmethod
     async def read(self) -> bytes:
         raise NotImplementedError
+
+    async def iter_chunks(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """
+        Отдаёт содержимое файла частями не больше ``chunk_size`` байт.
+
+        Реализация по умолчанию читает файл целиком, наследники с большими
+        файлами переопределяют её, чтобы не держать файл в памяти.
+        """
+        data = await self.read()
+        for start in range(0, len(data), chunk_size):
+            yield data[start : start + chunk_size]
+
+    async def read_chunk(self, offset: int, size: int) -> bytes:
+        """
+        Читает ``size`` байт начиная с ``offset``.
+
+        Реализация по умолчанию читает файл целиком, наследники с большими
+        файлами переопределяют её.
+        """
+        data = await self.read()
+        return data[offset : offset + size]
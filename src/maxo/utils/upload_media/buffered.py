@@ -23,6 +23,10 @@ class BufferedInputFile(InputFile):
     def file_name(self) -> str:
         return self._file_name
 
+    @property
+    def size(self) -> int:
+        return len(self._data)
+
     @classmethod
     def image(cls, data: bytes, file_name: str) -> "BufferedInputFile":
         return cls(data=data, file_name=file_name, type=UploadType.IMAGE)
@@ -0,0 +1,8 @@
+from .base import BaseUploadCache, UploadKeyBuilder
+from .memory import MemoryUploadCache
+
+__all__ = (
+    "BaseUploadCache",
+    "MemoryUploadCache",
+    "UploadKeyBuilder",
+)
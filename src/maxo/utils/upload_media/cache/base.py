@@ -0,0 +1,112 @@
+import asyncio
+import hashlib
+import os
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from typing import cast
+
+from cachetools import LRUCache
+
+from maxo.enums import UploadType
+from maxo.utils.upload_media.base import DEFAULT_CHUNK_SIZE, InputFile
+from maxo.utils.upload_media.file_system import FSInputFile
+
+Upload = Callable[[InputFile], Awaitable[tuple[UploadType, str]]]
+
+
+class UploadKeyBuilder:
+    """
+    Строит ключ кеша по содержимому файла: ``<тип>:<sha256>``.
+
+    Одинаковые файлы получают одинаковый ключ независимо от пути и процесса,
+    поэтому токен, загруженный одним экземпляром бота, подходит всем остальным.
+    Хеш файла на диске запоминается по пути, размеру и времени изменения,
+    чтобы не читать файл при каждой отправке.
+    """
+
+    __slots__ = ("_digests",)
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._digests: LRUCache[tuple[str, int, int], str] = LRUCache(maxsize=maxsize)
+
+    async def build(self, file: InputFile) -> str:
+        stat_key = None
+        if isinstance(file, FSInputFile):
+            stat = os.stat(file.path)  # noqa: PTH116
+            stat_key = (os.fspath(file.path), stat.st_size, stat.st_mtime_ns)
+            digest = self._digests.get(stat_key)
+            if digest is not None:
+                return f"{file.type}:{digest}"
+
+        hasher = hashlib.sha256()
+        async for chunk in file.iter_chunks(DEFAULT_CHUNK_SIZE):
+            hasher.update(chunk)
+        digest = hasher.hexdigest()
+
+        if stat_key is not None:
+            self._digests[stat_key] = digest
+        return f"{file.type}:{digest}"
+
+
+class BaseUploadCache(ABC):
+    """
+    Кеш токенов загруженных файлов.
+
+    Наследники реализуют только хранение токенов по ключу. Одновременные
+    загрузки одного файла в рамках процесса объединяются в одну.
+    """
+
+    def __init__(self, key_builder: UploadKeyBuilder | None = None) -> None:
+        self.key_builder = key_builder or UploadKeyBuilder()
+        self._pending: dict[str, asyncio.Future[str]] = {}
+
+    @abstractmethod
+    async def get_token(self, key: str) -> str | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_token(self, key: str, token: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_token(self, key: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def close(self) -> None:
+        raise NotImplementedError
+
+    async def forget(self, file: InputFile) -> None:
+        """Удаляет токен файла из кеша, например если сервер его отверг."""
+        await self.delete_token(await self.key_builder.build(file))
+
+    async def upload(self, file: InputFile, upload: Upload) -> tuple[UploadType, str]:
+        """Возвращает токен из кеша или загружает файл через ``upload``."""
+        key = await self.key_builder.build(file)
+
+        # Проверка и регистрация без ``await`` между ними: иначе
+        # одновременные загрузки одного файла не увидят друг друга
+        pending = self._pending.get(key)
+        if pending is not None:
+            return file.type, await asyncio.shield(pending)
+
+        future = cast(
+            asyncio.Future[str],
+            asyncio.get_running_loop().create_future(),
+        )
+        self._pending[key] = future
+        try:
+            token = await self.get_token(key)
+            if token is None:
+                _, token = await upload(file)
+                await self.set_token(key, token)
+        except BaseException as e:
+            future.set_exception(e)
+            # Ошибку получат ожидающие загрузки, если они есть
+            future.exception()
+            raise
+        else:
+            future.set_result(token)
+        finally:
+            del self._pending[key]
+        return file.type, token
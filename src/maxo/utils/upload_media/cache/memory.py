@@ -0,0 +1,27 @@
+from cachetools import LRUCache
+
+from maxo.utils.upload_media.cache.base import BaseUploadCache, UploadKeyBuilder
+
+
+class MemoryUploadCache(BaseUploadCache):
+    """Хранит токены в памяти процесса, вытесняя самые старые."""
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        key_builder: UploadKeyBuilder | None = None,
+    ) -> None:
+        super().__init__(key_builder=key_builder)
+        self.tokens: LRUCache[str, str] = LRUCache(maxsize=maxsize)
+
+    async def get_token(self, key: str) -> str | None:
+        return self.tokens.get(key)
+
+    async def set_token(self, key: str, token: str) -> None:
+        self.tokens[key] = token
+
+    async def delete_token(self, key: str) -> None:
+        self.tokens.pop(key, None)
+
+    async def close(self) -> None:
+        pass
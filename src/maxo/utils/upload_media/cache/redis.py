@@ -0,0 +1,64 @@
+try:
+    from redis.asyncio import ConnectionPool, Redis
+    from redis.typing import ExpiryT
+except ImportError as e:
+    e.add_note("* Please run `pip install maxo[redis]`")
+    raise
+
+from typing import Any
+
+from maxo.utils.upload_media.cache.base import BaseUploadCache, UploadKeyBuilder
+
+DEFAULT_PREFIX = "maxo:upload"
+
+
+class RedisUploadCache(BaseUploadCache):
+    """
+    Хранит токены в Redis, общем для всех процессов и серверов бота.
+
+    Файл загружается один раз на весь парк: остальные экземпляры берут
+    готовый токен по хешу содержимого.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        prefix: str = DEFAULT_PREFIX,
+        ttl: ExpiryT | None = None,
+        key_builder: UploadKeyBuilder | None = None,
+    ) -> None:
+        super().__init__(key_builder=key_builder)
+        self.redis = redis
+        self.prefix = prefix
+        self.ttl = ttl
+
+    async def get_token(self, key: str) -> str | None:
+        value = await self.redis.get(self._build_key(key))
+        if isinstance(value, bytes):
+            return value.decode("utf-8")
+        return value
+
+    async def set_token(self, key: str, token: str) -> None:
+        await self.redis.set(self._build_key(key), token, ex=self.ttl)
+
+    async def delete_token(self, key: str) -> None:
+        await self.redis.delete(self._build_key(key))
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+    def _build_key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    @classmethod
+    def from_url(
+        cls,
+        url: str,
+        connection_kwargs: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> "RedisUploadCache":
+        if connection_kwargs is None:
+            connection_kwargs = {}
+        pool = ConnectionPool.from_url(url, **connection_kwargs)
+        redis = Redis(connection_pool=pool)
+        return cls(redis=redis, **kwargs)
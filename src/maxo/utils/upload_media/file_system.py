@@ -1,10 +1,11 @@
 import os
+from collections.abc import AsyncIterator
 from pathlib import Path
 
 from anyio import open_file
 
 from maxo.enums import UploadType
-from maxo.utils.upload_media.base import InputFile
+from maxo.utils.upload_media.base import DEFAULT_CHUNK_SIZE, InputFile
 
 
 class FSInputFile(InputFile):
@@ -35,6 +36,10 @@ class FSInputFile(InputFile):
     def file_name(self) -> str:
         return self._file_name
 
+    @property
+    def size(self) -> int:
+        return os.path.getsize(self._path)  # noqa: PTH202
+
     @classmethod
     def image(cls, path: str | Path, file_name: str | None = None) -> "FSInputFile":
         return cls(path=path, file_name=file_name, type=UploadType.IMAGE)
@@ -54,3 +59,16 @@ class FSInputFile(InputFile):
     async def read(self) -> bytes:
         async with await open_file(self._path, "rb") as file:
             return await file.read()
+
+    async def iter_chunks(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        async with await open_file(self._path, "rb") as file:
+            while chunk := await file.read(chunk_size):
+                yield chunk
+
+    async def read_chunk(self, offset: int, size: int) -> bytes:
+        async with await open_file(self._path, "rb") as file:
+            await file.seek(offset)
+            return await file.read(size)
@@ -0,0 +1,61 @@
+from typing import Any, BinaryIO, cast
+
+from aiohttp.abc import AbstractStreamWriter
+from aiohttp.payload import Payload
+from unihttp.http import UploadFile
+
+from maxo.utils.upload_media.base import DEFAULT_CHUNK_SIZE, InputFile
+
+
+class InputFilePayload(Payload):
+    """
+    Тело multipart-части, которое читает ``InputFile`` по частям при отправке.
+
+    В памяти одновременно находится не больше одного чанка. Каждая отправка
+    читает файл заново, поэтому запрос с таким телом можно повторить.
+    """
+
+    _autoclose = True
+
+    def __init__(
+        self,
+        file: InputFile,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **kwargs: Any,
+    ) -> None:
+        kwargs.setdefault("filename", file.file_name)
+        super().__init__(file, **kwargs)
+        self._chunk_size = chunk_size
+        self._size = file.size
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        raise TypeError("Unable to decode a streamed file")
+
+    async def write(self, writer: AbstractStreamWriter) -> None:
+        await self.write_with_length(writer, None)
+
+    async def write_with_length(
+        self,
+        writer: AbstractStreamWriter,
+        content_length: int | None,
+    ) -> None:
+        file: InputFile = self._value
+        remaining = content_length
+        async for chunk in file.iter_chunks(self._chunk_size):
+            if remaining is not None:
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+            await writer.write(chunk)
+            if remaining == 0:
+                return
+
+
+def streaming_upload_file(
+    file: InputFile,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> UploadFile:
+    """Оборачивает ``InputFile`` для ``UploadMedia`` без чтения в память."""
+    # unihttp передаёт содержимое UploadFile в aiohttp.FormData как есть,
+    # а FormData принимает готовый Payload без копирования
+    payload = InputFilePayload(file, chunk_size=chunk_size)
+    return UploadFile(file=cast(BinaryIO, payload), filename=file.file_name)
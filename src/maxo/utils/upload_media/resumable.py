@@ -0,0 +1,298 @@
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import ClientError, ClientResponseError
+
+from maxo import loggers
+from maxo.backoff import Backoff, BackoffConfig
+from maxo.enums import UploadType
+from maxo.omit import is_defined
+from maxo.types import UploadEndpoint, UploadMediaResult
+from maxo.utils.stores import BaseKeyValueStore, JsonFileStore, MemoryKeyValueStore
+from maxo.utils.upload_media.base import InputFile
+from maxo.utils.upload_media.cache.base import UploadKeyBuilder
+from maxo.utils.upload_media.file_system import FSInputFile
+
+if TYPE_CHECKING:
+    from maxo import Bot
+
+DEFAULT_RESUMABLE_CHUNK_SIZE = 8 * 1024 * 1024
+MAX_UPLOAD_SIZE = 4 * 1024 * 1024 * 1024
+
+DEFAULT_CHUNK_BACKOFF = BackoffConfig(
+    min_delay=0.5,
+    max_delay=15.0,
+    factor=2.0,
+    jitter=0.1,
+)
+
+
+@dataclass(slots=True)
+class UploadProgress:
+    """Состояние загрузки, которого достаточно, чтобы её продолжить."""
+
+    url: str
+    token: str | None
+    size: int
+    chunk_size: int
+    uploaded: list[int] = field(default_factory=list)
+    """Номера частей, которые сервер уже принял."""
+
+    @property
+    def chunks(self) -> int:
+        return -(-self.size // self.chunk_size)
+
+    @property
+    def uploaded_bytes(self) -> int:
+        return sum(
+            min(self.chunk_size, self.size - index * self.chunk_size)
+            for index in self.uploaded
+        )
+
+
+BaseProgressStore = BaseKeyValueStore[UploadProgress]
+
+
+class MemoryProgressStore(MemoryKeyValueStore[UploadProgress]):
+    """Хранит прогресс в памяти: загрузку можно продолжить до перезапуска."""
+
+    __slots__ = ()
+
+
+class FileProgressStore(JsonFileStore[UploadProgress]):
+    """Хранит прогресс JSON-файлами в каталоге: переживает перезапуск."""
+
+    __slots__ = ()
+
+    def __init__(self, directory: str | Path) -> None:
+        super().__init__(directory, UploadProgress)
+
+
+class ResumableUploader:
+    """
+    Загружает файл частями в режиме resumable upload.
+
+    Все части, кроме последней, отправляются параллельно (не больше
+    ``max_in_flight`` одновременно), последняя — после них, и её ответ
+    содержит результат загрузки. Каждая часть повторяется до
+    ``max_attempts`` раз с экспоненциальной задержкой. Принятые сервером
+    части сохраняются в ``store``, поэтому после ошибки повторный вызов
+    ``upload`` с тем же ключом продолжит загрузку, а не начнёт её заново.
+    Ответ 4xx не повторяется: сохранённый прогресс сбрасывается, а если URL
+    загрузки истёк при продолжении, загрузка начинается заново с новым URL.
+    """
+
+    __slots__ = (
+        "backoff",
+        "bot",
+        "chunk_size",
+        "chunk_timeout",
+        "max_attempts",
+        "max_in_flight",
+        "store",
+    )
+
+    def __init__(
+        self,
+        bot: "Bot",
+        chunk_size: int = DEFAULT_RESUMABLE_CHUNK_SIZE,
+        max_in_flight: int = 4,
+        max_attempts: int = 5,
+        backoff: BackoffConfig = DEFAULT_CHUNK_BACKOFF,
+        store: BaseProgressStore | None = None,
+        chunk_timeout: float | None = 300.0,
+    ) -> None:
+        if chunk_size <= 0:
+            raise ValueError("`chunk_size` should be greater than 0")
+        if max_in_flight < 1:
+            raise ValueError("`max_in_flight` should be greater than 0")
+        if max_attempts < 1:
+            raise ValueError("`max_attempts` should be greater than 0")
+
+        self.bot = bot
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.store = store or MemoryProgressStore()
+        self.chunk_timeout = chunk_timeout
+
+    async def upload(
+        self,
+        file: InputFile,
+        key: str | None = None,
+        on_progress: Callable[[UploadProgress], Any] | None = None,
+    ) -> tuple[UploadType, str]:
+        """
+        Загружает файл и возвращает его тип и токен для вложения.
+
+        ``key`` определяет, какую сохранённую загрузку продолжить. По умолчанию
+        он строится из пути (для ``FSInputFile``) или хеша содержимого файла.
+        """
+        size = file.size
+        if size is None:
+            raise ValueError("Resumable upload requires a file with known size")
+        if size == 0:
+            raise ValueError("Resumable upload requires a non-empty file")
+        if size > MAX_UPLOAD_SIZE:
+            raise ValueError(f"File is larger than {MAX_UPLOAD_SIZE} bytes")
+        if key is None:
+            key = await _default_key(file, size)
+
+        progress = await self.store.load(key)
+        if progress is None or progress.size != size:
+            progress = await self._start(file, key, size)
+            return await self._upload(file, key, progress, on_progress)
+
+        loggers.utils.info(
+            "Resume upload of %s: %d of %d bytes already uploaded",
+            file.file_name,
+            progress.uploaded_bytes,
+            size,
+        )
+        try:
+            return await self._upload(file, key, progress, on_progress)
+        except ClientResponseError as e:
+            if not _is_rejected(e):
+                raise
+        # Сохранённый URL истёк: загружаем файл заново
+        loggers.utils.warning(
+            "Upload URL of %s is rejected, start upload over",
+            file.file_name,
+        )
+        progress = await self._start(file, key, size)
+        return await self._upload(file, key, progress, on_progress)
+
+    async def _start(self, file: InputFile, key: str, size: int) -> UploadProgress:
+        endpoint: UploadEndpoint = await self.bot.get_upload_url(type=file.type)
+        progress = UploadProgress(
+            url=endpoint.url,
+            token=endpoint.token if is_defined(endpoint.token) else None,
+            size=size,
+            chunk_size=self.chunk_size,
+        )
+        await self.store.save(key, progress)
+        return progress
+
+    async def _upload(
+        self,
+        file: InputFile,
+        key: str,
+        progress: UploadProgress,
+        on_progress: Callable[[UploadProgress], Any] | None,
+    ) -> tuple[UploadType, str]:
+        try:
+            result = await self._upload_chunks(file, key, progress, on_progress)
+        except ClientResponseError as e:
+            if _is_rejected(e):
+                # С этим URL загрузку уже не продолжить
+                await self.store.delete(key)
+            raise
+        await self.store.delete(key)
+        return file.type, self._get_token(progress, result)
+
+    async def _upload_chunks(
+        self,
+        file: InputFile,
+        key: str,
+        progress: UploadProgress,
+        on_progress: Callable[[UploadProgress], Any] | None,
+    ) -> Any:
+        last = progress.chunks - 1
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        lock = asyncio.Lock()
+
+        async def upload_part(index: int) -> None:
+            async with semaphore:
+                await self._upload_chunk(file, progress, index)
+            progress.uploaded.append(index)
+            async with lock:
+                await self.store.save(key, progress)
+            if on_progress is not None:
+                on_progress(progress)
+
+        uploaded = set(progress.uploaded)
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for index in range(last):
+                    if index not in uploaded:
+                        task_group.create_task(upload_part(index))
+        except ExceptionGroup as e:
+            # Остальные части отменены вместе с ещё не записанным прогрессом,
+            # поэтому принятые части сохраняются здесь
+            await self.store.save(key, progress)
+            raise e.exceptions[0] from e
+
+        return await self._upload_chunk(file, progress, last)
+
+    async def _upload_chunk(
+        self,
+        file: InputFile,
+        progress: UploadProgress,
+        index: int,
+    ) -> Any:
+        offset = index * progress.chunk_size
+        data = await file.read_chunk(offset, progress.chunk_size)
+        backoff = Backoff(self.backoff)
+        while True:
+            try:
+                response = await self.bot.state.api_client.upload_chunk(
+                    url=progress.url,
+                    data=data,
+                    offset=offset,
+                    total=progress.size,
+                    file_name=file.file_name,
+                    timeout=self.chunk_timeout,
+                )
+            except (ClientError, TimeoutError) as e:
+                if (
+                    isinstance(e, ClientResponseError) and _is_rejected(e)
+                ) or backoff.counter + 1 >= self.max_attempts:
+                    raise
+                backoff.next()
+                loggers.utils.warning(
+                    "Failed to upload chunk %d of %s - %s: %s, "
+                    "retry in %f seconds (tryings = %d)",
+                    index,
+                    file.file_name,
+                    type(e).__name__,
+                    e,
+                    backoff.current_delay,
+                    backoff.counter,
+                )
+                await backoff.sleep()
+            else:
+                return response.data
+
+    def _get_token(self, progress: UploadProgress, result: Any) -> str:
+        # Для видео и аудио токен выдаётся вместе с URL,
+        # а сервер загрузки отвечает только ``<retval>1</retval>``
+        if progress.token is not None:
+            return progress.token
+        if isinstance(result, dict):
+            upload_result = self.bot.retort.load(result, UploadMediaResult)
+            return upload_result.last_token
+        raise RuntimeError("Could not get upload token")
+
+
+def _is_rejected(error: ClientResponseError) -> bool:
+    """Ответ 4xx: повтор с тем же URL не поможет."""
+    return 400 <= error.status < 500 and error.status not in (  # noqa: PLR2004
+        HTTPStatus.REQUEST_TIMEOUT,
+        HTTPStatus.TOO_MANY_REQUESTS,
+    )
+
+
+async def _default_key(file: InputFile, size: int) -> str:
+    if isinstance(file, FSInputFile):
+        path = Path(file.path).resolve()
+        # Файл, перезаписанный с тем же размером, не должен продолжить
+        # старую загрузку
+        return f"{path}:{size}:{path.stat().st_mtime_ns}"
+    # Разные файлы с одинаковым именем и размером не должны продолжать
+    # загрузку друг друга, поэтому ключ строится по содержимому
+    return await UploadKeyBuilder().build(file)
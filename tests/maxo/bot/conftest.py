@@ -0,0 +1,62 @@
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+import pytest_asyncio
+from unihttp.http import HTTPRequest, HTTPResponse
+
+from maxo.bot.api_client import MaxApiClient
+from maxo.serialization import create_retort
+
+Response = tuple[int, Any]
+
+
+class FakeApiClient(MaxApiClient):
+    """Клиент без сети: отвечает ``responses`` по очереди, последний повторяется."""
+
+    def __init__(
+        self,
+        responses: list[Response],
+        delay: float = 0,
+        **kwargs: Any,
+    ) -> None:
+        retort = create_retort(warming_up=False)
+        super().__init__(
+            token="token",  # noqa: S106
+            request_dumper=retort,
+            response_loader=retort,
+            **kwargs,
+        )
+        self.responses = responses
+        self.delay = delay
+        self.requests: list[HTTPRequest] = []
+
+    async def make_request(self, request: HTTPRequest) -> HTTPResponse:
+        self.requests.append(request)
+        await asyncio.sleep(self.delay)
+        if len(self.responses) > 1:
+            status_code, data = self.responses.pop(0)
+        else:
+            status_code, data = self.responses[0]
+        return HTTPResponse(
+            status_code=status_code,
+            headers={},
+            data=data,
+            cookies={},
+            raw_response=None,
+        )
+
+
+@pytest_asyncio.fixture
+async def make_client() -> AsyncIterator[Callable[..., FakeApiClient]]:
+    clients: list[FakeApiClient] = []
+
+    def factory(*responses: Response, **kwargs: Any) -> FakeApiClient:
+        client = FakeApiClient(list(responses), **kwargs)
+        clients.append(client)
+        return client
+
+    yield factory
+
+    for client in clients:
+        await client.close()
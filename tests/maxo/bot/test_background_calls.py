@@ -0,0 +1,128 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from maxo import Bot
+from maxo.bot.background import BackgroundCalls, BackgroundCallsConfig
+from maxo.bot.methods import SendAction
+from maxo.enums.sender_action import SenderAction
+from maxo.errors import MaxBotForbiddenError
+from maxo.errors.state import StateError
+
+
+class Recorder:
+    def __init__(self, delay: float = 0.01) -> None:
+        self.delay = delay
+        self.calls: list[Any] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, method: Any) -> None:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if method.chat_id < 0:
+                raise MaxBotForbiddenError("403", "chat.denied", "denied")
+            self.calls.append(method)
+        finally:
+            self.active -= 1
+
+
+def typing(chat_id: int) -> SendAction:
+    return SendAction(chat_id=chat_id, action=SenderAction.TYPING_ON)
+
+
+@pytest.mark.asyncio
+async def test_calls_run_in_background_with_bounded_concurrency() -> None:
+    recorder = Recorder()
+    calls = BackgroundCalls(recorder, BackgroundCallsConfig(max_concurrency=2))
+
+    assert all(calls.submit(typing(chat_id)) for chat_id in range(6))
+    assert recorder.calls == []
+    assert calls.pending == 6
+
+    assert await calls.flush()
+    assert [method.chat_id for method in recorder.calls] == list(range(6))
+    assert recorder.max_active == 2
+    assert calls.pending == 0
+    await calls.close()
+
+
+@pytest.mark.asyncio
+async def test_errors_are_logged_and_do_not_stop_workers() -> None:
+    recorder = Recorder()
+    calls = BackgroundCalls(recorder, BackgroundCallsConfig(max_concurrency=1))
+
+    calls.submit(typing(-1))
+    calls.submit(typing(1))
+    await calls.flush()
+
+    assert [method.chat_id for method in recorder.calls] == [1]
+    await calls.close()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_calls() -> None:
+    calls = BackgroundCalls(
+        Recorder(),
+        BackgroundCallsConfig(max_concurrency=1, max_queue_size=1),
+    )
+
+    assert calls.submit(typing(1))
+    assert not calls.submit(typing(2))
+    await calls.close()
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_queue_and_rejects_new_calls() -> None:
+    recorder = Recorder()
+    calls = BackgroundCalls(recorder, BackgroundCallsConfig(max_concurrency=1))
+    calls.submit(typing(1))
+    calls.submit(typing(2))
+
+    await calls.close()
+
+    assert len(recorder.calls) == 2
+    assert not calls.submit(typing(3))
+
+
+@pytest.mark.asyncio
+async def test_close_abandons_calls_after_timeout() -> None:
+    recorder = Recorder(delay=10)
+    calls = BackgroundCalls(
+        recorder,
+        BackgroundCallsConfig(max_concurrency=1, flush_timeout=0.01),
+    )
+    calls.submit(typing(1))
+
+    await calls.close()
+
+    assert recorder.calls == []
+    assert recorder.active == 0
+
+
+def test_bot_call_soon_requires_started_bot() -> None:
+    bot = Bot("token", warming_up=False)
+
+    with pytest.raises(StateError):
+        bot.call_soon(typing(1))
+
+
+@pytest.mark.asyncio
+async def test_failed_start_does_not_leave_background_calls(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def get_my_info(self: Bot) -> Any:
+        raise MaxBotForbiddenError("401", "verify.token", "invalid token")
+
+    monkeypatch.setattr(Bot, "get_my_info", get_my_info)
+    bot = Bot("token", warming_up=False)
+
+    with pytest.raises(MaxBotForbiddenError):
+        await bot.start()
+
+    assert not bot.state.started
+    with pytest.raises(StateError):
+        bot.call_soon(typing(1))
@@ -0,0 +1,127 @@
+import asyncio
+import gc
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from maxo import Bot, loggers
+from maxo.bot.batch import Batch
+from maxo.bot.methods import GetChat, GetPinnedMessage
+from maxo.bot.methods.base import MaxoMethod
+from maxo.errors import MaxBotNotFoundError
+from maxo.errors.state import StateError
+
+
+class BatchBot(Bot):
+    def __init__(self) -> None:
+        super().__init__("token", warming_up=False)
+        self.active = 0
+        self.max_active = 0
+
+    async def call_method(self, method: MaxoMethod[Any]) -> Any:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.active -= 1
+        if isinstance(method, GetPinnedMessage):
+            raise MaxBotNotFoundError("404", "not.found", "Chat not found")
+        return SimpleNamespace(chat_id=method.chat_id)  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_calls_concurrently() -> None:
+    bot = BatchBot()
+
+    async with bot.batch() as batch:
+        calls = [batch.add(GetChat(chat_id=chat_id)) for chat_id in range(5)]
+        assert not calls[0].done
+
+    assert [call.result().chat_id for call in calls] == list(range(5))
+    assert bot.max_active == 5
+
+
+@pytest.mark.asyncio
+async def test_batch_raises_errors_per_call() -> None:
+    bot = BatchBot()
+
+    async with bot.batch() as batch:
+        chat = batch.add(GetChat(chat_id=1))
+        pinned = batch.add(GetPinnedMessage(chat_id=1))
+
+    assert chat.result().chat_id == 1
+    assert isinstance(pinned.error, MaxBotNotFoundError)
+    with pytest.raises(MaxBotNotFoundError):
+        pinned.result()
+
+
+@pytest.mark.asyncio
+async def test_batch_execute_inside_context() -> None:
+    bot = BatchBot()
+
+    async with bot.batch() as batch:
+        first = batch.add(GetChat(chat_id=1))
+        with pytest.raises(StateError):
+            first.result()
+        await batch.execute()
+        assert first.result().chat_id == 1
+        second = batch.add(GetChat(chat_id=2))
+
+    assert second.result().chat_id == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_is_not_executed_on_error() -> None:
+    bot = BatchBot()
+    calls = []
+
+    async def handler() -> None:
+        async with bot.batch() as batch:
+            calls.append(batch.add(GetChat(chat_id=1)))
+            raise ValueError("handler failed")
+
+    with pytest.raises(ValueError, match="handler"):
+        await handler()
+
+    assert not calls[0].done
+    assert bot.max_active == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_limits_concurrency() -> None:
+    bot = BatchBot()
+
+    async with bot.batch(max_concurrency=2) as batch:
+        calls = [batch.add(GetChat(chat_id=chat_id)) for chat_id in range(5)]
+
+    assert [call.result().chat_id for call in calls] == list(range(5))
+    assert bot.max_active == 2
+
+
+def test_batch_rejects_invalid_concurrency() -> None:
+    with pytest.raises(ValueError, match="max_concurrency"):
+        Batch(BatchBot().call_method, max_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_batch_logs_unretrieved_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    errors: list[str] = []
+    monkeypatch.setattr(
+        loggers.bot_session,
+        "error",
+        lambda msg, *args, **_: errors.append(msg % args),
+    )
+    bot = BatchBot()
+
+    async with bot.batch() as batch:
+        batch.add(GetPinnedMessage(chat_id=1))
+        checked = batch.add(GetPinnedMessage(chat_id=2))
+        batch.add(GetChat(chat_id=3))
+    assert checked.error is not None
+    del batch, checked
+    gc.collect()
+
+    assert len(errors) == 1
+    assert "GetPinnedMessage" in errors[0]
@@ -0,0 +1,132 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from maxo.bot.coalescing import CoalescingConfig, _request_key
+from maxo.bot.methods import GetChat, GetUpdates, SendAction
+from maxo.enums.sender_action import SenderAction
+from maxo.serialization import create_retort
+
+CHAT = {
+    "chat_id": 1,
+    "type": "chat",
+    "status": "active",
+    "last_event_time": 0,
+    "participants_count": 1,
+    "is_public": False,
+}
+CHAT_RESPONSE = (200, CHAT)
+
+
+@pytest.mark.asyncio
+async def test_identical_calls_are_coalesced(make_client: Any) -> None:
+    client = make_client(CHAT_RESPONSE, delay=0.01)
+
+    first, second, other = await asyncio.gather(
+        client.call_method(GetChat(chat_id=1)),
+        client.call_method(GetChat(chat_id=1)),
+        client.call_method(GetChat(chat_id=2)),
+    )
+    await client.call_method(GetChat(chat_id=1))
+
+    assert first == second
+    assert first is not second
+    assert other is not first
+    assert len(client.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_request(make_client: Any) -> None:
+    client = make_client(CHAT_RESPONSE, delay=0.01)
+
+    cancelled = asyncio.create_task(client.call_method(GetChat(chat_id=1)))
+    waiting = asyncio.create_task(client.call_method(GetChat(chat_id=1)))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    chat = await waiting
+    assert chat.chat_id == 1
+    assert len(client.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_non_get_and_excluded_methods_are_not_coalesced(make_client: Any) -> None:
+    client = make_client(
+        (200, {"success": True, "updates": [], "marker": None}),
+        delay=0.01,
+    )
+
+    await asyncio.gather(
+        client.call_method(SendAction(chat_id=1, action=SenderAction.TYPING_ON)),
+        client.call_method(SendAction(chat_id=1, action=SenderAction.TYPING_ON)),
+        client.call_method(GetUpdates()),
+        client.call_method(GetUpdates()),
+    )
+
+    assert len(client.requests) == 4
+
+
+@pytest.mark.asyncio
+async def test_response_cache(make_client: Any) -> None:
+    client = make_client(
+        CHAT_RESPONSE,
+        delay=0.01,
+        coalescing=CoalescingConfig(cache_ttl={GetChat: 0.05}),
+    )
+
+    await client.call_method(GetChat(chat_id=1))
+    await client.call_method(GetChat(chat_id=1))
+    assert len(client.requests) == 1
+
+    await asyncio.sleep(0.06)
+    await client.call_method(GetChat(chat_id=1))
+    assert len(client.requests) == 2
+
+    client.coalescer.invalidate(GetChat)
+    await client.call_method(GetChat(chat_id=1))
+    assert len(client.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_disabled(make_client: Any) -> None:
+    client = make_client(
+        CHAT_RESPONSE,
+        delay=0.01,
+        coalescing=CoalescingConfig.disabled(),
+    )
+
+    await asyncio.gather(*(client.call_method(GetChat(chat_id=1)) for _ in range(3)))
+
+    assert len(client.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_callers_get_independent_results(make_client: Any) -> None:
+    client = make_client(
+        CHAT_RESPONSE,
+        delay=0.01,
+        coalescing=CoalescingConfig(cache_ttl={GetChat: 60}),
+    )
+
+    first, second = await asyncio.gather(
+        client.call_method(GetChat(chat_id=1)),
+        client.call_method(GetChat(chat_id=1)),
+    )
+    first.title = "changed"
+    cached = await client.call_method(GetChat(chat_id=1))
+    cached.title = "changed again"
+
+    assert second.title is None
+    assert (await client.call_method(GetChat(chat_id=1))).title is None
+    assert len(client.requests) == 1
+
+
+def test_key_is_built_from_request() -> None:
+    retort = create_retort(warming_up=False)
+
+    def key(method: GetChat) -> str:
+        return _request_key(method.build_http_request(retort))
+
+    assert key(GetChat(chat_id=1)) == key(GetChat(chat_id=1))
+    assert key(GetChat(chat_id=1)) != key(GetChat(chat_id=2))
@@ -0,0 +1,195 @@
+import asyncio
+import io
+import os
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from maxo.bot.api_client import MaxApiClient
+from maxo.bot.downloads import DownloadRequest, DownloadResult
+from maxo.serialization import create_retort
+
+CONTENT = bytes(range(256)) * 100
+
+
+class FileServer:
+    def __init__(self) -> None:
+        self.active = 0
+        self.max_active = 0
+
+    async def file(self, request: web.Request) -> web.Response:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.active -= 1
+        size = int(request.match_info["size"])
+        return web.Response(body=CONTENT[:size])
+
+
+@pytest_asyncio.fixture
+async def server() -> AsyncIterator[tuple[TestServer, FileServer]]:
+    file_server = FileServer()
+    app = web.Application()
+    app.router.add_get("/files/{size}", file_server.file)
+    async with TestServer(app) as test_server:
+        yield test_server, file_server
+
+
+@pytest_asyncio.fixture
+async def client() -> AsyncIterator[MaxApiClient]:
+    retort = create_retort(warming_up=False)
+    api_client = MaxApiClient(
+        token="token",  # noqa: S106
+        request_dumper=retort,
+        response_loader=retort,
+    )
+    yield api_client
+    await api_client.close()
+
+
+@pytest.mark.asyncio
+async def test_download_many_is_bounded(
+    server: tuple[TestServer, FileServer],
+    client: MaxApiClient,
+) -> None:
+    test_server, file_server = server
+    urls = [str(test_server.make_url(f"/files/{100 * i}")) for i in range(1, 21)]
+    received: list[DownloadResult] = []
+
+    report = await client.download_many(urls, concurrency=3, on_result=received.append)
+
+    assert file_server.max_active == 3
+    assert len(received) == 20
+    assert [result.size for result in report.results] == [100 * i for i in range(1, 21)]
+    assert report.results[4].file is not None
+    assert report.results[4].file.read() == CONTENT[:500]
+    assert report.size == sum(100 * i for i in range(1, 21))
+    assert report.throughput > 0
+
+
+@pytest.mark.asyncio
+async def test_download_into_buffer(
+    server: tuple[TestServer, FileServer],
+    client: MaxApiClient,
+) -> None:
+    test_server, _ = server
+    buffer = bytearray(2000)
+    requests = [
+        DownloadRequest(
+            url=str(test_server.make_url("/files/1000")),
+            destination=buffer,
+            offset=offset,
+        )
+        for offset in (0, 1000)
+    ]
+
+    report = await client.download_many(requests)
+
+    assert not report.failed
+    assert buffer == CONTENT[:1000] * 2
+
+
+@pytest.mark.asyncio
+async def test_download_into_file_descriptor(
+    tmp_path: Path,
+    server: tuple[TestServer, FileServer],
+    client: MaxApiClient,
+) -> None:
+    test_server, _ = server
+    path = tmp_path / "file.bin"
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT)
+    try:
+        await client.download(
+            str(test_server.make_url("/files/3000")),
+            destination=fd,
+            offset=10,
+            chunk_size=1024,
+        )
+    finally:
+        os.close(fd)
+
+    assert path.read_bytes() == b"\0" * 10 + CONTENT[:3000]
+
+
+@pytest.mark.asyncio
+async def test_failed_download_does_not_stop_others(
+    server: tuple[TestServer, FileServer],
+    client: MaxApiClient,
+) -> None:
+    test_server, _ = server
+    destination = io.BytesIO()
+    requests = [
+        DownloadRequest(url=str(test_server.make_url("/missing"))),
+        DownloadRequest(
+            url=str(test_server.make_url("/files/100")),
+            destination=bytearray(10),
+        ),
+        DownloadRequest(
+            url=str(test_server.make_url("/files/100")),
+            destination=destination,
+        ),
+    ]
+
+    report = await client.download_many(requests)
+
+    assert [result.ok for result in report.results] == [False, False, True]
+    assert isinstance(report.results[1].error, ValueError)
+    assert destination.getvalue() == CONTENT[:100]
+
+
+@pytest.mark.asyncio
+async def test_failed_callback_does_not_stop_others(
+    server: tuple[TestServer, FileServer],
+    client: MaxApiClient,
+) -> None:
+    test_server, _ = server
+    urls = [str(test_server.make_url(f"/files/{100 * i}")) for i in range(1, 6)]
+    received: list[DownloadResult] = []
+
+    def on_result(result: DownloadResult) -> None:
+        received.append(result)
+        if len(received) == 1:
+            raise RuntimeError("callback failed")
+
+    report = await client.download_many(urls, concurrency=2, on_result=on_result)
+
+    assert len(received) == 5
+    assert all(result.ok for result in report.results)
+
+
+@pytest.mark.asyncio
+async def test_file_descriptor_writes_are_batched(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    server: tuple[TestServer, FileServer],
+    client: MaxApiClient,
+) -> None:
+    test_server, _ = server
+    writes: list[int] = []
+    pwrite = os.pwrite
+
+    def counting_pwrite(fd: int, data: Any, offset: int) -> int:
+        writes.append(len(data))
+        return pwrite(fd, data, offset)
+
+    monkeypatch.setattr(os, "pwrite", counting_pwrite)
+    path = tmp_path / "file.bin"
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT)
+    try:
+        await client.download(
+            str(test_server.make_url("/files/25600")),
+            destination=fd,
+            chunk_size=256,
+        )
+    finally:
+        os.close(fd)
+
+    assert writes == [25600]
+    assert path.read_bytes() == CONTENT
@@ -0,0 +1,118 @@
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from maxo import Bot
+from maxo.bot.api_client import MaxApiClient
+from maxo.bot.methods import EditMessage, SendMessage
+from maxo.bot.prepared import EditPreparedMessage, SendPreparedMessage
+from maxo.bot.retry import ATTACHMENT_RETRY_RULE, RetryPolicy
+from maxo.enums import TextFormat
+from maxo.types import CallbackButton, InlineKeyboardAttachmentRequest
+from maxo.types.inline_keyboard_attachment_request_payload import (
+    InlineKeyboardAttachmentRequestPayload,
+)
+
+MESSAGE = {
+    "recipient": {"chat_type": "dialog", "user_id": 1},
+    "timestamp": 0,
+    "body": {"mid": "mid", "seq": 1},
+}
+
+KEYBOARD = InlineKeyboardAttachmentRequest(
+    payload=InlineKeyboardAttachmentRequestPayload(
+        buttons=[[CallbackButton(text="Ok", payload="ok")]],
+    ),
+)
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, dict[str, str], bytes]] = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests.append(
+            (request.method, dict(request.query), await request.read()),
+        )
+        if request.method == "POST":
+            return web.json_response({"message": MESSAGE})
+        return web.json_response({"success": True})
+
+
+@pytest_asyncio.fixture
+async def client() -> AsyncIterator[tuple[MaxApiClient, Recorder, Bot]]:
+    recorder = Recorder()
+    app = web.Application()
+    app.router.add_route("*", "/messages", recorder.handle)
+    bot = Bot("token", warming_up=False)
+    async with TestServer(app) as server:
+        api_client = MaxApiClient(
+            token="token",  # noqa: S106
+            request_dumper=bot.retort,
+            response_loader=bot.retort,
+            base_url=str(server.make_url("/")),
+        )
+        yield api_client, recorder, bot
+        await api_client.close()
+
+
+@pytest.mark.asyncio
+async def test_prepared_message_sends_same_request(
+    client: tuple[MaxApiClient, Recorder, Bot],
+) -> None:
+    api_client, recorder, bot = client
+    params: dict[str, Any] = {
+        "text": "<b>hi</b>",
+        "format": TextFormat.HTML,
+        "attachments": [KEYBOARD],
+        "notify": False,
+    }
+    prepared = bot.prepare_message(**params)
+
+    await api_client.call_method(
+        SendMessage(user_id=1, disable_link_preview=True, **params),
+    )
+    result = await api_client.call_method(
+        SendPreparedMessage(user_id=1, disable_link_preview=True, prepared=prepared),
+    )
+
+    assert result.message.body.mid == "mid"
+    assert recorder.requests[0] == recorder.requests[1]
+    assert recorder.requests[1][1] == {"user_id": "1", "disable_link_preview": "1"}
+
+
+@pytest.mark.asyncio
+async def test_prepared_message_is_reused(
+    client: tuple[MaxApiClient, Recorder, Bot],
+) -> None:
+    api_client, recorder, bot = client
+    prepared = bot.prepare_message(text="news")
+
+    for chat_id in (1, 2):
+        await api_client.call_method(
+            SendPreparedMessage(chat_id=chat_id, prepared=prepared),
+        )
+    await api_client.call_method(
+        EditPreparedMessage(message_id="mid", prepared=prepared),
+    )
+    await api_client.call_method(EditMessage(message_id="mid", text="news"))
+
+    assert [query for _, query, _ in recorder.requests] == [
+        {"chat_id": "1"},
+        {"chat_id": "2"},
+        {"message_id": "mid"},
+        {"message_id": "mid"},
+    ]
+    assert {body for _, _, body in recorder.requests} == {prepared.data}
+    assert recorder.requests[2][0] == "PUT"
+
+
+def test_prepared_methods_inherit_retry_rules() -> None:
+    policy = RetryPolicy()
+
+    assert policy.get_rule(SendPreparedMessage) is ATTACHMENT_RETRY_RULE
+    assert policy.get_rule(EditPreparedMessage) is ATTACHMENT_RETRY_RULE
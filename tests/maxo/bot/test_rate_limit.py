@@ -0,0 +1,140 @@
+import asyncio
+from typing import Any
+
+import pytest
+from unihttp.http import HTTPRequest, HTTPResponse
+
+from maxo.bot.middlewares import Priority, RateLimiter, TokenBucket, use_priority
+
+
+def make_request(
+    url: str = "messages",
+    method: str = "post",
+    **query: Any,
+) -> HTTPRequest:
+    return HTTPRequest(
+        url=url,
+        method=method,
+        header={},
+        path={},
+        query=query,
+        body={},
+        file={},
+        form={},
+    )
+
+
+def make_handler(
+    status_code: int = 200,
+    data: Any = None,
+) -> tuple[list[HTTPRequest], Any]:
+    sent: list[HTTPRequest] = []
+
+    async def handler(request: HTTPRequest) -> HTTPResponse:
+        sent.append(request)
+        return HTTPResponse(
+            status_code=status_code,
+            headers={},
+            data={} if data is None else data,
+            cookies={},
+            raw_response=None,
+        )
+
+    return sent, handler
+
+
+@pytest.mark.asyncio
+async def test_bucket_paces_requests() -> None:
+    bucket = TokenBucket(rate=100, capacity=1)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    for _ in range(6):
+        await bucket.acquire()
+
+    assert loop.time() - started >= 0.045
+
+
+@pytest.mark.asyncio
+async def test_bucket_serves_higher_priority_first() -> None:
+    bucket = TokenBucket(rate=100, capacity=1)
+    await bucket.acquire()
+    order: list[str] = []
+
+    async def acquire(name: str, priority: Priority) -> None:
+        await bucket.acquire(priority)
+        order.append(name)
+
+    broadcast = asyncio.create_task(acquire("broadcast", Priority.BROADCAST))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(acquire("interactive", Priority.INTERACTIVE))
+    await asyncio.sleep(0)
+    assert bucket.waiting == 2
+
+    await asyncio.gather(broadcast, interactive)
+    assert order == ["interactive", "broadcast"]
+
+
+@pytest.mark.asyncio
+async def test_limiter_uses_context_priority() -> None:
+    limiter = RateLimiter(rate=100, capacity=1)
+    sent, handler = make_handler()
+    await limiter.handle(make_request(user_id=0), handler)
+
+    async def send(user_id: int, priority: Priority) -> None:
+        with use_priority(priority):
+            await limiter.handle(make_request(user_id=user_id), handler)
+
+    await asyncio.gather(
+        send(1, Priority.BROADCAST),
+        send(2, Priority.BROADCAST),
+        send(3, Priority.INTERACTIVE),
+    )
+    assert [r.query["user_id"] for r in sent] == [0, 3, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_limiter_per_chat() -> None:
+    limiter = RateLimiter(rate=1000, chat_rate=20, chat_capacity=1)
+    sent, handler = make_handler()
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    await asyncio.gather(
+        limiter.handle(make_request(chat_id=1), handler),
+        limiter.handle(make_request(chat_id=2), handler),
+    )
+    assert loop.time() - started < 0.04
+
+    await limiter.handle(make_request(chat_id=1), handler)
+    assert loop.time() - started >= 0.04
+    assert len(sent) == 3
+
+
+@pytest.mark.asyncio
+async def test_limiter_per_chat_covers_edits() -> None:
+    limiter = RateLimiter(rate=1000, chat_rate=20, chat_capacity=1)
+    sent, handler = make_handler(data={"message": {"body": {"mid": "mid.1"}}})
+    loop = asyncio.get_running_loop()
+
+    await limiter.handle(make_request(chat_id=1), handler)
+    started = loop.time()
+    await limiter.handle(make_request(method="put", message_id="mid.2"), handler)
+    assert loop.time() - started < 0.04
+
+    await limiter.handle(make_request(method="put", message_id="mid.1"), handler)
+    assert loop.time() - started >= 0.04
+    assert len(sent) == 3
+
+
+@pytest.mark.asyncio
+async def test_limiter_skips_upload_hosts() -> None:
+    limiter = RateLimiter(rate=1, capacity=1)
+    sent, handler = make_handler()
+
+    await limiter.handle(make_request(), handler)
+    await asyncio.wait_for(
+        limiter.handle(make_request("https://upload.example/x"), handler),
+        timeout=0.1,
+    )
+    assert len(sent) == 2
@@ -0,0 +1,137 @@
+from dataclasses import replace
+from typing import Any
+
+import pytest
+
+from maxo.backoff import BackoffConfig
+from maxo.bot.methods import DeleteMessage, EditMessage, SendMessage
+from maxo.bot.retry import (
+    ATTACHMENT_NOT_READY,
+    ATTACHMENT_RETRY_RULE,
+    RetryPolicy,
+    RetryRule,
+    without_retries,
+)
+from maxo.errors import (
+    MaxBotBadRequestError,
+    MaxBotServiceUnavailableError,
+    MaxBotTooManyRequestsError,
+)
+
+FAST_BACKOFF = BackoffConfig(min_delay=0.001, max_delay=0.01, factor=2, jitter=0)
+
+
+def fast_policy() -> RetryPolicy:
+    default = RetryRule(backoff=FAST_BACKOFF, max_attempts=3)
+    attachments = RetryRule(
+        backoff=FAST_BACKOFF,
+        max_attempts=3,
+        retry_codes=frozenset({ATTACHMENT_NOT_READY}),
+    )
+    return RetryPolicy(
+        default=default,
+        rules={SendMessage: attachments, EditMessage: attachments},
+    )
+
+
+NOT_READY = (400, {"code": ATTACHMENT_NOT_READY, "message": "not processed"})
+TOO_MANY = (429, {"code": "too.many.requests", "message": "slow down"})
+OK = (200, {"success": True})
+
+
+def test_policy_looks_up_rules_by_mro() -> None:
+    rule = RetryRule(max_attempts=2)
+    policy = RetryPolicy(rules={SendMessage: rule})
+
+    class CustomSendMessage(SendMessage): ...
+
+    assert policy.get_rule(CustomSendMessage) is rule
+    assert policy.get_rule(DeleteMessage) is policy.default
+
+
+def test_rule_rejects_zero_attempts() -> None:
+    with pytest.raises(ValueError, match="max_attempts"):
+        RetryRule(max_attempts=0)
+
+
+@pytest.mark.asyncio
+async def test_retries_too_many_requests(make_client: Any) -> None:
+    client = make_client(TOO_MANY, TOO_MANY, OK, retry_policy=fast_policy())
+
+    await client.call_method(DeleteMessage(message_id="mid"))
+
+    assert len(client.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_attempts(make_client: Any) -> None:
+    client = make_client(TOO_MANY, TOO_MANY, TOO_MANY, retry_policy=fast_policy())
+
+    with pytest.raises(MaxBotTooManyRequestsError):
+        await client.call_method(DeleteMessage(message_id="mid"))
+
+    assert len(client.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_retries_attachment_not_ready(make_client: Any) -> None:
+    client = make_client(NOT_READY, NOT_READY, OK, retry_policy=fast_policy())
+
+    await client.call_method(EditMessage(message_id="mid", text="hi"))
+
+    assert len(client.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_attachment_not_ready_is_not_retried_by_default(make_client: Any) -> None:
+    client = make_client(NOT_READY, NOT_READY, retry_policy=fast_policy())
+
+    with pytest.raises(MaxBotBadRequestError):
+        await client.call_method(DeleteMessage(message_id="mid"))
+
+    assert len(client.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_does_not_retry_other_bad_requests(make_client: Any) -> None:
+    bad_request = (400, {"code": "proto.payload", "message": "bad"})
+    client = make_client(bad_request, OK, retry_policy=fast_policy())
+
+    with pytest.raises(MaxBotBadRequestError):
+        await client.call_method(SendMessage(chat_id=1, text="hi"))
+
+    assert len(client.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_disabled_policy(make_client: Any) -> None:
+    client = make_client(TOO_MANY, OK, retry_policy=RetryPolicy.disabled())
+
+    with pytest.raises(MaxBotTooManyRequestsError):
+        await client.call_method(DeleteMessage(message_id="mid"))
+
+    assert len(client.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_send_message_is_retried_only_when_rejected(make_client: Any) -> None:
+    unavailable = (503, {"code": "service.unavailable", "message": "down"})
+    rule = replace(ATTACHMENT_RETRY_RULE, backoff=FAST_BACKOFF)
+    policy = RetryPolicy(rules={SendMessage: rule})
+    client = make_client(TOO_MANY, unavailable, OK, retry_policy=policy)
+
+    with pytest.raises(MaxBotServiceUnavailableError):
+        await client.call_method(SendMessage(chat_id=1, text="hi"))
+
+    assert len(client.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_without_retries(make_client: Any) -> None:
+    client = make_client(TOO_MANY, OK, retry_policy=fast_policy())
+
+    with without_retries(), pytest.raises(MaxBotTooManyRequestsError):
+        await client.call_method(DeleteMessage(message_id="mid"))
+    await client.call_method(DeleteMessage(message_id="mid"))
+
+    assert len(client.requests) == 2
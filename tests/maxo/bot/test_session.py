@@ -0,0 +1,119 @@
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+from unihttp.exceptions import RequestTimeoutError
+
+from maxo.bot.api_client import MaxApiClient
+from maxo.bot.methods import GetChat, GetUpdates
+from maxo.bot.session import SessionConfig
+from maxo.serialization import create_retort
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.authorization: list[str | None] = []
+        self.peers: set[Any] = set()
+        self.delay = 0.0
+
+    async def api(self, request: web.Request) -> web.Response:
+        self.authorization.append(request.headers.get("Authorization"))
+        self.peers.add(request.transport.get_extra_info("peername"))  # type: ignore[union-attr]
+        await asyncio.sleep(self.delay)
+        return web.json_response({"updates": [], "marker": None})
+
+    async def ping(self, request: web.Request) -> web.Response:
+        self.peers.add(request.transport.get_extra_info("peername"))  # type: ignore[union-attr]
+        await asyncio.sleep(0.05)
+        return web.json_response({"message": "Not found"}, status=404)
+
+
+@pytest_asyncio.fixture
+async def server() -> AsyncIterator[tuple[TestServer, Recorder]]:
+    recorder = Recorder()
+    app = web.Application()
+    app.router.add_get("/", recorder.ping)
+    app.router.add_get("/{path:.*}", recorder.api)
+    async with TestServer(app) as test_server:
+        yield test_server, recorder
+
+
+def make_client(
+    test_server: TestServer,
+    token: str,
+    **kwargs: Any,
+) -> MaxApiClient:
+    retort = create_retort(warming_up=False)
+    return MaxApiClient(
+        token=token,
+        request_dumper=retort,
+        response_loader=retort,
+        base_url=str(test_server.make_url("/")),
+        **kwargs,
+    )
+
+
+def test_timeouts_are_looked_up_by_method_class() -> None:
+    config = SessionConfig(timeout=5, method_timeouts={GetUpdates: None})
+
+    class CustomGetUpdates(GetUpdates): ...
+
+    assert config.get_timeout(CustomGetUpdates) is None
+    assert config.get_timeout(GetChat) == 5
+
+
+def test_preconnect_is_limited_by_pool() -> None:
+    with pytest.raises(ValueError, match="preconnect"):
+        SessionConfig(limit=2, preconnect=3)
+
+
+@pytest.mark.asyncio
+async def test_method_timeout(server: tuple[TestServer, Recorder]) -> None:
+    test_server, recorder = server
+    recorder.delay = 0.2
+    config = SessionConfig(timeout=0.05, method_timeouts={GetUpdates: 1})
+    client = make_client(test_server, "token", session_config=config)
+
+    try:
+        await client.call_method(GetUpdates(timeout=0))
+        with pytest.raises(RequestTimeoutError):
+            await client.call_method(GetChat(chat_id=1))
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_session(server: tuple[TestServer, Recorder]) -> None:
+    test_server, recorder = server
+    session = ClientSession()
+    first = make_client(test_server, "first", session=session)
+    second = make_client(test_server, "second", session=session)
+
+    try:
+        await first.call_method(GetUpdates())
+        await second.call_method(GetUpdates())
+        await first.close()
+
+        assert not session.closed
+        assert recorder.authorization == ["first", "second"]
+    finally:
+        await session.close()
+
+
+@pytest.mark.asyncio
+async def test_preconnect_fills_pool(server: tuple[TestServer, Recorder]) -> None:
+    test_server, recorder = server
+    client = make_client(test_server, "token")
+
+    try:
+        assert await client.preconnect(3) == 3
+        assert len(recorder.peers) == 3
+
+        await asyncio.gather(*(client.call_method(GetUpdates()) for _ in range(3)))
+        assert len(recorder.peers) == 3
+    finally:
+        await client.close()
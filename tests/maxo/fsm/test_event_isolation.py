@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from maxo.fsm.key_builder import StorageKey
+from maxo.fsm.storages.memory import FairEventIsolation
+
+
+@pytest.mark.asyncio
+async def test_fair_isolation_serializes_same_key() -> None:
+    isolation = FairEventIsolation()
+    key = StorageKey(bot_id=1, chat_id=2, user_id=3)
+    order: list[int] = []
+    release = asyncio.Event()
+
+    async def worker(n: int) -> None:
+        async with isolation.lock(key):
+            order.append(n)
+            await release.wait()
+
+    tasks = [asyncio.create_task(worker(n)) for n in range(3)]
+    await asyncio.sleep(0.01)
+    assert order == [0]
+    assert isolation.queue_length(key) == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert order == [0, 1, 2]
+    assert isolation.queue_length(key) == 0
+    assert not isolation._entries
+
+    stats = isolation.stats(key)
+    assert stats is not None
+    assert stats.contended == 2
+    assert stats.waiting == 0
+    assert stats.max_wait > 0
+    assert isolation.hot_keys() == [(key, stats)]
+
+
+@pytest.mark.asyncio
+async def test_fair_isolation_independent_keys() -> None:
+    isolation = FairEventIsolation()
+    key = StorageKey(bot_id=1, chat_id=2, user_id=3)
+    other = StorageKey(bot_id=1, chat_id=2, user_id=3, destiny="other")
+
+    async with isolation.lock(key), isolation.lock(other):
+        assert isolation.queue_length(key) == 0
+        assert isolation.queue_length(other) == 0
+
+    assert isolation.stats(key) is None
+    assert isolation.hot_keys() == []
+
+
+@pytest.mark.asyncio
+async def test_fair_isolation_survives_close() -> None:
+    isolation = FairEventIsolation()
+    key = StorageKey(bot_id=1, chat_id=2, user_id=3)
+
+    async with isolation.lock(key):
+        await isolation.close()
+    assert not isolation._entries
+
+    old = isolation.lock(key)
+    await old.__aenter__()
+    await isolation.close()
+    async with isolation.lock(key):
+        await old.__aexit__(None, None, None)
+        # Блокировка, взятая после ``close()``, остаётся на месте
+        assert key in isolation._entries
+    assert not isolation._entries
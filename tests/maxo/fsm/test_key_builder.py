@@ -0,0 +1,83 @@
+import pytest
+
+from maxo.fsm.key_builder import (
+    BuiltKeys,
+    CachedKeyBuilder,
+    DefaultKeyBuilder,
+    StorageKey,
+    StorageKeyType,
+)
+
+
+def test_cached_key_builder_matches_inner() -> None:
+    inner = DefaultKeyBuilder(with_bot_id=True, with_destiny=True)
+    builder = CachedKeyBuilder(inner)
+    key = StorageKey(bot_id=1, chat_id=2, user_id=3, destiny="aiogd:stack:x")
+
+    for type_ in StorageKeyType:
+        assert builder.build(key, type_) == inner.build(key, type_)
+        assert builder.build_bytes(key, type_) == inner.build(key, type_).encode()
+    assert builder.build(key) == inner.build(key)
+    assert builder.build_keys(key) == BuiltKeys(
+        data="fsm:2:3:1:aiogd:stack:x:data",
+        state="fsm:2:3:1:aiogd:stack:x:state",
+        lock="fsm:2:3:1:aiogd:stack:x:lock",
+    )
+
+
+def test_cached_key_builder_builds_once() -> None:
+    calls: list[StorageKeyType | None] = []
+
+    class CountingKeyBuilder(DefaultKeyBuilder):
+        def build(self, key: StorageKey, type_: StorageKeyType | None = None) -> str:
+            calls.append(type_)
+            return super().build(key, type_)
+
+    builder = CachedKeyBuilder(CountingKeyBuilder(), maxsize=2)
+    key = StorageKey(bot_id=1, chat_id=2, user_id=3)
+
+    builder.build(key, StorageKeyType.LOCK)
+    builder.build(key, StorageKeyType.STATE)
+    builder.build_bytes(key, StorageKeyType.DATA)
+    assert len(calls) == 3
+
+    builder.clear()
+    builder.build(key, StorageKeyType.DATA)
+    assert len(calls) == 6
+
+
+def test_cached_key_builder_propagates_errors() -> None:
+    builder = CachedKeyBuilder()
+    key = StorageKey(bot_id=1, chat_id=2, user_id=3, destiny="other")
+
+    with pytest.raises(ValueError, match="with_destiny"):
+        builder.build(key, StorageKeyType.DATA)
+
+
+def test_default_key_builder_parses_built_key() -> None:
+    builder = DefaultKeyBuilder(with_bot_id=True, with_destiny=True)
+    key = StorageKey(bot_id=1, chat_id=2, user_id=None, destiny="aiogd:stack:x")
+
+    assert builder.parse(builder.build(key, StorageKeyType.STATE)) == (
+        key,
+        StorageKeyType.STATE,
+    )
+
+
+@pytest.mark.parametrize(
+    ("builder", "value"),
+    [
+        (DefaultKeyBuilder(), "fsm:1:2"),
+        (DefaultKeyBuilder(), "fsm:1"),
+        (DefaultKeyBuilder(), "other:1:2:state"),
+        (DefaultKeyBuilder(), "fsm:1:2:unknown"),
+        (DefaultKeyBuilder(), "fsm:1:2:extra:state"),
+        (DefaultKeyBuilder(with_bot_id=True), "fsm:1:2:state"),
+    ],
+)
+def test_default_key_builder_rejects_foreign_keys(
+    builder: DefaultKeyBuilder,
+    value: str,
+) -> None:
+    with pytest.raises(ValueError):  # noqa: PT011
+        builder.parse(value)
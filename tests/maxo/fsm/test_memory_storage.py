@@ -0,0 +1,60 @@
+import pytest
+
+from maxo.fsm.key_builder import DefaultKeyBuilder, StorageKey
+from maxo.fsm.state import State, StatesGroup
+from maxo.fsm.storages.base import StorageRecord
+from maxo.fsm.storages.memory import MemoryStorage
+
+
+class Form(StatesGroup):
+    name = State()
+
+
+def make_records(count: int) -> list[StorageRecord]:
+    return [
+        StorageRecord(
+            key=StorageKey(bot_id=0, chat_id=i, user_id=i),
+            state=Form.name.state if i % 2 else None,
+            data={"i": i} if i % 3 else {},
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_set_and_get_many() -> None:
+    storage = MemoryStorage()
+    records = make_records(10)
+
+    await storage.set_many(records)
+
+    loaded = [record async for record in storage.get_many(r.key for r in records)]
+    assert loaded == records
+    assert await storage.get_state(records[1].key) == Form.name.state
+
+
+@pytest.mark.asyncio
+async def test_scan_and_delete_many() -> None:
+    storage = MemoryStorage()
+    records = make_records(10)
+    await storage.set_many(records)
+    await storage.set_state(StorageKey(bot_id=0, chat_id=5, user_id=7), Form.name)
+
+    keys = [key async for key in storage.scan("fsm:5:")]
+    assert sorted(key.user_id or 0 for key in keys) == [5, 7]
+
+    await storage.delete_many(storage.scan())
+
+    assert [key async for key in storage.scan()] == []
+    assert await storage.get_data(records[1].key) == {}
+
+
+@pytest.mark.asyncio
+async def test_scan_with_destiny() -> None:
+    storage = MemoryStorage(
+        key_builder=DefaultKeyBuilder(with_bot_id=True, with_destiny=True),
+    )
+    key = StorageKey(bot_id=42, chat_id=1, user_id=2, destiny="aiogd:stack:x")
+    await storage.set_data(key, {"a": 1})
+
+    assert [k async for k in storage.scan()] == [key]
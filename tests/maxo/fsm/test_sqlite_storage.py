@@ -0,0 +1,138 @@
+import asyncio
+import sqlite3
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+from maxo import loggers
+from maxo.fsm.key_builder import StorageKey
+from maxo.fsm.state import State, StatesGroup
+from maxo.fsm.storages.base import StorageRecord
+from maxo.fsm.storages.sqlite import SQLiteStorage
+
+
+class Form(StatesGroup):
+    name = State()
+
+
+KEY = StorageKey(bot_id=1, chat_id=2, user_id=3)
+
+
+@pytest_asyncio.fixture
+async def storage(tmp_path: Path) -> AsyncIterator[SQLiteStorage]:
+    storage = SQLiteStorage(tmp_path / "fsm.sqlite3")
+    yield storage
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_state_and_data(storage: SQLiteStorage) -> None:
+    assert await storage.get_state(KEY) is None
+    assert await storage.get_data(KEY) == {}
+
+    await storage.set_state(KEY, Form.name)
+    await storage.update_data(KEY, {"a": 1})
+
+    assert await storage.get_state(KEY) == Form.name.state
+    assert await storage.get_data(KEY) == {"a": 1}
+
+    await storage.set_state(KEY, None)
+    await storage.set_data(KEY, {})
+
+    assert await storage.get_state(KEY) is None
+    assert await storage.get_data(KEY) == {}
+
+
+@pytest.mark.asyncio
+async def test_persists_after_close(tmp_path: Path) -> None:
+    storage = SQLiteStorage(tmp_path / "fsm.sqlite3", commit_interval=60)
+    await storage.set_state(KEY, Form.name)
+    await storage.close()
+
+    reopened = SQLiteStorage(tmp_path / "fsm.sqlite3")
+    try:
+        assert await reopened.get_state(KEY) == Form.name.state
+    finally:
+        await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_ttl(tmp_path: Path) -> None:
+    storage = SQLiteStorage(tmp_path / "fsm.sqlite3", state_ttl=-1, data_ttl=60)
+    try:
+        await storage.set_state(KEY, Form.name)
+        await storage.set_data(KEY, {"a": 1})
+
+        assert await storage.get_state(KEY) is None
+        assert await storage.get_data(KEY) == {"a": 1}
+        assert await storage.purge_expired() == 1
+    finally:
+        await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_operations(storage: SQLiteStorage) -> None:
+    records = [
+        StorageRecord(
+            key=StorageKey(bot_id=0, chat_id=i, user_id=i),
+            state=Form.name.state if i % 2 else None,
+            data={"i": i},
+        )
+        for i in range(1, 11)
+    ]
+    await storage.set_many(records)
+
+    loaded = [record async for record in storage.get_many(r.key for r in records)]
+    assert loaded == records
+
+    keys = [key async for key in storage.scan("fsm:1")]
+    assert sorted(key.chat_id or 0 for key in keys) == [1, 10]
+
+    await storage.delete_many(storage.scan())
+    assert [key async for key in storage.scan()] == []
+
+
+@pytest.mark.asyncio
+async def test_get_many_fits_old_sqlite_variable_limit(tmp_path: Path) -> None:
+    storage = SQLiteStorage(tmp_path / "fsm.sqlite3", batch_size=1000)
+    queries: list[int] = []
+    get_many = storage._get_many
+
+    def counting_get_many(built_keys: list[str]) -> dict[str, str]:
+        queries.append(len(built_keys) + 1)
+        return get_many(built_keys)
+
+    storage._get_many = counting_get_many  # type: ignore[method-assign]
+    keys = [StorageKey(bot_id=0, chat_id=i, user_id=i) for i in range(1000)]
+
+    loaded = [record async for record in storage.get_many(keys)]
+    await storage.close()
+
+    assert len(loaded) == 1000
+    assert max(queries) <= 999
+
+
+@pytest.mark.asyncio
+async def test_background_commit_errors_are_logged(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    errors: list[str] = []
+    monkeypatch.setattr(
+        loggers.fsm,
+        "error",
+        lambda msg, *args, **_: errors.append(msg % args),
+    )
+    storage = SQLiteStorage(tmp_path / "fsm.sqlite3", commit_interval=0.01)
+
+    def failing_commit() -> None:
+        raise sqlite3.OperationalError("disk I/O error")
+
+    storage._commit = failing_commit  # type: ignore[method-assign]
+    await storage.set_state(KEY, Form.name)
+    await asyncio.sleep(0.05)
+    await storage.close()
+
+    assert errors == ["SQLite storage commit failed"]
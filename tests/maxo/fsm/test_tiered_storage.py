@@ -0,0 +1,226 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from maxo.backoff import BackoffConfig
+from maxo.fsm.key_builder import StorageKey
+from maxo.fsm.state import State, StatesGroup
+from maxo.fsm.storages.memory import MemoryStorage
+from maxo.fsm.storages.redis import RedisCacheInvalidator
+from maxo.fsm.storages.tiered import (
+    InvalidateCallback,
+    ResetCallback,
+    TieredStorage,
+)
+
+
+class Form(StatesGroup):
+    name = State()
+
+
+KEY = StorageKey(bot_id=1, chat_id=2, user_id=3)
+
+
+class CountingStorage(MemoryStorage):
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        self.reads += 1
+        return await super().get_state(key)
+
+
+class LocalInvalidator:
+    def __init__(self) -> None:
+        self.callbacks: list[InvalidateCallback] = []
+        self.resets: list[ResetCallback] = []
+        self.published: list[StorageKey] = []
+        self.messages = 0
+
+    async def start(self, callback: InvalidateCallback, reset: ResetCallback) -> None:
+        self.callbacks.append(callback)
+        self.resets.append(reset)
+
+    async def publish(self, keys: Sequence[StorageKey]) -> None:
+        self.published.extend(keys)
+        self.messages += 1
+
+    async def close(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_reads_are_cached() -> None:
+    backend = CountingStorage()
+    storage = TieredStorage(backend, sticky=True)
+
+    assert await storage.get_state(KEY) is None
+    assert await storage.get_state(KEY) is None
+    assert backend.reads == 1
+
+    await storage.set_state(KEY, Form.name)
+    assert await storage.get_state(KEY) == Form.name.state
+    assert await backend.get_state(KEY) == Form.name.state
+    assert backend.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_data_is_copied() -> None:
+    storage = TieredStorage(MemoryStorage())
+    data = {"a": 1}
+    await storage.set_data(KEY, data)
+    data["a"] = 2
+
+    loaded = await storage.get_data(KEY)
+    loaded["b"] = 3
+    assert await storage.get_data(KEY) == {"a": 1}
+
+
+@pytest.mark.asyncio
+async def test_invalidation() -> None:
+    backend = CountingStorage()
+    invalidator = LocalInvalidator()
+    storage = TieredStorage(backend, invalidator=invalidator)
+
+    await storage.set_state(KEY, Form.name)
+    assert invalidator.published == [KEY]
+
+    await backend.set_state(KEY, None)
+    assert await storage.get_state(KEY) == Form.name.state
+
+    (callback,) = invalidator.callbacks
+    callback(KEY)
+    assert await storage.get_state(KEY) is None
+
+    await storage.delete_many([KEY])
+    assert invalidator.published == [KEY, KEY]
+
+
+@pytest.mark.asyncio
+async def test_batch_invalidation_is_published_at_once() -> None:
+    invalidator = LocalInvalidator()
+    storage = TieredStorage(MemoryStorage(), invalidator=invalidator)
+    keys = [StorageKey(bot_id=1, chat_id=i, user_id=i) for i in range(600)]
+
+    await storage.delete_many(keys)
+
+    assert invalidator.published == keys
+    assert invalidator.messages == 2
+
+
+class SlowStorage(MemoryStorage):
+    def __init__(self) -> None:
+        super().__init__()
+        self.reading = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        state = await super().get_state(key)
+        self.reading.set()
+        await self.release.wait()
+        return state
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_read_is_not_overwritten() -> None:
+    backend = SlowStorage()
+    await backend.set_state(KEY, Form.name)
+    invalidator = LocalInvalidator()
+    storage = TieredStorage(backend, invalidator=invalidator)
+
+    read = asyncio.create_task(storage.get_state(KEY))
+    await backend.reading.wait()
+    # Другая реплика меняет состояние, пока идёт чтение
+    await backend.set_state(KEY, None)
+    invalidator.callbacks[0](KEY)
+    backend.release.set()
+
+    assert await read == Form.name.state
+    assert await storage.get_state(KEY) is None
+
+
+@pytest.mark.asyncio
+async def test_reset_during_read_is_not_overwritten() -> None:
+    backend = SlowStorage()
+    await backend.set_state(KEY, Form.name)
+    invalidator = LocalInvalidator()
+    storage = TieredStorage(backend, invalidator=invalidator)
+
+    read = asyncio.create_task(storage.get_state(KEY))
+    await backend.reading.wait()
+    await backend.set_state(KEY, None)
+    invalidator.resets[0]()
+    backend.release.set()
+    await read
+
+    assert await storage.get_state(KEY) is None
+
+
+@pytest.mark.asyncio
+async def test_get_many_starts_invalidator() -> None:
+    invalidator = LocalInvalidator()
+    storage = TieredStorage(MemoryStorage(), invalidator=invalidator)
+
+    assert [record async for record in storage.get_many([KEY])]
+    assert len(invalidator.callbacks) == 1
+
+
+class FakePubSub:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.messages: asyncio.Queue[Any] = asyncio.Queue()
+
+    async def subscribe(self, channel: str) -> None:
+        self.redis.subscriptions.append(self)
+
+    async def listen(self) -> AsyncIterator[dict[str, Any]]:
+        while True:
+            message = await self.messages.get()
+            if isinstance(message, Exception):
+                raise message
+            yield {"type": "message", "data": message}
+
+    async def aclose(self) -> None:
+        pass
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.subscriptions: list[FakePubSub] = []
+
+    def pubsub(self, **kwargs: Any) -> FakePubSub:
+        return FakePubSub(self)
+
+
+def invalidation(key: StorageKey) -> str:
+    return json.dumps(["other", [[key.bot_id, key.chat_id, key.user_id, key.destiny]]])
+
+
+@pytest.mark.asyncio
+async def test_redis_invalidator_reconnects_and_resets() -> None:
+    redis = FakeRedis()
+    invalidator = RedisCacheInvalidator(
+        redis,  # type: ignore[arg-type]
+        backoff=BackoffConfig(min_delay=0.001, max_delay=0.01, factor=2, jitter=0),
+    )
+    invalidated: list[StorageKey] = []
+    resets: list[None] = []
+    await invalidator.start(invalidated.append, lambda: resets.append(None))
+
+    first = redis.subscriptions[0]
+    first.messages.put_nowait(invalidation(KEY))
+    first.messages.put_nowait(RedisConnectionError("Connection closed"))
+    while len(redis.subscriptions) < 2:
+        await asyncio.sleep(0.001)
+    redis.subscriptions[1].messages.put_nowait(invalidation(KEY))
+    while len(invalidated) < 2:
+        await asyncio.sleep(0.001)
+    await invalidator.close()
+
+    assert invalidated == [KEY, KEY]
+    assert resets
@@ -9,6 +9,7 @@ from maxo.routing.middlewares.update_context import (
     EVENT_CHAT_KEY,
     EVENT_FROM_USER_KEY,
     UPDATE_CONTEXT_KEY,
+    UpdateContextCache,
     UpdateContextMiddleware,
 )
 from maxo.routing.signals import MaxoUpdate
@@ -507,3 +508,121 @@ async def test_enrich_enabled_fills_chat_and_event_chat_key() -> None:
     update_context = ctx[UPDATE_CONTEXT_KEY]
     assert update_context.chat is chat_result
     assert ctx[EVENT_CHAT_KEY] is chat_result
+
+
+class CountingBot:
+    def __init__(self) -> None:
+        self.get_chat_calls: list[int] = []
+        self.get_members_calls: list[tuple[int, list[int]]] = []
+
+    async def get_chat(self, chat_id: int) -> Chat:
+        self.get_chat_calls.append(chat_id)
+        return Chat(
+            chat_id=chat_id,
+            is_public=False,
+            last_event_time=datetime.now(UTC),
+            participants_count=2,
+            status=ChatStatus.ACTIVE,
+            type=ChatType.CHAT,
+        )
+
+    async def get_members(self, chat_id: int, user_ids: list[int]) -> ChatMembersList:
+        self.get_members_calls.append((chat_id, user_ids))
+        return ChatMembersList(
+            members=[
+                ChatMember(
+                    user_id=user_id,
+                    first_name="Member",
+                    is_bot=False,
+                    last_activity_time=datetime.now(UTC),
+                    alias="",
+                    is_admin=False,
+                    is_owner=False,
+                    join_time=datetime.now(UTC),
+                    last_access_time=datetime.now(UTC),
+                )
+                for user_id in user_ids
+            ],
+        )
+
+
+@pytest.mark.asyncio
+async def test_enrich_uses_cache() -> None:
+    bot = CountingBot()
+    middleware = UpdateContextMiddleware(enrich=True, cache=UpdateContextCache())
+
+    for _ in range(3):
+        removed = make_message_removed(chat_id=1, user_id=2)
+        ctx = Ctx({"update": removed, "bot": bot})
+        await run_middleware(middleware, removed, ctx)
+        assert ctx[UPDATE_CONTEXT_KEY].user.user_id == 2
+
+    assert bot.get_chat_calls == [1]
+    assert bot.get_members_calls == [(1, [2])]
+
+
+@pytest.mark.asyncio
+async def test_enrich_cache_is_invalidated_by_updates() -> None:
+    bot = CountingBot()
+    middleware = UpdateContextMiddleware(enrich=True, cache=UpdateContextCache())
+
+    async def feed(update: Any) -> None:
+        await run_middleware(middleware, update, Ctx({"update": update, "bot": bot}))
+
+    await feed(make_message_removed(chat_id=1, user_id=2))
+    await feed(
+        ChatTitleChanged(
+            chat_id=1,
+            title="New title",
+            user=make_user(5),
+            timestamp=datetime.now(UTC),
+        ),
+    )
+    await feed(make_message_removed(chat_id=1, user_id=2))
+    assert len(bot.get_chat_calls) == 2
+    assert len(bot.get_members_calls) == 1
+
+    await feed(
+        UserRemovedFromChat(
+            chat_id=1,
+            is_channel=False,
+            user=make_user(2),
+            timestamp=datetime.now(UTC),
+        ),
+    )
+    await feed(make_message_removed(chat_id=1, user_id=2))
+    assert len(bot.get_chat_calls) == 3
+    assert len(bot.get_members_calls) == 2
+
+    await feed(
+        BotRemovedFromChat(
+            chat_id=1,
+            is_channel=False,
+            user=make_user(5),
+            timestamp=datetime.now(UTC),
+        ),
+    )
+    await feed(make_message_removed(chat_id=1, user_id=2))
+    assert len(bot.get_chat_calls) == 4
+    assert len(bot.get_members_calls) == 3
+
+
+def test_enrich_cache_returns_copies() -> None:
+    cache = UpdateContextCache()
+    chat = Chat(
+        chat_id=1,
+        type=ChatType.CHAT,
+        status=ChatStatus.ACTIVE,
+        last_event_time=datetime.now(UTC),
+        participants_count=2,
+        is_public=False,
+        title="Title",
+    )
+    cache.set_chat(chat)
+    chat.title = "Changed"
+
+    cached = cache.get_chat(1)
+    assert cached is not None
+    assert cached.title == "Title"
+    cached.title = "Changed"
+    assert cache.get_chat(1).title == "Title"  # type: ignore[union-attr]
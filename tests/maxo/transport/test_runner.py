@@ -0,0 +1,168 @@
+import asyncio
+import os
+import threading
+import time
+from multiprocessing import Pipe
+from typing import Any
+
+import pytest
+
+from maxo.routing.signals.update import MaxoUpdate
+from maxo.routing.updates import Updates
+from maxo.serialization import create_retort
+from maxo.transport.runner import (
+    WorkerSupervisor,
+    create_reuse_port_socket,
+    get_shard_key,
+)
+from maxo.transport.runner.polling import _UpdateSender, _receive
+
+USER = {
+    "user_id": 7,
+    "first_name": "Test",
+    "is_bot": False,
+    "last_activity_time": 1700000000000,
+}
+
+
+def load_update(raw: dict[str, Any]) -> Any:
+    return create_retort(warming_up=False).load(raw, Updates)
+
+
+def test_shard_key() -> None:
+    bot_started = load_update(
+        {
+            "update_type": "bot_started",
+            "timestamp": 1700000000000,
+            "chat_id": 1,
+            "user": USER,
+        },
+    )
+    message_created = load_update(
+        {
+            "update_type": "message_created",
+            "timestamp": 1700000000000,
+            "message": {
+                "recipient": {"chat_id": 5, "chat_type": "chat"},
+                "timestamp": 1700000000000,
+                "body": {"mid": "mid", "seq": 1, "text": "hi"},
+                "sender": USER,
+            },
+        },
+    )
+
+    assert get_shard_key(bot_started) == 1
+    assert get_shard_key(message_created) == 5
+    assert get_shard_key(object()) == 0
+
+
+def test_receive_until_channel_closed() -> None:
+    reader, writer = Pipe(duplex=False)
+    update = MaxoUpdate(
+        update=load_update(
+            {
+                "update_type": "bot_started",
+                "timestamp": 1700000000000,
+                "chat_id": 1,
+                "user": USER,
+            },
+        ),
+    )
+    writer.send(update)
+    writer.send(update)
+    writer.close()
+
+    received = _receive(reader, count=10, timeout=1)
+    assert received is not None
+    assert [item.update.chat_id for item in received] == [1, 1]
+    assert _receive(reader, count=10, timeout=1) is None
+
+
+def test_reuse_port_sockets_share_port() -> None:
+    first = create_reuse_port_socket("127.0.0.1", 0)
+    try:
+        port = first.getsockname()[1]
+        second = create_reuse_port_socket("127.0.0.1", port)
+        second.close()
+    finally:
+        first.close()
+
+
+def exit_immediately(index: int) -> None:
+    os._exit(index)
+
+
+def sleep_forever(index: int) -> None:
+    time.sleep(60)
+
+
+def finish_shortly(index: int) -> None:
+    time.sleep(0.2)
+
+
+def test_supervisor_restarts_dead_workers() -> None:
+    supervisor = WorkerSupervisor(exit_immediately, workers=2, restart_delay=0.05)
+    supervisor.start()
+    try:
+        supervisor.wait(timeout=1)
+        time.sleep(0.1)
+        assert sorted(supervisor.restart_dead()) == [0, 1]
+        assert supervisor.restarts == 2
+    finally:
+        supervisor.stop()
+
+
+def test_supervisor_stop_terminates_workers() -> None:
+    supervisor = WorkerSupervisor(sleep_forever, workers=2, stop_timeout=5)
+    supervisor.start()
+    supervisor.stop()
+
+    assert all(not process.is_alive() for process in supervisor.processes.values())
+    assert supervisor.restart_dead() == []
+
+
+@pytest.mark.parametrize("workers", [0, -1])
+def test_supervisor_rejects_invalid_workers(workers: int) -> None:
+    with pytest.raises(ValueError, match="workers"):
+        WorkerSupervisor(sleep_forever, workers=workers)
+
+
+def test_supervisor_drain_lets_workers_finish() -> None:
+    supervisor = WorkerSupervisor(finish_shortly, workers=2, stop_timeout=5)
+    supervisor.start()
+    supervisor.stop(drain=True)
+
+    assert [process.exitcode for process in supervisor.processes.values()] == [0, 0]
+
+
+def test_supervisor_drain_terminates_stuck_workers() -> None:
+    supervisor = WorkerSupervisor(sleep_forever, workers=1, stop_timeout=0.2)
+    supervisor.start()
+    supervisor.stop(drain=True)
+
+    assert supervisor.processes[0].exitcode == -15
+
+
+@pytest.mark.asyncio
+async def test_update_sender_does_not_block_loop() -> None:
+    reader, writer = Pipe(duplex=False)
+    sender = _UpdateSender(0, writer, max_pending=10)
+    chunk = b"x" * 65536
+    try:
+        # Канал заполняется после первых апдейтов, но цикл событий свободен
+        for _ in range(5):
+            await asyncio.wait_for(sender.send(chunk), timeout=1)
+
+        received: list[bytes] = []
+        thread = threading.Thread(
+            target=lambda: received.extend(reader.recv() for _ in range(5)),
+        )
+        thread.start()
+        await asyncio.wait_for(sender.flush(), timeout=5)
+        thread.join()
+    finally:
+        sender.close()
+        writer.close()
+        reader.close()
+
+    assert received == [chunk] * 5
@@ -0,0 +1,178 @@
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from maxo.bot.bot import Bot
+from maxo.routing.dispatcher import Dispatcher
+from maxo.routing.updates import BotStarted
+from maxo.transport.queue import FileUpdateQueue, MemoryUpdateQueue, QueueConsumer
+from maxo.transport.webhook.adapters.aiohttp.adapter import AiohttpWebAdapter
+from maxo.transport.webhook.engines import SimpleEngine
+from maxo.transport.webhook.routing.static import StaticRouting
+
+UPDATE = {
+    "update_type": "bot_started",
+    "timestamp": 1700000000000,
+    "chat_id": 1,
+    "user": {
+        "user_id": 1,
+        "first_name": "Test",
+        "is_bot": False,
+        "last_activity_time": 1700000000000,
+    },
+}
+
+
+class OfflineBot(Bot):
+    @property
+    def state(self) -> Any:
+        return SimpleNamespace(info=SimpleNamespace(user_id=42))
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_memory_queue() -> None:
+    queue = MemoryUpdateQueue()
+    for i in range(3):
+        await queue.put(b"%d" % i)
+
+    messages = await queue.read("consumer", count=2, timeout=0.01)
+    assert [message.data for message in messages] == [b"0", b"1"]
+    assert await queue.read("consumer", count=2, timeout=0.01) != []
+    assert await queue.read("consumer", count=2, timeout=0.01) == []
+
+    await queue.ack("consumer", [message.id for message in messages])
+    assert len(queue.pending) == 1
+
+
+@pytest.mark.asyncio
+async def test_file_queue_resumes_from_first_unacked(tmp_path: Path) -> None:
+    path = tmp_path / "updates.log"
+    queue = FileUpdateQueue(path, poll_interval=0.01)
+    for i in range(4):
+        await queue.put(b"update-%d" % i)
+
+    messages = await queue.read("consumer", count=10, timeout=0.01)
+    assert [message.data for message in messages] == [
+        b"update-0",
+        b"update-1",
+        b"update-2",
+        b"update-3",
+    ]
+    # update-2 не подтверждён, поэтому позиция остаётся перед ним
+    await queue.ack("consumer", [messages[0].id, messages[1].id, messages[3].id])
+    await queue.close()
+
+    queue = FileUpdateQueue(path, poll_interval=0.01)
+    messages = await queue.read("consumer", count=10, timeout=0.01)
+    assert [message.data for message in messages] == [b"update-2", b"update-3"]
+
+    waiting = asyncio.create_task(queue.read("consumer", count=10, timeout=1))
+    await queue.put(b"update-4")
+    assert [message.data for message in await waiting] == [b"update-4"]
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_file_queue_compacts_acked_log(tmp_path: Path) -> None:
+    path = tmp_path / "updates.log"
+    queue = FileUpdateQueue(path, poll_interval=0.01, compact_size=10)
+    for i in range(3):
+        await queue.put(b"update-%d" % i)
+
+    messages = await queue.read("consumer", count=2, timeout=0.01)
+    await queue.ack("consumer", [message.id for message in messages])
+    # Одно сообщение ещё не прочитано: файл не обрезается
+    assert path.stat().st_size > 0
+
+    messages = await queue.read("consumer", count=10, timeout=0.01)
+    await queue.ack("consumer", [message.id for message in messages])
+    assert path.stat().st_size == 0
+    assert queue.offset_path.read_text() == "0"
+
+    await queue.put(b"update-3")
+    messages = await queue.read("consumer", count=10, timeout=0.01)
+    assert [message.data for message in messages] == [b"update-3"]
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_file_queue_concurrent_writers(tmp_path: Path) -> None:
+    path = tmp_path / "updates.log"
+    writers = [FileUpdateQueue(path) for _ in range(4)]
+    records = [bytes([i]) * 200_000 for i in range(20)]
+
+    await asyncio.gather(
+        *(writers[i % 4].put(record) for i, record in enumerate(records)),
+    )
+    for writer in writers:
+        await writer.close()
+
+    reader = FileUpdateQueue(path, poll_interval=0.01)
+    messages = await reader.read("consumer", count=100, timeout=0.01)
+    await reader.close()
+    assert sorted(message.data for message in messages) == records
+
+
+@pytest.mark.asyncio
+async def test_consumer_feeds_dispatcher_and_acks() -> None:
+    queue = MemoryUpdateQueue()
+    dispatcher = Dispatcher()
+    consumer = QueueConsumer(dispatcher, queue, read_timeout=0.01)
+    handled: list[int] = []
+
+    @dispatcher.bot_started()
+    async def handler(update: BotStarted) -> None:
+        handled.append(update.chat_id)
+        if len(handled) == 2:
+            consumer.stop()
+
+    await queue.put(json.dumps(UPDATE).encode())
+    await queue.put(b"{not json")
+    await queue.put(json.dumps({**UPDATE, "chat_id": 2}).encode())
+
+    bot = OfflineBot("42:TEST", warming_up=False)
+    await asyncio.wait_for(consumer.start(bot), timeout=5)
+
+    assert handled == [1, 2]
+    assert queue.pending == {}
+
+
+@pytest.mark.asyncio
+async def test_engine_only_enqueues_valid_updates() -> None:
+    queue = MemoryUpdateQueue()
+    dispatcher = Dispatcher()
+    handled: list[Any] = []
+    dispatcher.bot_started()(handled.append)
+    engine = SimpleEngine(
+        dispatcher,
+        Bot("42:TEST", warming_up=False),
+        web_adapter=AiohttpWebAdapter(),
+        routing=StaticRouting(url="https://example.com/webhook"),
+        update_queue=queue,
+    )
+    app = web.Application()
+    app.router.add_post(
+        "/webhook",
+        lambda request: engine.handle_request(engine.web_adapter.bind(request)),
+    )
+
+    async with TestClient(TestServer(app)) as client:
+        body = json.dumps(UPDATE).encode()
+        assert (await client.post("/webhook", data=body)).status == 200
+        assert (await client.post("/webhook", data=b"{}")).status == 400
+
+    messages = await queue.read("consumer", count=10, timeout=0.01)
+    assert [message.data for message in messages] == [body]
+    assert handled == []
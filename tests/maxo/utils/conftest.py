@@ -0,0 +1,99 @@
+import asyncio
+import json
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from maxo.bot.methods.messages.send_message import SendMessage
+from maxo.bot.prepared import PreparedMessage
+from maxo.bot.retry import retries_disabled
+from maxo.enums import UploadType
+from maxo.omit import Omitted
+from maxo.serialization import create_retort
+from maxo.types import UploadEndpoint, UploadMediaResult
+from maxo.utils.upload_media.cache import BaseUploadCache
+
+
+class FakeBot:
+    def __init__(
+        self,
+        *,
+        total: int = 0,
+        api_client: Any = None,
+        delay: float = 0,
+        upload_url: str = "https://upload",
+        upload_cache: BaseUploadCache | None = None,
+    ) -> None:
+        self.retort = create_retort(warming_up=False)
+        self.state = SimpleNamespace(api_client=api_client)
+        self.total = total
+        self.delay = delay
+        self.upload_url = upload_url
+        self.upload_cache = upload_cache
+        # Итераторы
+        self.calls: list[dict[str, Any]] = []
+        self.events: list[str] = []
+        # Рассылки
+        self.sent: list[SendMessage] = []
+        self.errors: dict[int, list[Exception]] = {}
+        self.active = 0
+        self.max_active = 0
+        self.prepared = 0
+        self.client_retries: list[bool] = []
+        # Загрузки
+        self.upload_url_calls = 0
+        self.uploads = 0
+
+    async def get_members(self, **kwargs: Any) -> SimpleNamespace:
+        self.calls.append(kwargs)
+        if "user_ids" in kwargs:
+            return SimpleNamespace(members=list(kwargs["user_ids"]), marker=None)
+        members, marker = await self._page(kwargs["marker"], kwargs["count"])
+        return SimpleNamespace(members=members, marker=marker)
+
+    async def get_chats(self, **kwargs: Any) -> SimpleNamespace:
+        self.calls.append(kwargs)
+        chats, marker = await self._page(kwargs["marker"], kwargs["count"])
+        return SimpleNamespace(chats=chats, marker=marker)
+
+    def prepare_message(self, **kwargs: Any) -> PreparedMessage:
+        self.prepared += 1
+        return PreparedMessage.build(self.retort, json.dumps, **kwargs)
+
+    async def call_method(self, method: SendMessage) -> Any:
+        self.client_retries.append(not retries_disabled())
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            user_id = method.user_id
+            errors = self.errors.get(user_id)  # type: ignore[arg-type]
+            if errors:
+                raise errors.pop(0)
+            self.sent.append(method)
+        finally:
+            self.active -= 1
+
+    async def get_upload_url(self, type: UploadType) -> UploadEndpoint:
+        self.upload_url_calls += 1
+        return UploadEndpoint(url=self.upload_url)
+
+    async def upload_media(self, upload_url: str, file: Any) -> UploadMediaResult:
+        self.uploads += 1
+        await asyncio.sleep(self.delay)
+        return UploadMediaResult(token=f"token-{self.uploads}")
+
+    async def _page(self, marker: Any, count: int) -> tuple[list[int], int | None]:
+        start = 0 if isinstance(marker, Omitted) else marker
+        self.events.append(f"fetch {start}")
+        await asyncio.sleep(self.delay)
+        self.events.append(f"done {start}")
+        end = min(start + count, self.total)
+        return list(range(start, end)), end if end < self.total else None
+
+
+@pytest.fixture
+def make_bot() -> Callable[..., FakeBot]:
+    return FakeBot
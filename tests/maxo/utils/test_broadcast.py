@@ -0,0 +1,233 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from maxo.backoff import BackoffConfig
+from maxo.bot.retry import ATTACHMENT_NOT_READY
+from maxo.enums import TextFormat
+from maxo.errors import (
+    MaxBotBadRequestError,
+    MaxBotForbiddenError,
+    MaxBotServiceUnavailableError,
+    MaxBotTooManyRequestsError,
+)
+from maxo.types import CallbackButton, InlineKeyboardAttachmentRequest
+from maxo.utils.broadcast import (
+    BroadcastCheckpoint,
+    BroadcastMessage,
+    Broadcaster,
+    ChatRecipient,
+    DeliveryResult,
+    DeliveryStatus,
+    FileCheckpointStore,
+    MemoryCheckpointStore,
+)
+from maxo.utils.formatting import Bold, Text
+
+FAST_BACKOFF = BackoffConfig(min_delay=0.001, max_delay=0.01, factor=2, jitter=0)
+
+
+def make_broadcaster(bot: Any, **kwargs: Any) -> Broadcaster:
+    kwargs.setdefault("rate", 10_000)
+    kwargs.setdefault("backoff", FAST_BACKOFF)
+    return Broadcaster(bot, **kwargs)  # type: ignore[arg-type]
+
+
+def test_message_renders_text_and_keyboard() -> None:
+    message = BroadcastMessage(
+        text=Text("Hello, ", Bold("world")),
+        keyboard=[[CallbackButton(text="Ok", payload="ok")]],
+    )
+
+    method = message.build(ChatRecipient(chat_id=7))
+
+    assert method.chat_id == 7
+    assert method.text == "Hello, <b>world</b>"
+    assert method.format == TextFormat.HTML
+    assert isinstance(method.attachments[0], InlineKeyboardAttachmentRequest)  # type: ignore[index]
+    assert message.build(1).user_id == 1
+
+
+@pytest.mark.asyncio
+async def test_broadcast_respects_concurrency(make_bot: Any) -> None:
+    bot = make_bot(delay=0.01)
+    broadcaster = make_broadcaster(bot, max_concurrency=3)
+
+    stats = await broadcaster.broadcast(range(20), BroadcastMessage(text="hi"))
+
+    assert stats.sent == 20
+    assert stats.total == 20
+    assert stats.eta == 0
+    assert bot.max_active == 3
+    assert bot.prepared == 1
+    assert sorted(method.user_id for method in bot.sent) == list(range(20))  # type: ignore[type-var]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_respects_rate(make_bot: Any) -> None:
+    bot = make_bot()
+    broadcaster = make_broadcaster(bot, rate=50)
+
+    stats = await broadcaster.broadcast(range(60), BroadcastMessage(text="hi"))
+
+    # Первые 50 сообщений уходят сразу, остальные 10 — за 0.2 секунды
+    assert stats.elapsed >= 0.15
+    assert stats.sent == 60
+
+
+@pytest.mark.asyncio
+async def test_broadcast_handles_blocked_and_retries(make_bot: Any) -> None:
+    bot = make_bot()
+    bot.errors = {
+        1: [MaxBotForbiddenError("403", "chat.denied", "blocked")],
+        2: [MaxBotTooManyRequestsError("429", "too.many.requests", "slow down")],
+        3: [MaxBotBadRequestError("400", "bad.request", "bad")],
+    }
+    results: list[DeliveryResult] = []
+
+    stats = await make_broadcaster(bot).broadcast(
+        [1, 2, 3, 4],
+        BroadcastMessage(text="hi"),
+        on_result=results.append,
+    )
+
+    assert (stats.sent, stats.blocked, stats.failed) == (2, 1, 1)
+    statuses = {result.recipient: result.status for result in results}
+    assert statuses == {
+        1: DeliveryStatus.BLOCKED,
+        2: DeliveryStatus.SENT,
+        3: DeliveryStatus.FAILED,
+        4: DeliveryStatus.SENT,
+    }
+
+
+@pytest.mark.asyncio
+async def test_broadcast_gives_up_after_max_attempts(make_bot: Any) -> None:
+    bot = make_bot()
+    bot.errors = {
+        1: [
+            MaxBotTooManyRequestsError("429", "too.many.requests", "slow down")
+            for _ in range(3)
+        ],
+    }
+
+    stats = await make_broadcaster(bot, max_attempts=3).broadcast(
+        [1],
+        BroadcastMessage(text="hi"),
+    )
+
+    assert stats.failed == 1
+    assert bot.errors[1] == []
+
+
+@pytest.mark.asyncio
+async def test_broadcast_is_the_only_retry_layer(make_bot: Any) -> None:
+    bot = make_bot()
+    bot.errors = {
+        1: [MaxBotBadRequestError(ATTACHMENT_NOT_READY, "400", "not processed")],
+    }
+
+    stats = await make_broadcaster(bot).broadcast([1], BroadcastMessage(text="hi"))
+
+    assert stats.sent == 1
+    assert bot.client_retries == [False, False]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_saves_checkpoint_on_error(make_bot: Any) -> None:
+    store = MemoryCheckpointStore()
+    bot = make_bot()
+
+    def on_result(result: DeliveryResult) -> None:
+        if result.recipient == 3:
+            raise RuntimeError("stop")
+
+    with pytest.raises(ExceptionGroup):
+        await make_broadcaster(bot, store=store, max_concurrency=1).broadcast(
+            range(10),
+            BroadcastMessage(text="hi"),
+            key="news",
+            on_result=on_result,
+        )
+
+    checkpoint = await store.load("news")
+    assert checkpoint == BroadcastCheckpoint(position=4, sent=4)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_resumes_from_checkpoint(make_bot: Any) -> None:
+    store = MemoryCheckpointStore()
+    await store.save(
+        "news",
+        BroadcastCheckpoint(position=5, completed=[7], sent=6),
+    )
+    bot = make_bot()
+
+    stats = await make_broadcaster(bot, store=store).broadcast(
+        range(10),
+        BroadcastMessage(text="hi"),
+        key="news",
+    )
+
+    assert sorted(method.user_id for method in bot.sent) == [5, 6, 8, 9]  # type: ignore[type-var]
+    assert stats.sent == 10
+    assert stats.resumed_from == 6
+    checkpoint = await store.load("news")
+    assert checkpoint == BroadcastCheckpoint(position=10, sent=10, finished=True)
+
+    await make_broadcaster(bot, store=store).broadcast(
+        range(10),
+        BroadcastMessage(text="hi"),
+        key="news",
+    )
+    assert len(bot.sent) == 4
+
+
+@pytest.mark.asyncio
+async def test_broadcast_saves_checkpoints(tmp_path: Path, make_bot: Any) -> None:
+    saved: list[BroadcastCheckpoint] = []
+
+    class RecordingStore(FileCheckpointStore):
+        async def save(self, key: str, checkpoint: BroadcastCheckpoint) -> None:
+            saved.append(checkpoint)
+            await super().save(key, checkpoint)
+
+    store = RecordingStore(tmp_path)
+
+    async def recipients() -> Any:
+        for user_id in range(5):
+            yield user_id
+
+    await make_broadcaster(
+        make_bot(),
+        store=store,
+        max_concurrency=1,
+        checkpoint_every=2,
+    ).broadcast(recipients(), BroadcastMessage(text="hi"), key="news")
+
+    assert [checkpoint.position for checkpoint in saved] == [2, 4, 5]
+    assert await store.load("news") == saved[-1]
+    await store.delete("news")
+    assert await store.load("news") is None
+
+
+@pytest.mark.asyncio
+async def test_broadcast_does_not_resend_after_unavailable(make_bot: Any) -> None:
+    bot = make_bot()
+    bot.errors = {
+        1: [MaxBotServiceUnavailableError("503", "service.unavailable", "down")],
+    }
+
+    stats = await make_broadcaster(bot).broadcast([1], BroadcastMessage(text="hi"))
+    assert stats.failed == 1
+    assert bot.sent == []
+
+    bot.errors = {
+        1: [MaxBotServiceUnavailableError("503", "service.unavailable", "down")],
+    }
+    stats = await make_broadcaster(bot, retry_unsafe=True).broadcast(
+        [1],
+        BroadcastMessage(text="hi"),
+    )
+    assert stats.sent == 1
@@ -0,0 +1,123 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from maxo.omit import Omitted
+from maxo.utils.iterators import MAX_PAGE_SIZE, ChatMembersIterator, ChatsIterator
+
+
+@pytest.mark.asyncio
+async def test_chat_members_iterates_all_pages(make_bot: Any) -> None:
+    bot = make_bot(total=250)
+
+    iterator = ChatMembersIterator(bot, chat_id=1, count=100)  # type: ignore[arg-type]
+
+    members: list[Any] = [member async for member in iterator]
+
+    assert members == list(range(250))
+    assert [call["marker"] for call in bot.calls] == [Omitted(), 100, 200]
+    assert all(call["chat_id"] == 1 for call in bot.calls)
+
+
+@pytest.mark.asyncio
+async def test_chats_keeps_last_page(make_bot: Any) -> None:
+    bot = make_bot(total=70)
+
+    chats: list[Any] = [chat async for chat in ChatsIterator(bot, count=50)]  # type: ignore[arg-type]
+
+    assert chats == list(range(70))
+
+
+@pytest.mark.asyncio
+async def test_batches_prefetch_next_page(make_bot: Any) -> None:
+    bot = make_bot(total=300, delay=0.01)
+    iterator = ChatMembersIterator(bot, chat_id=1, count=100)  # type: ignore[arg-type]
+
+    sizes = []
+    async for batch in iterator.batches():
+        bot.events.append(f"process {batch[0]}")
+        await asyncio.sleep(0.02)
+        bot.events.append(f"processed {batch[0]}")
+        sizes.append(len(batch))
+
+    assert sizes == [100, 100, 100]
+    # Следующая страница запрошена до того, как обработана текущая
+    assert bot.events[:6] == [
+        "fetch 0",
+        "done 0",
+        "process 0",
+        "fetch 100",
+        "done 100",
+        "processed 0",
+    ]
+    assert iterator.marker is None
+
+
+@pytest.mark.asyncio
+async def test_batches_cancel_prefetch_on_break(make_bot: Any) -> None:
+    bot = make_bot(total=300, delay=0.01)
+    iterator = ChatsIterator(bot, count=100)  # type: ignore[arg-type]
+
+    batches = iterator.batches()
+    async for _ in batches:
+        await asyncio.sleep(0)
+        break
+    await batches.aclose()
+
+    assert iterator.marker == 100
+    # Запрос следующей страницы отменён
+    assert bot.events == ["fetch 0", "done 0", "fetch 100"]
+
+
+@pytest.mark.asyncio
+async def test_iterator_cancels_prefetch_on_close(make_bot: Any) -> None:
+    bot = make_bot(total=300, delay=0.01)
+
+    async with ChatsIterator(bot, count=100) as chats:  # type: ignore[arg-type]
+        async for _ in chats:
+            await asyncio.sleep(0)
+            break
+
+    assert bot.events == ["fetch 0", "done 0", "fetch 100"]
+    assert [chat async for chat in chats][:2] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_chat_members_by_user_ids(make_bot: Any) -> None:
+    bot = make_bot(total=300)
+
+    members: list[Any] = [
+        member
+        async for member in ChatMembersIterator(bot, chat_id=1, user_ids=[5, 7])  # type: ignore[arg-type]
+    ]
+
+    assert members == [5, 7]
+    assert len(bot.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_omitted_count_and_marker(make_bot: Any) -> None:
+    bot = make_bot(total=70)
+
+    chats: list[Any] = [
+        chat
+        async for chat in ChatsIterator(bot, count=Omitted(), marker=Omitted())  # type: ignore[arg-type]
+    ]
+    members: list[Any] = [
+        member
+        async for member in ChatMembersIterator(
+            bot,  # type: ignore[arg-type]
+            chat_id=1,
+            count=Omitted(),
+            marker=Omitted(),
+        )
+    ]
+
+    assert chats == members == list(range(70))
+    assert [call["count"] for call in bot.calls] == [50, 50, 20, 20, 20, 20]
+
+
+def test_page_size_is_limited(make_bot: Any) -> None:
+    with pytest.raises(ValueError, match="page_size"):
+        ChatsIterator(make_bot(total=0), count=MAX_PAGE_SIZE + 1)  # type: ignore[arg-type]
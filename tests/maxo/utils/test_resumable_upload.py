@@ -0,0 +1,259 @@
+import os
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from aiohttp import ClientResponseError, web
+from aiohttp.test_utils import TestServer
+
+from maxo.backoff import BackoffConfig
+from maxo.bot.api_client import MaxApiClient
+from maxo.enums import UploadType
+from maxo.serialization import create_retort
+from maxo.utils.upload_media import (
+    BufferedInputFile,
+    FSInputFile,
+    FileProgressStore,
+    MemoryProgressStore,
+    ResumableUploader,
+    UploadProgress,
+)
+
+CONTENT = bytes(range(256)) * 40
+CHUNK_SIZE = 1000
+FAST_BACKOFF = BackoffConfig(min_delay=0.001, max_delay=0.01, factor=2, jitter=0)
+
+
+class ChunkRecorder:
+    def __init__(self) -> None:
+        self.ranges: list[str] = []
+        self.data: dict[int, bytes] = {}
+        self.fail_offsets: set[int] = set()
+
+    async def upload(self, request: web.Request) -> web.Response:
+        content_range = request.headers["Content-Range"]
+        offset = int(content_range.removeprefix("bytes ").split("-")[0])
+        if offset in self.fail_offsets:
+            self.fail_offsets.discard(offset)
+            return web.Response(status=500)
+        self.ranges.append(content_range)
+        self.data[offset] = await request.read()
+        if offset + CHUNK_SIZE >= len(CONTENT):
+            return web.json_response({"token": "uploaded"})
+        return web.Response(status=201)
+
+    @property
+    def content(self) -> bytes:
+        return b"".join(self.data[offset] for offset in sorted(self.data))
+
+
+async def expired_upload(request: web.Request) -> web.Response:
+    return web.Response(status=404)
+
+
+@pytest_asyncio.fixture
+async def bot(make_bot: Any) -> AsyncIterator[tuple[Any, ChunkRecorder]]:
+    recorder = ChunkRecorder()
+    app = web.Application()
+    app.router.add_post("/upload", recorder.upload)
+    app.router.add_post("/expired", expired_upload)
+    retort = create_retort(warming_up=False)
+    api_client = MaxApiClient(
+        token="token",  # noqa: S106
+        request_dumper=retort,
+        response_loader=retort,
+    )
+    async with TestServer(app) as server:
+        bot = make_bot(
+            api_client=api_client,
+            upload_url=str(server.make_url("/upload")),
+        )
+        yield bot, recorder
+    await api_client.close()
+
+
+@pytest.mark.asyncio
+async def test_upload_in_chunks(
+    tmp_path: Path,
+    bot: tuple[Any, ChunkRecorder],
+) -> None:
+    fake_bot, recorder = bot
+    path = tmp_path / "video.mp4"
+    path.write_bytes(CONTENT)
+    uploader = ResumableUploader(fake_bot, chunk_size=CHUNK_SIZE, max_in_flight=3)
+
+    result = await uploader.upload(FSInputFile.video(path))
+
+    assert result == (UploadType.VIDEO, "uploaded")
+    assert len(recorder.ranges) == 11
+    assert recorder.ranges[-1] == f"bytes 10000-10239/{len(CONTENT)}"
+    assert recorder.content == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_is_retried(bot: tuple[Any, ChunkRecorder]) -> None:
+    fake_bot, recorder = bot
+    recorder.fail_offsets = {2000, 10000}
+    uploader = ResumableUploader(
+        fake_bot,
+        chunk_size=CHUNK_SIZE,
+        backoff=FAST_BACKOFF,
+    )
+
+    await uploader.upload(BufferedInputFile.file(CONTENT, "file.bin"))
+
+    assert recorder.content == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_same_named_buffers_are_not_resumed(
+    bot: tuple[Any, ChunkRecorder],
+) -> None:
+    fake_bot, recorder = bot
+    recorder.fail_offsets = {5000}
+    other = bytes(reversed(CONTENT))
+    uploader = ResumableUploader(
+        fake_bot,
+        chunk_size=CHUNK_SIZE,
+        max_in_flight=1,
+        max_attempts=1,
+    )
+
+    with pytest.raises(ClientResponseError):
+        await uploader.upload(BufferedInputFile.file(other, "file.bin"))
+    await uploader.upload(BufferedInputFile.file(CONTENT, "file.bin"))
+
+    assert fake_bot.upload_url_calls == 2
+    assert recorder.content == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_upload_is_resumed(
+    tmp_path: Path,
+    bot: tuple[Any, ChunkRecorder],
+) -> None:
+    fake_bot, recorder = bot
+    recorder.fail_offsets = {5000}
+    file = BufferedInputFile.file(CONTENT, "file.bin")
+    uploader = ResumableUploader(
+        fake_bot,
+        chunk_size=CHUNK_SIZE,
+        max_in_flight=1,
+        max_attempts=1,
+        store=FileProgressStore(tmp_path),
+    )
+
+    with pytest.raises(ClientResponseError):
+        await uploader.upload(file)
+    first_range = recorder.ranges[0]
+    await uploader.upload(file)
+
+    assert fake_bot.upload_url_calls == 1
+    assert recorder.ranges.count(first_range) == 1
+    assert len(set(recorder.ranges)) == 11
+    assert recorder.content == CONTENT
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_progress_is_reported(bot: tuple[Any, ChunkRecorder]) -> None:
+    fake_bot, _ = bot
+    store = MemoryProgressStore()
+    uploader = ResumableUploader(fake_bot, chunk_size=CHUNK_SIZE, store=store)
+    reported: list[int] = []
+
+    await uploader.upload(
+        BufferedInputFile.file(CONTENT, "file.bin"),
+        key="file",
+        on_progress=lambda progress: reported.append(progress.uploaded_bytes),
+    )
+
+    assert reported == [CHUNK_SIZE * i for i in range(1, 11)]
+    assert await store.load("file") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_upload_url_is_replaced(bot: tuple[Any, ChunkRecorder]) -> None:
+    fake_bot, recorder = bot
+    store = MemoryProgressStore()
+    await store.save(
+        "file",
+        UploadProgress(
+            url=fake_bot.upload_url.replace("/upload", "/expired"),
+            token=None,
+            size=len(CONTENT),
+            chunk_size=CHUNK_SIZE,
+            uploaded=[0, 1],
+        ),
+    )
+    uploader = ResumableUploader(
+        fake_bot,
+        chunk_size=CHUNK_SIZE,
+        backoff=FAST_BACKOFF,
+        store=store,
+    )
+
+    result = await uploader.upload(BufferedInputFile.file(CONTENT, "file.bin"), "file")
+
+    assert result == (UploadType.FILE, "uploaded")
+    assert fake_bot.upload_url_calls == 1
+    assert recorder.content == CONTENT
+    assert await store.load("file") is None
+
+
+@pytest.mark.asyncio
+async def test_rejected_chunk_is_not_retried(bot: tuple[Any, ChunkRecorder]) -> None:
+    fake_bot, _ = bot
+    fake_bot.upload_url = fake_bot.upload_url.replace("/upload", "/expired")
+    store = MemoryProgressStore()
+    uploader = ResumableUploader(
+        fake_bot,
+        chunk_size=CHUNK_SIZE,
+        backoff=FAST_BACKOFF,
+        store=store,
+    )
+
+    with pytest.raises(ClientResponseError):
+        await uploader.upload(BufferedInputFile.file(CONTENT, "file.bin"), "file")
+
+    assert fake_bot.upload_url_calls == 1
+    assert await store.load("file") is None
+
+
+@pytest.mark.asyncio
+async def test_empty_file_is_rejected(bot: tuple[Any, ChunkRecorder]) -> None:
+    fake_bot, _ = bot
+    uploader = ResumableUploader(fake_bot)
+
+    with pytest.raises(ValueError, match="non-empty"):
+        await uploader.upload(BufferedInputFile.file(b"", "empty.bin"))
+
+    assert fake_bot.upload_url_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_rewritten_file_is_not_resumed(
+    tmp_path: Path,
+    bot: tuple[Any, ChunkRecorder],
+) -> None:
+    fake_bot, recorder = bot
+    recorder.fail_offsets = {5000}
+    path = tmp_path / "file.bin"
+    path.write_bytes(bytes(len(CONTENT)))
+    uploader = ResumableUploader(
+        fake_bot,
+        chunk_size=CHUNK_SIZE,
+        max_in_flight=1,
+        max_attempts=1,
+    )
+
+    with pytest.raises(ClientResponseError):
+        await uploader.upload(FSInputFile.file(path))
+    path.write_bytes(CONTENT)
+    os.utime(path, ns=(0, 0))
+    await uploader.upload(FSInputFile.file(path))
+
+    assert fake_bot.upload_url_calls == 2
+    assert recorder.content == CONTENT
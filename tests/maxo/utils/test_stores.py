@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from maxo.utils.stores import JsonFileStore, MemoryKeyValueStore
+
+
+@dataclass
+class Progress:
+    done: int
+    items: list[int]
+
+
+@pytest.mark.asyncio
+async def test_memory_store() -> None:
+    store: MemoryKeyValueStore[Progress] = MemoryKeyValueStore()
+
+    await store.save("key", Progress(done=1, items=[1]))
+    assert await store.load("key") == Progress(done=1, items=[1])
+
+    await store.delete("key")
+    await store.delete("key")
+    assert await store.load("key") is None
+
+
+@pytest.mark.asyncio
+async def test_json_file_store(tmp_path: Path) -> None:
+    store = JsonFileStore(tmp_path / "progress", Progress)
+
+    assert await store.load("key") is None
+    await store.save("key", Progress(done=1, items=[1]))
+    await store.save("key", Progress(done=2, items=[1, 2]))
+    assert await store.load("key") == Progress(done=2, items=[1, 2])
+    assert len(list((tmp_path / "progress").iterdir())) == 1
+
+    await store.delete("key")
+    assert await store.load("key") is None
+
+
+@pytest.mark.asyncio
+async def test_json_file_store_ignores_corrupted_files(tmp_path: Path) -> None:
+    store = JsonFileStore(tmp_path, Progress)
+    await store.save("key", Progress(done=1, items=[]))
+    next(tmp_path.iterdir()).write_text("{")
+
+    assert await store.load("key") is None
@@ -0,0 +1,126 @@
+import asyncio
+import os
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+
+from maxo import Bot
+from maxo.enums import UploadType
+from maxo.errors import MaxBotBadRequestError
+from maxo.utils.facades import AttachmentsFacade
+from maxo.utils.upload_media import BufferedInputFile, FSInputFile, InputFile
+from maxo.utils.upload_media.cache import MemoryUploadCache, UploadKeyBuilder
+
+
+@pytest.mark.asyncio
+async def test_key_depends_on_content(tmp_path: Path) -> None:
+    builder = UploadKeyBuilder()
+    first = tmp_path / "first.png"
+    second = tmp_path / "second.png"
+    first.write_bytes(b"banner")
+    second.write_bytes(b"banner")
+
+    first_key = await builder.build(FSInputFile.image(first))
+
+    assert await builder.build(FSInputFile.image(second)) == first_key
+    assert await builder.build(BufferedInputFile.image(b"banner", "x")) == first_key
+    assert await builder.build(FSInputFile.file(first)) != first_key
+
+
+@pytest.mark.asyncio
+async def test_key_is_rebuilt_after_change(tmp_path: Path) -> None:
+    builder = UploadKeyBuilder()
+    path = tmp_path / "banner.png"
+    path.write_bytes(b"old")
+    old_key = await builder.build(FSInputFile.image(path))
+
+    path.write_bytes(b"new")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert await builder.build(FSInputFile.image(path)) != old_key
+
+
+@pytest.mark.asyncio
+async def test_file_is_uploaded_once(make_bot: Any) -> None:
+    fake_bot = make_bot(upload_cache=MemoryUploadCache(), delay=0.01)
+    facade = AttachmentsFacade(cast(Bot, fake_bot))
+    files: list[InputFile] = [
+        BufferedInputFile.image(b"banner", f"{i}.png") for i in range(10)
+    ]
+
+    results = await asyncio.gather(*(facade.upload_media(file) for file in files))
+    results.append(await facade.upload_media(files[0]))
+
+    assert fake_bot.uploads == 1
+    assert set(results) == {(UploadType.IMAGE, "token-1")}
+
+
+@pytest.mark.asyncio
+async def test_failed_upload_is_not_cached() -> None:
+    cache = MemoryUploadCache()
+    file = BufferedInputFile.image(b"banner", "banner.png")
+
+    async def fail(file: InputFile) -> tuple[UploadType, str]:
+        raise RuntimeError("upload failed")
+
+    async def upload(file: InputFile) -> tuple[UploadType, str]:
+        return file.type, "token"
+
+    with pytest.raises(RuntimeError):
+        await cache.upload(file, fail)
+
+    assert await cache.upload(file, upload) == (UploadType.IMAGE, "token")
+
+
+@pytest.mark.asyncio
+async def test_without_cache_file_is_uploaded_each_time(make_bot: Any) -> None:
+    fake_bot = make_bot()
+    facade = AttachmentsFacade(cast(Bot, fake_bot))
+    file = BufferedInputFile.image(b"banner", "banner.png")
+
+    await facade.upload_media(file)
+    await facade.upload_media(file)
+
+    assert fake_bot.uploads == 2
+
+
+class SlowUploadCache(MemoryUploadCache):
+    async def get_token(self, key: str) -> str | None:
+        # Как у Redis: обращение к кешу действительно уступает управление
+        await asyncio.sleep(0.01)
+        return await super().get_token(key)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_uploads_are_coalesced_with_slow_cache(make_bot: Any) -> None:
+    fake_bot = make_bot(upload_cache=SlowUploadCache(), delay=0.01)
+    facade = AttachmentsFacade(cast(Bot, fake_bot))
+    file = BufferedInputFile.image(b"banner", "banner.png")
+
+    results = await asyncio.gather(*(facade.upload_media(file) for _ in range(10)))
+
+    assert fake_bot.uploads == 1
+    assert set(results) == {(UploadType.IMAGE, "token-1")}
+
+
+@pytest.mark.asyncio
+async def test_rejected_cached_token_is_uploaded_again(make_bot: Any) -> None:
+    fake_bot = make_bot(upload_cache=MemoryUploadCache())
+    facade = AttachmentsFacade(cast(Bot, fake_bot))
+    file = BufferedInputFile.image(b"banner", "banner.png")
+    await facade.upload_media(file)
+    sent: list[str] = []
+
+    async def send(attachments: Sequence[Any]) -> str:
+        token = attachments[0].payload.token
+        sent.append(token)
+        if token == "token-1":  # noqa: S105
+            raise MaxBotBadRequestError("attachment.invalid", "400", "expired")
+        return token
+
+    assert await facade.call_with_attachments(send, files=[file]) == "token-2"
+    assert sent == ["token-1", "token-2"]
+    assert await facade.upload_media(file) == (UploadType.IMAGE, "token-2")
@@ -0,0 +1,101 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from maxo.bot.api_client import MaxApiClient
+from maxo.bot.methods import UploadMedia
+from maxo.serialization import create_retort
+from maxo.utils.upload_media import (
+    BufferedInputFile,
+    FSInputFile,
+    streaming_upload_file,
+)
+
+CONTENT = bytes(range(256)) * 1000
+
+
+class UploadRecorder:
+    def __init__(self) -> None:
+        self.uploads: list[tuple[str | None, int | None, bytes]] = []
+
+    async def upload(self, request: web.Request) -> web.Response:
+        reader = await request.multipart()
+        part = await reader.next()
+        assert part is not None
+        data = await part.read()  # type: ignore[union-attr]
+        self.uploads.append((part.filename, request.content_length, bytes(data)))  # type: ignore[union-attr]
+        return web.json_response({"token": "uploaded"})
+
+
+@pytest_asyncio.fixture
+async def upload_server() -> AsyncIterator[tuple[str, UploadRecorder]]:
+    recorder = UploadRecorder()
+    app = web.Application()
+    app.router.add_post("/upload", recorder.upload)
+    async with TestServer(app) as server:
+        yield str(server.make_url("/upload")), recorder
+
+
+@pytest_asyncio.fixture
+async def client() -> AsyncIterator[MaxApiClient]:
+    retort = create_retort(warming_up=False)
+    api_client = MaxApiClient(
+        token="token",  # noqa: S106
+        request_dumper=retort,
+        response_loader=retort,
+    )
+    yield api_client
+    await api_client.close()
+
+
+@pytest.mark.asyncio
+async def test_fs_file_is_read_in_chunks(tmp_path: Path) -> None:
+    path = tmp_path / "video.mp4"
+    path.write_bytes(CONTENT)
+    file = FSInputFile.video(path)
+
+    chunks = [chunk async for chunk in file.iter_chunks(chunk_size=10_000)]
+
+    assert file.size == len(CONTENT)
+    assert max(map(len, chunks)) == 10_000
+    assert b"".join(chunks) == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_buffered_file_chunks() -> None:
+    file = BufferedInputFile.file(b"abcdefg", "file.txt")
+
+    chunks = [chunk async for chunk in file.iter_chunks(chunk_size=3)]
+
+    assert chunks == [b"abc", b"def", b"g"]
+
+
+@pytest.mark.asyncio
+async def test_upload_streams_file(
+    tmp_path: Path,
+    upload_server: tuple[str, UploadRecorder],
+    client: MaxApiClient,
+) -> None:
+    upload_url, recorder = upload_server
+    path = tmp_path / "video.mp4"
+    path.write_bytes(CONTENT)
+    upload_file = streaming_upload_file(FSInputFile.video(path), chunk_size=4096)
+
+    # одно и то же тело можно отправить повторно, например при ретрае
+    for _ in range(2):
+        result: Any = await client.call_method(
+            UploadMedia(upload_url=upload_url, file=upload_file),
+        )
+        assert result.token == "uploaded"  # noqa: S105
+
+    assert len(recorder.uploads) == 2
+    for file_name, content_length, data in recorder.uploads:
+        assert file_name == "video.mp4"
+        assert content_length is not None
+        assert content_length > len(CONTENT)
+        assert data == CONTENT
@@ -4,6 +4,7 @@ from typing import Any
 import pytest
 
 from maxo import Dispatcher
+from maxo.bot.methods import AnswerOnCallback
 from maxo.dialogs import (
     BaseDialogManager,
     Dialog,
@@ -14,6 +15,7 @@ from maxo.dialogs import (
 )
 from maxo.dialogs.api.entities import GROUP_STACK_ID, AccessSettings
 from maxo.dialogs.test_tools import BotClient, MockMessageManager
+from maxo.dialogs.test_tools.bot_client import FakeBot
 from maxo.dialogs.test_tools.keyboard import InlineButtonTextLocator
 from maxo.dialogs.test_tools.memory_storage import JsonMemoryStorage
 from maxo.dialogs.widgets.kbd import Button
@@ -105,6 +107,30 @@ async def test_second_user(
     assert not message_manager.sent_messages
 
 
+@pytest.mark.asyncio
+async def test_forbidden_stack_answers_callback(
+    dp: Dispatcher,
+    client: BotClient,
+    second_client: BotClient,
+    message_manager: MockMessageManager,
+) -> None:
+    dp.message_created.handler(start, CommandStart())
+    await client.send("/start")
+    first_message = message_manager.one_message()
+    message_manager.reset_history()
+
+    await second_client.click(
+        first_message,
+        InlineButtonTextLocator("Button"),
+    )
+
+    assert not message_manager.sent_messages
+    assert isinstance(second_client.bot, FakeBot)
+    [answer] = second_client.bot.background_calls
+    assert isinstance(answer, AnswerOnCallback)
+    assert answer.notification == ""
+
+
 @pytest.mark.asyncio
 async def test_change_settings(
     dp: Dispatcher,
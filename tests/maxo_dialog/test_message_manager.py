@@ -0,0 +1,130 @@
+from typing import Any, cast
+
+import pytest
+
+from maxo import Bot
+from maxo.dialogs.api.entities import MediaAttachment, MediaId, NewMessage, OldMessage
+from maxo.dialogs.manager.message_manager import MessageManager
+from maxo.enums import AttachmentType, ChatType
+from maxo.types import (
+    CallbackButton,
+    InlineKeyboardAttachment,
+    Keyboard,
+    Message,
+    MessageBody,
+    PhotoAttachment,
+    PhotoAttachmentPayload,
+    Recipient,
+)
+
+RECIPIENT = Recipient(chat_type=ChatType.DIALOG, chat_id=1, user_id=1)
+BUTTON = CallbackButton(text="Button", payload="btn")
+PHOTO_TOKEN = "photo"  # noqa: S105
+OTHER_TOKEN = "other"  # noqa: S105
+PHOTO = PhotoAttachment(
+    payload=PhotoAttachmentPayload(photo_id=1, token=PHOTO_TOKEN, url="https://x/1"),
+)
+
+
+class FakeBot:
+    def __init__(self) -> None:
+        self.edited: list[dict[str, Any]] = []
+        self.fetched: list[str] = []
+
+    async def edit_message(self, **kwargs: Any) -> None:
+        self.edited.append(kwargs)
+
+    async def get_message_by_id(self, message_id: str) -> Message:
+        self.fetched.append(message_id)
+        return Message(
+            recipient=RECIPIENT,
+            timestamp=0,  # type: ignore[arg-type]
+            body=MessageBody(mid=message_id, seq=1, text="from server"),
+        )
+
+
+class NoopMediaIdStorage:
+    async def get_media_id(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+    async def save_media_id(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+
+@pytest.fixture
+def bot() -> Bot:
+    return cast(Bot, FakeBot())
+
+
+def old_message(*attachments: Any) -> OldMessage:
+    return OldMessage(
+        recipient=RECIPIENT,
+        message_id="mid",
+        sequence_id=1,
+        text="old",
+        attachments=list(attachments),
+    )
+
+
+@pytest.mark.asyncio
+async def test_edit_builds_result_locally(bot: Any) -> None:
+    manager = MessageManager(NoopMediaIdStorage())
+    new_message = NewMessage(recipient=RECIPIENT, text="new", keyboard=[[BUTTON]])
+
+    result = await manager.show_message(bot, new_message, old_message())
+
+    assert bot.fetched == []
+    assert result.text == "new"
+    assert result.message_id == "mid"
+    assert result.keyboard == [[BUTTON]]
+
+
+@pytest.mark.asyncio
+async def test_edit_keeps_unchanged_media(bot: Any) -> None:
+    manager = MessageManager(NoopMediaIdStorage())
+    new_message = NewMessage(
+        recipient=RECIPIENT,
+        text="new",
+        media=[
+            MediaAttachment(
+                type=AttachmentType.IMAGE, media_id=MediaId(token=PHOTO_TOKEN),
+            ),
+        ],
+    )
+
+    result = await manager.show_message(bot, new_message, old_message(PHOTO))
+
+    assert bot.fetched == []
+    assert result.attachments == [PHOTO]
+
+
+@pytest.mark.asyncio
+async def test_edit_fetches_message_with_new_media(bot: Any) -> None:
+    manager = MessageManager(NoopMediaIdStorage())
+    new_message = NewMessage(
+        recipient=RECIPIENT,
+        text="new",
+        media=[
+            MediaAttachment(
+                type=AttachmentType.IMAGE, media_id=MediaId(token=OTHER_TOKEN),
+            ),
+        ],
+    )
+
+    result = await manager.show_message(bot, new_message, old_message(PHOTO))
+
+    assert bot.fetched == ["mid"]
+    assert result.text == "from server"
+
+
+@pytest.mark.asyncio
+async def test_remove_kbd_without_fetch(bot: Any) -> None:
+    manager = MessageManager(NoopMediaIdStorage())
+    keyboard = InlineKeyboardAttachment(payload=Keyboard(buttons=[[BUTTON]]))
+
+    result = await manager.remove_inline_kbd(bot, old_message(PHOTO, keyboard))
+
+    assert bot.fetched == []
+    assert result is not None
+    assert result.body.attachments == [PHOTO]
+    assert bot.edited[0]["attachments"] == [PHOTO.to_request()]
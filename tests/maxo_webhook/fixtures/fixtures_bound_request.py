@@ -29,6 +29,9 @@ class DummyBoundRequest(BoundRequest[DummyRequest]):
     async def json(self) -> dict[str, Any]:
         return {}
 
+    async def read_body(self, max_size: int | None = None) -> bytes:
+        return b"{}"
+
     @property
     def client_ip(self) -> str | None:
         return self.request.ip
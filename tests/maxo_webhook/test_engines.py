@@ -1,6 +1,12 @@
+import json
+from collections.abc import AsyncIterator
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
 
 from maxo.bot.bot import Bot
 from maxo.routing.dispatcher import Dispatcher
@@ -10,7 +16,21 @@ from maxo.routing.signals import (
     BeforeShutdown,
     BeforeStartup,
 )
+from maxo.transport.webhook.adapters.aiohttp.adapter import AiohttpWebAdapter
 from maxo.transport.webhook.engines.simple import SimpleEngine
+from maxo.transport.webhook.routing.static import StaticRouting
+
+UPDATE = {
+    "update_type": "bot_started",
+    "timestamp": 1700000000000,
+    "chat_id": 1,
+    "user": {
+        "user_id": 1,
+        "first_name": "Test",
+        "is_bot": False,
+        "last_activity_time": 1700000000000,
+    },
+}
 
 
 class TestSimpleEngine:
@@ -109,3 +129,76 @@ class TestSimpleEngine:
             dispatcher.feed_signal.await_args_list[1].args[0],
             AfterShutdown,
         )
+
+
+class TestWebhookRequest:
+    @pytest.fixture
+    def loaded(self) -> list[Any]:
+        return []
+
+    @pytest_asyncio.fixture
+    async def client(self, loaded: list[Any]) -> AsyncIterator[TestClient]:
+        def json_loads(data: str | bytes | bytearray) -> Any:
+            loaded.append(data)
+            return json.loads(data)
+
+        bot = Bot("42:TEST", warming_up=False, json_loads=json_loads)
+        engine = SimpleEngine(
+            Dispatcher(),
+            bot,
+            web_adapter=AiohttpWebAdapter(),
+            routing=StaticRouting(url="https://example.com/webhook"),
+            handle_in_background=False,
+            max_body_size=1024,
+        )
+        app = web.Application()
+        app.router.add_post(
+            "/webhook",
+            lambda request: engine.handle_request(engine.web_adapter.bind(request)),
+        )
+        async with TestClient(TestServer(app)) as client:
+            yield client
+
+    @pytest.mark.asyncio
+    async def test_body_is_decoded_by_bot_loader(
+        self,
+        client: TestClient,
+        loaded: list[Any],
+    ) -> None:
+        response = await client.post("/webhook", json=UPDATE)
+
+        assert response.status == 200
+        assert len(loaded) == 1
+        assert isinstance(loaded[0], bytes)
+
+    @pytest.mark.asyncio
+    async def test_large_body_is_rejected(
+        self,
+        client: TestClient,
+        loaded: list[Any],
+    ) -> None:
+        response = await client.post("/webhook", data=b" " * 2048)
+
+        assert response.status == 413
+        assert loaded == []
+
+    @pytest.mark.asyncio
+    async def test_large_chunked_body_is_rejected(
+        self,
+        client: TestClient,
+        loaded: list[Any],
+    ) -> None:
+        async def body() -> AsyncIterator[bytes]:
+            for _ in range(8):
+                yield b" " * 256
+
+        response = await client.post("/webhook", data=body())
+
+        assert response.status == 413
+        assert loaded == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_json(self, client: TestClient) -> None:
+        response = await client.post("/webhook", data=b"{not json")
+
+        assert response.status == 400
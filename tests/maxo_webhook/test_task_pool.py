@@ -0,0 +1,167 @@
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from maxo.bot.bot import Bot
+from maxo.routing.dispatcher import Dispatcher
+from maxo.transport.webhook.adapters.aiohttp.adapter import AiohttpWebAdapter
+from maxo.transport.webhook.engines import BackgroundTaskPool, SimpleEngine
+from maxo.transport.webhook.routing.static import StaticRouting
+
+UPDATE = {
+    "update_type": "bot_started",
+    "timestamp": 1700000000000,
+    "chat_id": 1,
+    "user": {
+        "user_id": 1,
+        "first_name": "Test",
+        "is_bot": False,
+        "last_activity_time": 1700000000000,
+    },
+}
+
+
+class Job:
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.active = 0
+        self.max_active = 0
+        self.done = 0
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> None:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await self.release.wait()
+        finally:
+            self.active -= 1
+        self.done += 1
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_and_overflow_is_shed() -> None:
+    pool = BackgroundTaskPool(max_concurrency=2, max_queue_size=3)
+    job = Job()
+
+    results = [await pool.submit(job) for _ in range(7)]
+    await asyncio.sleep(0)
+
+    assert results == [True] * 5 + [False] * 2
+    assert pool.stats().running == 2
+    assert pool.stats().queued == 3
+    assert pool.stats().shed == 2
+
+    job.release.set()
+    await asyncio.gather(*pool.tasks)
+
+    assert job.max_active == 2
+    assert job.done == 5
+    assert pool.stats().running == pool.stats().queued == 0
+    assert pool.stats().accepted == 5
+
+
+@pytest.mark.asyncio
+async def test_wait_when_full_applies_backpressure() -> None:
+    pool = BackgroundTaskPool(max_concurrency=1, max_queue_size=0, wait_when_full=True)
+    job = Job()
+
+    await pool.submit(job)
+    waiting = asyncio.create_task(pool.submit(job))
+    await asyncio.sleep(0.01)
+    assert not waiting.done()
+
+    job.release.set()
+    assert await waiting
+    await asyncio.gather(*pool.tasks)
+
+    assert job.done == 2
+    assert pool.shed == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_task_releases_slot() -> None:
+    pool = BackgroundTaskPool(max_concurrency=1, max_queue_size=0)
+
+    async def fail() -> None:
+        raise RuntimeError
+
+    assert await pool.submit(fail)
+    await asyncio.gather(*pool.tasks)
+
+    job = Job()
+    job.release.set()
+    assert await pool.submit(job)
+    await asyncio.gather(*pool.tasks)
+    assert job.done == 1
+
+
+@pytest.mark.asyncio
+async def test_engine_answers_503_when_pool_is_full() -> None:
+    job = Job()
+    engine = SimpleEngine(
+        Dispatcher(),
+        Bot("42:TEST", warming_up=False),
+        web_adapter=AiohttpWebAdapter(),
+        routing=StaticRouting(url="https://example.com/webhook"),
+        task_pool=BackgroundTaskPool(max_concurrency=1, max_queue_size=1),
+    )
+    engine._background_feed_update = job  # type: ignore[method-assign]
+    app = web.Application()
+    app.router.add_post(
+        "/webhook",
+        lambda request: engine.handle_request(engine.web_adapter.bind(request)),
+    )
+
+    async with TestClient(TestServer(app)) as client:
+        statuses = [
+            (await client.post("/webhook", json=UPDATE)).status for _ in range(3)
+        ]
+        job.release.set()
+        await asyncio.gather(*engine.task_pool.tasks)
+
+    assert statuses == [200, 200, 503]
+    assert engine.task_pool.shed == 1
+
+
+@pytest.mark.asyncio
+async def test_drain_waits_then_cancels() -> None:
+    pool = BackgroundTaskPool(max_concurrency=2)
+    fast, slow = Job(), Job()
+
+    await pool.submit(fast)
+    await pool.submit(slow)
+    await asyncio.sleep(0)
+    asyncio.get_running_loop().call_later(0.01, fast.release.set)
+
+    result = await pool.drain(timeout=0.05)
+
+    assert (result.finished, result.abandoned) == (1, 1)
+    assert fast.done == 1
+    assert slow.done == 0
+    assert not pool.tasks
+    assert not await pool.submit(fast)
+
+
+@pytest.mark.asyncio
+async def test_engine_drains_before_closing_bot() -> None:
+    job = Job()
+    bot = MagicMock(spec=Bot)
+    engine = SimpleEngine(
+        Dispatcher(),
+        bot,
+        web_adapter=AiohttpWebAdapter(),
+        routing=MagicMock(),
+        shutdown_timeout=1,
+    )
+    await engine.task_pool.submit(job)
+    closed_after: list[int] = []
+    bot.close = AsyncMock(side_effect=lambda: closed_after.append(job.done))
+    asyncio.get_running_loop().call_later(0.01, job.release.set)
+    await engine.on_shutdown(app=None)
+
+    assert closed_after == [1]
+    assert engine.task_pool.closed